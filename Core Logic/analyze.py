@@ -3,32 +3,57 @@ Career Pivot Navigator - LangChain Analysis Module
 Core logic for skill/pain mapping and pivot suggestions
 """
 
-import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableLambda
-from utils import (
-    load_career_map, parse_skill_input, normalize_input_dict,
-    find_matching_careers, estimate_pivot_difficulty, create_context_for_llm
+from config import load_config
+from utils import load_career_map, estimate_pivot_difficulty
+from career_index import get_career_index
+from pipeline import PivotPipeline
+from llm_cache import LLMResponseCache, get_default_cache
+from llm_clients import get_chat_model
+from llm_calls import (
+    invoke_chain, ainvoke_chain, stream_chain, astream_chain, batch_chain, abatch_chain, error_result
 )
-import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Optional
 
 # Load environment variables
-load_dotenv()
+load_config()
 
 class CareerPivotAnalyzer:
     """Main analyzer using LangChain for career pivot recommendations."""
 
-    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7):
-        """Initialize the analyzer with LLM and prompt templates."""
-        self.llm = ChatOpenAI(model_name=model, temperature=temperature)
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7,
+                 cache: Optional[LLMResponseCache] = None, llm: Optional[Any] = None,
+                 offline: bool = False):
+        """Initialize the analyzer with LLM and prompt templates.
+
+        llm is an injected chat model client; by default the shared, pooled
+        one for (model, temperature) from llm_clients.get_chat_model is used.
+        Completions go through cache (default: the process-wide disk cache,
+        see llm_cache.get_default_cache).
+
+        With offline, no LLM client, prompts or cache are set up (and no API
+        key is needed); only instant_analysis and the lookups work.
+        """
+        self.offline = offline
         self.career_map = load_career_map()
+        self.career_index = get_career_index(self.career_map)
+        self.pipeline = PivotPipeline(self)
+        if offline:
+            self.llm = self.cache = None
+            return
+        self.llm = llm if llm is not None else get_chat_model(model, temperature)
+        self.cache = cache if cache is not None else get_default_cache()
         self.setup_prompts()
+        self.setup_chains()
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes never set, i.e. the chains of an offline analyzer
+        if name.endswith("_chain") and self.__dict__.get("offline"):
+            raise RuntimeError(f"{name} needs an LLM; this analyzer was created with offline=True")
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
     def setup_prompts(self):
         """Setup all LangChain prompt templates."""
+        from langchain_core.prompts import PromptTemplate
 
         # Main career pivot analysis prompt
         self.pivot_prompt = PromptTemplate.from_template("""You are a warm, direct career strategist for neurodivergent and marginalized professionals.
@@ -90,67 +115,130 @@ For EACH step provide:
 Format as a numbered list. Be tactical, encouraging, and realistic.
 """)
 
-    def analyze_pivot(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main method: analyze user input and generate pivot recommendations."""
-
-        # Normalize input
-        normalized = normalize_input_dict(user_data)
-
-        # Create enriched context from career map
-        context = create_context_for_llm(normalized, self.career_map)
-
-        # Build the analysis chain
-        analysis_chain = (
-            RunnablePassthrough.assign(context=lambda x: context)
-            | self.pivot_prompt
-            | self.llm
-        )
-
-        # Run analysis
-        result = analysis_chain.invoke({
-            "current_role": normalized["current_role"],
-            "skills": ", ".join(normalized["skills"]),
-            "hates": ", ".join(normalized["hates"]),
-            "interests": ", ".join(normalized["interests"]),
-            "context": context
-        })
+    def setup_chains(self):
+        """Compose the prompt | llm chains once per analyzer (named for llm_metrics)."""
+        self.analysis_chain = self.pivot_prompt | self.llm
+        self.analysis_chain.name = "pivot_prompt"
+        self.skill_chain = self.skill_prompt | self.llm
+        self.skill_chain.name = "skill_prompt"
+        self.plan_chain = self.plan_prompt | self.llm
+        self.plan_chain.name = "plan_prompt"
+
+    def analyze_pivot(self, user_data: Dict[str, Any],
+                      on_token: Optional[Callable[[str], None]] = None,
+                      instant: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Main method: analyze user input and generate pivot recommendations.
+
+        Pass on_token to stream the analysis text as it is generated, and the
+        instant_analysis result for the same input as instant to reuse its
+        matches and difficulty instead of recomputing them.
+        """
+
+        # normalize -> match -> difficulty -> context -> LLM, each stage once
+        artifacts = self.pipeline.run(user_data, on_token=on_token, artifacts=self.instant_artifacts(instant))
+        return self.build_analysis(artifacts)
+
+    def analyze_many(self, profiles: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """analyze_pivot for a whole cohort, with at most max_concurrency LLM calls in flight.
+
+        Results come back in input order. A profile that fails (bad input or
+        LLM error) yields {"error": ...} instead of aborting the run.
+        """
+        prepared = self.prepare_many(profiles)
+        ready = [i for i, artifacts in enumerate(prepared) if "error" not in artifacts]
+        texts = batch_chain(self.analysis_chain, [self.pipeline.analysis_inputs(prepared[i]) for i in ready],
+                            max_concurrency=max_concurrency, cache=self.cache)
+        return self.finish_many(prepared, ready, texts)
+
+    async def aanalyze_many(self, profiles: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Async analyze_many, built on abatch."""
+        prepared = self.prepare_many(profiles)
+        ready = [i for i, artifacts in enumerate(prepared) if "error" not in artifacts]
+        texts = await abatch_chain(self.analysis_chain, [self.pipeline.analysis_inputs(prepared[i]) for i in ready],
+                                   max_concurrency=max_concurrency, cache=self.cache)
+        return self.finish_many(prepared, ready, texts)
+
+    def prepare_many(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run the deterministic pipeline stages per profile, capturing failures."""
+        prepared = []
+        for profile in profiles:
+            try:
+                prepared.append(self.pipeline.run(profile, stop_after="context"))
+            except Exception as e:
+                prepared.append(error_result(e))
+        return prepared
+
+    def finish_many(self, prepared: List[Dict[str, Any]], ready: List[int], texts: List[Any]) -> List[Dict[str, Any]]:
+        """Attach batch responses to their artifacts and shape the results."""
+        results = list(prepared)
+        for i, text in zip(ready, texts):
+            if isinstance(text, Exception):
+                results[i] = error_result(text)
+            else:
+                results[i] = self.build_analysis({**prepared[i], "analysis": text})
+        return results
+
+    def instant_analysis(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """analyze_pivot without the LLM: matches, difficulty, quick wins, salaries and resources.
+
+        Runs in milliseconds and works offline, so it can be shown at once
+        while analyze_pivot produces the prose. "analysis" is None; the other
+        keys match analyze_pivot's, and the per-career extras are keyed by
+        career id.
+        """
+        artifacts = self.pipeline.run(user_data, stop_after="difficulty")
+        result = self.build_analysis({**artifacts, "analysis": None})
+        ids = [career["id"] for career in result["matched_careers"]]
+        result["quick_wins"] = {career_id: self.get_quick_wins(career_id) for career_id in ids}
+        result["salary_ranges"] = {career_id: self.get_salary_range(career_id) for career_id in ids}
+        result["resources"] = {career["id"]: career.get("resources", [])
+                               for career in result["matched_careers"]}
+        return result
+
+    def instant_artifacts(self, instant: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The pipeline artifacts an instant_analysis result already holds."""
+        if instant is None:
+            return None
+        return {
+            "user_data": instant["user_data"],
+            "matched_careers": instant["matched_careers"],
+            "difficulty": instant["difficulty_assessments"]
+        }
 
-        analysis_text = result.content if hasattr(result, 'content') else str(result)
+    def build_analysis(self, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape pipeline artifacts into the analyze_pivot result dict."""
+        return {
+            "user_data": artifacts["user_data"],
+            "analysis": artifacts["analysis"],
+            "matched_careers": artifacts["matched_careers"],
+            "difficulty_assessments": artifacts["difficulty"]
+        }
 
+    def skill_inputs(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Template variables for skill_prompt."""
         return {
-            "user_data": normalized,
-            "analysis": analysis_text,
-            "matched_careers": find_matching_careers(
-                normalized["skills"], 
-                normalized["hates"], 
-                self.career_map
-            )
+            "current_role": user_data.get("current_role", ""),
+            "background": f"Skills: {', '.join(user_data.get('skills', []))}. Experience: {user_data.get('years_experience', 'unknown')} years."
         }
 
     def extract_skills(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and enhance user's skill set."""
 
-        skill_chain = self.skill_prompt | self.llm
-
-        result = skill_chain.invoke({
-            "current_role": user_data.get("current_role", ""),
-            "background": f"Skills: {', '.join(user_data.get('skills', []))}. Experience: {user_data.get('years_experience', 'unknown')} years."
-        })
+        text = invoke_chain(self.skill_chain, self.skill_inputs(user_data), cache=self.cache)
 
         return {
-            "extracted_skills": result.content if hasattr(result, 'content') else str(result),
+            "extracted_skills": text,
             "original_input": user_data.get("skills", [])
         }
 
-    def generate_3_step_plan(self, user_data: Dict[str, Any], target_career_id: str) -> Dict[str, Any]:
-        """Generate a concrete 3-step pivot plan."""
+    def prepare_plan(self, user_data: Dict[str, Any], target_career_id: str) -> Dict[str, Any]:
+        """Look up the target, assess difficulty and build plan_prompt variables.
+
+        Returns {"error": ...} when the career is unknown.
+        """
 
         # Find target career details
-        target_career = None
-        for career in self.career_map.get("careers", []):
-            if career["id"] == target_career_id:
-                target_career = career
-                break
+        target_career = self.career_index.get(target_career_id)
 
         if not target_career:
             return {"error": f"Career {target_career_id} not found in database"}
@@ -163,44 +251,85 @@ Format as a numbered list. Be tactical, encouraging, and realistic.
             self.career_map
         )
 
-        # Generate plan
-        plan_chain = self.plan_prompt | self.llm
-
-        result = plan_chain.invoke({
-            "person_name": user_data.get("name", "You"),
-            "target_career": target_career["title"],
-            "skills": ", ".join(user_data.get("skills", [])),
-            "budget": user_data.get("budget", "low"),
-            "time": user_data.get("time_availability", "flexible"),
-            "constraints": user_data.get("constraints", "")
-        })
-
-        plan_text = result.content if hasattr(result, 'content') else str(result)
-
         return {
             "target_career": target_career,
             "difficulty_assessment": difficulty,
+            "inputs": {
+                "person_name": user_data.get("name", "You"),
+                "target_career": target_career["title"],
+                "skills": ", ".join(user_data.get("skills", [])),
+                "budget": user_data.get("budget", "low"),
+                "time": user_data.get("time_availability", "flexible"),
+                "constraints": user_data.get("constraints", "")
+            }
+        }
+
+    def build_plan(self, prepared: Dict[str, Any], plan_text: str) -> Dict[str, Any]:
+        """Combine prepare_plan output with the generated plan text."""
+        target_career = prepared["target_career"]
+        return {
+            "target_career": target_career,
+            "difficulty_assessment": prepared["difficulty_assessment"],
             "plan": plan_text,
             "resources": target_career.get("resources", [])
         }
 
+    def generate_3_step_plan(self, user_data: Dict[str, Any], target_career_id: str,
+                             on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Generate a concrete 3-step pivot plan (streamed to on_token if given)."""
+        prepared = self.prepare_plan(user_data, target_career_id)
+        if "error" in prepared:
+            return prepared
+
+        # Generate plan
+        if on_token:
+            plan_text = stream_chain(self.plan_chain, prepared["inputs"], on_token, cache=self.cache)
+        else:
+            plan_text = invoke_chain(self.plan_chain, prepared["inputs"], cache=self.cache)
+        return self.build_plan(prepared, plan_text)
+
+    # Async variants: same results, built on ainvoke so one event loop can
+    # serve many pivots concurrently
+
+    async def aanalyze_pivot(self, user_data: Dict[str, Any],
+                             on_token: Optional[Callable[[str], None]] = None,
+                             instant: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async analyze_pivot."""
+        artifacts = await self.pipeline.arun(user_data, on_token=on_token,
+                                             artifacts=self.instant_artifacts(instant))
+        return self.build_analysis(artifacts)
+
+    async def aextract_skills(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async extract_skills."""
+        text = await ainvoke_chain(self.skill_chain, self.skill_inputs(user_data), cache=self.cache)
+        return {
+            "extracted_skills": text,
+            "original_input": user_data.get("skills", [])
+        }
+
+    async def agenerate_3_step_plan(self, user_data: Dict[str, Any], target_career_id: str,
+                                    on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Async generate_3_step_plan."""
+        prepared = self.prepare_plan(user_data, target_career_id)
+        if "error" in prepared:
+            return prepared
+        if on_token:
+            plan_text = await astream_chain(self.plan_chain, prepared["inputs"], on_token, cache=self.cache)
+        else:
+            plan_text = await ainvoke_chain(self.plan_chain, prepared["inputs"], cache=self.cache)
+        return self.build_plan(prepared, plan_text)
+
     def get_quick_wins(self, target_career_id: str) -> List[str]:
         """Get quick wins for a specific career pivot."""
 
-        for career in self.career_map.get("careers", []):
-            if career["id"] == target_career_id:
-                return career.get("entry_path", [])
-
-        return []
+        career = self.career_index.get(target_career_id)
+        return career.get("entry_path", []) if career else []
 
     def get_salary_range(self, target_career_id: str) -> Optional[List[int]]:
         """Get salary range for a career."""
 
-        for career in self.career_map.get("careers", []):
-            if career["id"] == target_career_id:
-                return career.get("salary_range", None)
-
-        return None
+        career = self.career_index.get(target_career_id)
+        return career.get("salary_range", None) if career else None
 
 # Example usage function
 def demo_analysis():
@@ -0,0 +1,182 @@
+"""
+Career Pivot Navigator - Batch Matching
+Score many profiles against the whole catalog with sparse matrix products
+
+Every profile becomes a row of a user x key matrix (skills, pain points and
+interests), every catalog key a row of a key x career matrix; one product per
+signal yields the per-career counts that scoring.rank_careers computes one
+profile at a time. The score arithmetic is done in the same order, so results
+(including tie order) match find_matching_careers exactly.
+
+NumPy is optional; SciPy is used for the sparse products when installed.
+Without NumPy the batch falls back to calling rank_careers per profile.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+from career_index import CareerIndex, get_career_index, iter_bits
+from scoring import DEFAULT_MATCH_WEIGHTS, REMOTE_FIT, interest_bits, profile_keys, rank_careers
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover - optional dependency
+    sparse = None
+
+# Upper bound on user x career cells scored at once (bounds peak memory)
+MAX_CELLS_PER_CHUNK = 4_000_000
+
+
+def _key_columns(index: CareerIndex, keys_per_user: List[List[Any]], key_mask) -> Tuple[Dict[Any, int], List[Any]]:
+    """Assign a column to every distinct key that matches at least one career."""
+    columns: Dict[Any, int] = {}
+    ordinals: List[Any] = []
+    for keys in keys_per_user:
+        for key in keys:
+            if key in columns:
+                continue
+            mask = key_mask(index, key)
+            if mask:
+                columns[key] = len(ordinals)
+                ordinals.append(np.fromiter(iter_bits(mask), dtype=np.int64))
+    return columns, ordinals
+
+
+def _user_key_rows(keys_per_user: List[List[Any]], columns: Dict[Any, int]) -> List[List[int]]:
+    return [[columns[k] for k in keys if k in columns] for keys in keys_per_user]
+
+
+def _key_career_matrix(ordinals: List[Any], n_careers: int):
+    """Sparse key x career incidence matrix (CSR)."""
+    indptr = np.zeros(len(ordinals) + 1, dtype=np.int64)
+    if ordinals:
+        indptr[1:] = np.cumsum([len(o) for o in ordinals])
+        indices = np.concatenate(ordinals)
+    else:
+        indices = np.zeros(0, dtype=np.int64)
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(ordinals), n_careers))
+
+
+def _user_key_matrix(rows: List[List[int]], n_keys: int):
+    """Sparse user x key matrix (CSR), one row per profile in the chunk."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(r) for r in rows])
+    indices = np.fromiter((c for r in rows for c in r), dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_keys))
+
+
+def _counts(rows: List[List[int]], ordinals: List[Any], key_career, n_careers: int):
+    """Dense user x career counts of how many of each user's keys hit a career."""
+    if sparse is not None:
+        return (_user_key_matrix(rows, len(ordinals)) @ key_career).toarray()
+    counts = np.zeros((len(rows), n_careers), dtype=np.float64)
+    for row, columns in enumerate(rows):
+        for column in columns:
+            counts[row, ordinals[column]] += 1.0
+    return counts
+
+
+def _top_k(scores, candidates, top_k: int) -> List[Tuple[float, int]]:
+    """Best top_k (score, ordinal) pairs of one row: score desc, then ordinal asc."""
+    selected = np.flatnonzero(candidates)
+    if len(selected) > top_k:
+        values = scores[selected]
+        kth = np.partition(values, len(values) - top_k)[len(values) - top_k]
+        selected = selected[values >= kth]
+    order = np.lexsort((selected, -scores[selected]))[:top_k]
+    return [(float(scores[o]), int(o)) for o in selected[order]]
+
+
+def rank_profiles_batch(index: CareerIndex, profiles: List[Dict[str, Any]], top_k: int = 3,
+                        weights: Optional[Dict[str, float]] = None) -> List[List[Tuple[float, int]]]:
+    """rank_careers for many normalized profiles at once.
+
+    Returns one list of (score, ordinal) pairs per profile, in input order.
+    """
+    if np is None:
+        return [
+            rank_careers(index, p.get("skills", []), p.get("hates", []), interests=p.get("interests"),
+                         remote_preference=p.get("remote_preference"), top_k=top_k, weights=weights)
+            for p in profiles
+        ]
+
+    weights = {**DEFAULT_MATCH_WEIGHTS, **(weights or {})}
+    n_careers = len(index.careers)
+    if not profiles:
+        return []
+    if n_careers == 0 or top_k <= 0:
+        return [[] for _ in profiles]
+
+    keys = [profile_keys(p.get("skills", []), p.get("hates", []), p.get("interests")) for p in profiles]
+    skill_keys = [k["skills"] for k in keys]
+    pain_keys = [k["pains"] for k in keys]
+    interest_keys = [k["interests"] for k in keys]
+
+    skill_columns, skill_ordinals = _key_columns(index, skill_keys, CareerIndex.skill_bits)
+    pain_columns, pain_ordinals = _key_columns(index, pain_keys, CareerIndex.pain_bits)
+    interest_columns, interest_ordinals = _key_columns(index, interest_keys, interest_bits)
+
+    key_career = {}
+    if sparse is not None:
+        key_career = {
+            "skills": _key_career_matrix(skill_ordinals, n_careers),
+            "pains": _key_career_matrix(pain_ordinals, n_careers),
+            "interests": _key_career_matrix(interest_ordinals, n_careers),
+        }
+
+    is_remote = np.fromiter((index.is_remote(o) for o in range(n_careers)), dtype=bool, count=n_careers)
+    trend = np.fromiter((index.trend_relevance(o) for o in range(n_careers)), dtype=np.float64,
+                        count=n_careers)
+    w_skills, w_pains, w_interests = weights["skills"], weights["pain_points"], weights["interests"]
+    w_remote, w_trend = weights["remote"], weights["trend"]
+    trend_term = w_trend * trend
+
+    chunk = max(1, MAX_CELLS_PER_CHUNK // n_careers)
+    results: List[List[Tuple[float, int]]] = []
+    for start in range(0, len(profiles), chunk):
+        stop = min(start + chunk, len(profiles))
+        skill_counts = _counts(_user_key_rows(skill_keys[start:stop], skill_columns),
+                               skill_ordinals, key_career.get("skills"), n_careers)
+        pain_counts = _counts(_user_key_rows(pain_keys[start:stop], pain_columns),
+                              pain_ordinals, key_career.get("pains"), n_careers)
+        interest_counts = _counts(_user_key_rows(interest_keys[start:stop], interest_columns),
+                                  interest_ordinals, key_career.get("interests"), n_careers)
+
+        def share(counts, key_lists):
+            # counts / n per row, or 0.0 for users with no keys of this kind
+            totals = np.array([len(k) for k in key_lists], dtype=np.float64)[:, None]
+            return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+
+        fits = [REMOTE_FIT.get(p.get("remote_preference") or "", (1.0, 1.0)) for p in profiles[start:stop]]
+        remote = np.where(is_remote,
+                          np.array([f[0] for f in fits])[:, None],
+                          np.array([f[1] for f in fits])[:, None])
+
+        # Same operation order as scoring.rank_careers, so floats match exactly
+        scores = (w_skills * share(skill_counts, skill_keys[start:stop])
+                  + w_pains * share(pain_counts, pain_keys[start:stop])
+                  + w_interests * share(interest_counts, interest_keys[start:stop])
+                  + w_remote * remote
+                  + trend_term)
+        candidates = (skill_counts > 0) | (pain_counts > 0)
+
+        for row in range(stop - start):
+            results.append(_top_k(scores[row], candidates[row], top_k))
+
+    return results
+
+
+def match_profiles_batch(profiles: List[Dict[str, Any]], career_map: Dict[str, Any], top_k: int = 3,
+                         weights: Optional[Dict[str, float]] = None) -> List[List[Dict[str, Any]]]:
+    """find_matching_careers for many normalized profiles (see normalize_input_dict)."""
+    index = get_career_index(career_map)
+    return [
+        [index.careers[ordinal] for _, ordinal in ranked]
+        for ranked in rank_profiles_batch(index, profiles, top_k=top_k, weights=weights)
+    ]
@@ -0,0 +1,148 @@
+"""
+Career Pivot Navigator - JSONL Batch Runner
+Non-interactive analysis of many profiles: JSONL in, JSONL out
+
+Each input line is one profile (the fields the CLI asks for, plus an optional
+"id"). Each output line is one result:
+
+    {"id": ..., "user_data": ..., "analysis": ..., "matched_careers": [...],
+     "difficulty_assessments": {...}, "plans": [...]}
+
+or {"id": ..., "error": "Type: message"} for a profile that failed. Profiles
+without an id are keyed by their line number. Input is read lazily and at
+most 2 x workers profiles are in memory at once; results are appended in
+completion order and flushed one by one. Re-running with the same output
+skips every id that already has a result, so an interrupted run resumes
+where it stopped (failed ids are tried again; the last record for an id
+wins).
+"""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Any, Callable, Iterator, Optional, Set, Tuple, Union
+
+from llm_calls import error_result
+
+
+def read_profiles(path: str) -> Iterator[Tuple[str, Union[Dict[str, Any], ValueError]]]:
+    """(id, profile) for each non-blank line; an unparsable line yields its ValueError as the profile."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                profile = json.loads(line)
+                if not isinstance(profile, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as e:
+                yield f"line-{line_number}", e
+                continue
+            yield str(profile.get("id", f"line-{line_number}")), profile
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids that already have a successful result in an output file (empty if it doesn't exist)."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if isinstance(record, dict) and "error" not in record:
+                done.add(str(record.get("id")))
+    return done
+
+
+def _open_for_append(path: str):
+    """Open the output for appending, first terminating a line left incomplete by an interrupted run."""
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    out = open(path, "a", encoding="utf-8")
+    if needs_newline:
+        out.write("\n")
+    return out
+
+
+class BatchRunner:
+    """Run analyze_pivot plus plans for each profile of a JSONL file, with bounded concurrency."""
+
+    def __init__(self, analyzer: Any, plan_gen: Any = None, plans: int = 1, bundle: bool = False,
+                 instant: bool = False):
+        """plans is how many of the top matches get a 3-step plan (0 for none).
+
+        With bundle, each plan comes from generate_pivot_bundle and carries
+        its monetization strategy and mindset coaching. With instant, records
+        are analyzer.instant_analysis results: no LLM calls and no plans.
+        """
+        self.analyzer = analyzer
+        self.plan_gen = plan_gen
+        self.plans = plans
+        self.bundle = bundle
+        self.instant = instant
+
+    def process(self, profile_id: str, profile: Union[Dict[str, Any], Exception]) -> Dict[str, Any]:
+        """The output record for one profile; failures become {"id": ..., "error": ...}."""
+        if isinstance(profile, Exception):
+            return {"id": profile_id, **error_result(profile)}
+        try:
+            if self.instant:
+                return {"id": profile_id, **self.analyzer.instant_analysis(profile)}
+            result = self.analyzer.analyze_pivot(profile)
+            plans = []
+            for career in result["matched_careers"][:self.plans]:
+                if self.bundle:
+                    plans.append(self.plan_gen.generate_pivot_bundle(result["user_data"], career))
+                else:
+                    plans.append({"plan": self.plan_gen.generate_3_step_plan(result["user_data"], career)})
+            return {"id": profile_id, **result, "plans": plans}
+        except Exception as e:
+            return {"id": profile_id, **error_result(e)}
+
+    def run(self, in_path: str, out_path: str, workers: int = 4,
+            on_record: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """Process every profile of in_path not already done in out_path.
+
+        Returns counts: {"ok", "failed", "skipped"}. on_record is called with
+        each record as it is written.
+        """
+        workers = max(1, workers)
+        seen = completed_ids(out_path)
+        counts = {"ok": 0, "failed": 0, "skipped": 0}
+        pending: Set[Future] = set()
+
+        with _open_for_append(out_path) as out, ThreadPoolExecutor(max_workers=workers) as pool:
+            def write(done: Iterable[Future]):
+                for future in done:
+                    pending.discard(future)
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    out.flush()
+                    counts["failed" if "error" in record else "ok"] += 1
+                    if on_record is not None:
+                        on_record(record)
+
+            try:
+                for profile_id, profile in read_profiles(in_path):
+                    if profile_id in seen:
+                        counts["skipped"] += 1
+                        continue
+                    seen.add(profile_id)  # a repeated id in the input runs once
+                    pending.add(pool.submit(self.process, profile_id, profile))
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        write(done)
+                write(as_completed(pending))
+            except KeyboardInterrupt:
+                for future in pending:
+                    future.cancel()
+                # Profiles already running finish during pool shutdown anyway: keep their results
+                write(as_completed([f for f in pending if not f.cancelled()]))
+                raise
+        return counts
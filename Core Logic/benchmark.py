@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Career Pivot Navigator - Performance Benchmarks
+Timings for the deterministic (no-LLM) code paths on synthetic catalogs, plus
+the full pipeline against the offline fake LLM backend (fake_llm.py)
+
+Usage:
+    python benchmark.py                          # run every benchmark
+    python benchmark.py lookup                   # run a single benchmark
+    python benchmark.py matching --sizes 10,1000 # override catalog sizes
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Any, Callable
+
+from career_index import CareerIndex, get_career_index, iter_bits
+from batch_matching import rank_profiles_batch
+from scoring import rank_careers
+from utils import find_matching_careers
+
+
+def make_synthetic_catalog(n_careers: int, n_skills: int = 200, n_pains: int = 40,
+                           seed: int = 7) -> Dict[str, Any]:
+    """Build a career_map-shaped catalog with n_careers random careers."""
+    rng = random.Random(seed)
+    skills = [f"skill_{i}" for i in range(n_skills)]
+    pains = [f"pain_{i}" for i in range(n_pains)]
+
+    careers = []
+    skill_mappings: Dict[str, List[str]] = {s: [] for s in skills}
+    pain_solutions: Dict[str, List[str]] = {p: [] for p in pains}
+
+    for i in range(n_careers):
+        career_id = f"career_{i}"
+        required = rng.sample(skills, 4)
+        friendly = rng.sample(skills, 3)
+        good_for = rng.sample(pains, 3)
+        careers.append({
+            "id": career_id,
+            "title": f"Synthetic Career {i}",
+            "required_skills": required,
+            "friendly_skills": friendly,
+            "salary_range": [40000 + i % 50 * 1000, 90000 + i % 50 * 2000],
+            "remote": i % 3 != 0,
+            "freelance_viable": i % 2 == 0,
+            "entry_path": ["course", "portfolio project", "informational interviews"],
+            "good_for_pain": good_for,
+            "trend_relevance": round(rng.random(), 3),
+            "resources": [],
+        })
+        for skill in required:
+            skill_mappings[skill].append(career_id)
+        for pain in good_for:
+            pain_solutions[pain].append(career_id)
+
+    return {
+        "careers": careers,
+        "skill_mappings": skill_mappings,
+        "pain_point_solutions": pain_solutions,
+    }
+
+
+def time_per_call(fn: Callable[[], Any], min_seconds: float = 0.2) -> float:
+    """Return the mean wall-clock seconds per call of fn (after one warm-up call)."""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def format_duration(seconds: float) -> str:
+    """Render a duration with a readable unit."""
+    if seconds < 1e-6:
+        return f"{seconds * 1e9:8.1f} ns"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.1f} ms"
+    return f"{seconds:8.2f} s "
+
+
+def bench_lookup(sizes: List[int]):
+    """Career-by-id lookup: linear scan vs. CareerIndex."""
+    print("\n🔎 Career lookup by id (per lookup)")
+    print(f"{'careers':>10} | {'linear scan':>11} | {'CareerIndex':>11}")
+    print("-" * 40)
+
+    for n in sizes:
+        catalog = make_synthetic_catalog(n)
+        rng = random.Random(n)
+        ids = [c["id"] for c in rng.sample(catalog["careers"], min(n, 100))]
+        index = CareerIndex(catalog)
+
+        def linear():
+            for career_id in ids:
+                for career in catalog["careers"]:
+                    if career["id"] == career_id:
+                        break
+
+        def indexed():
+            for career_id in ids:
+                index.get(career_id)
+
+        linear_cost = time_per_call(linear) / len(ids)
+        index_cost = time_per_call(indexed) / len(ids)
+        print(f"{n:>10,} | {format_duration(linear_cost)} | {format_duration(index_cost)}")
+
+
+def bench_matching(sizes: List[int]):
+    """Skill/pain candidate selection: Python sets vs. career bitmasks."""
+    print("\n🧮 Skill + pain matching (per profile: 5 skills, 2 pains)")
+    print(f"{'careers':>10} | {'candidates':>10} | {'set union':>11} | {'bitset':>11} | {'find_matching':>13}")
+    print("-" * 68)
+
+    for n in sizes:
+        catalog = make_synthetic_catalog(n)
+        index = CareerIndex(catalog)
+        skills = ["skill_1", "skill_2", "skill_3", "skill_4", "skill_5"]
+        pains = ["pain 1", "pain 2"]
+        pain_keys = [p.replace(" ", "_") for p in pains]
+        skill_mappings = catalog["skill_mappings"]
+        pain_solutions = catalog["pain_point_solutions"]
+
+        def with_sets():
+            skill_ids = set()
+            for skill in skills:
+                skill_ids.update(skill_mappings[skill])
+            pain_ids = set()
+            for pain in pain_keys:
+                pain_ids.update(pain_solutions[pain])
+            both = skill_ids & pain_ids
+            return [index.ordinal(cid) for cid in skill_ids | pain_ids], both
+
+        def with_bits():
+            skill_mask = 0
+            for skill in skills:
+                skill_mask |= index.skill_bits(skill)
+            pain_mask = 0
+            for pain in pain_keys:
+                pain_mask |= index.pain_bits(pain)
+            both = skill_mask & pain_mask
+            return list(iter_bits(skill_mask | pain_mask)), both
+
+        candidates = len(with_bits()[0])
+        set_cost = time_per_call(with_sets)
+        bit_cost = time_per_call(with_bits)
+        full_cost = time_per_call(lambda: find_matching_careers(skills, pains, catalog))
+        print(f"{n:>10,} | {candidates:>10,} | {format_duration(set_cost)} | "
+              f"{format_duration(bit_cost)} | {format_duration(full_cost):>13}")
+
+
+def bench_ranking(sizes: List[int]):
+    """Weighted scoring: bounded-heap top-k vs. scoring plus a full sort."""
+    print("\n🏆 Weighted ranking (per profile: 5 skills, 2 pains, 2 interests)")
+    print(f"{'careers':>10} | {'top 3 (heap)':>12} | {'top 50 (heap)':>13} | {'full sort':>11}")
+    print("-" * 58)
+
+    for n in sizes:
+        catalog = make_synthetic_catalog(n)
+        index = CareerIndex(catalog)
+        skills = ["skill_1", "skill_2", "skill_3", "skill_4", "skill_5"]
+        pains = ["pain 1", "pain 2"]
+        interests = ["skill 6", "career"]
+
+        def ranked(k):
+            return lambda: rank_careers(index, skills, pains, interests, "high", top_k=k)
+
+        costs = [time_per_call(ranked(3)), time_per_call(ranked(50)), time_per_call(ranked(n))]
+        print(f"{n:>10,} | {format_duration(costs[0]):>12} | {format_duration(costs[1]):>13} | "
+              f"{format_duration(costs[2])}")
+
+
+def bench_batch(sizes: List[int], n_profiles: int = 1000):
+    """Cohort scoring: rank_careers per profile vs. one sparse batch."""
+    print(f"\n👥 Cohort matching ({n_profiles:,} profiles, top 3 each)")
+    print(f"{'careers':>10} | {'per-profile loop':>16} | {'batch':>11}")
+    print("-" * 45)
+
+    rng = random.Random(11)
+    profiles = [{
+        "skills": [f"skill_{rng.randrange(200)}" for _ in range(5)],
+        "hates": [f"pain {rng.randrange(40)}" for _ in range(2)],
+        "interests": [f"skill {rng.randrange(200)}"],
+        "remote_preference": rng.choice(["high", "medium", "low"]),
+    } for _ in range(n_profiles)]
+
+    for n in sizes:
+        index = CareerIndex(make_synthetic_catalog(n))
+
+        def loop():
+            return [rank_careers(index, p["skills"], p["hates"], p["interests"], p["remote_preference"])
+                    for p in profiles]
+
+        loop_cost = time_per_call(loop, min_seconds=0)
+        batch_cost = time_per_call(lambda: rank_profiles_batch(index, profiles), min_seconds=0)
+        print(f"{n:>10,} | {format_duration(loop_cost):>16} | {format_duration(batch_cost)}")
+
+
+def bench_pipeline(sizes: List[int], n_profiles: int = 100):
+    """analyze_pivot end to end on the zero-latency fake backend: pipeline overhead only."""
+    from analyze import CareerPivotAnalyzer
+    from fake_llm import FakePivotChatModel
+
+    print(f"\n🤖 Full analysis pipeline, fake LLM (per profile; batch of {n_profiles:,})")
+    print(f"{'careers':>10} | {'analyze_pivot':>13} | {'streamed':>11} | {'analyze_many':>12}")
+    print("-" * 57)
+
+    rng = random.Random(13)
+    profiles = [{
+        "name": "Bench",
+        "current_role": "Customer Service Rep",
+        "skills": ", ".join(f"skill_{rng.randrange(200)}" for _ in range(5)),
+        "hates": ", ".join(f"pain {rng.randrange(40)}" for _ in range(2)),
+        "interests": f"skill {rng.randrange(200)}",
+    } for _ in range(n_profiles)]
+
+    for n in sizes:
+        analyzer = CareerPivotAnalyzer(llm=FakePivotChatModel())
+        analyzer.cache = None  # time the model path, not cache hits
+        analyzer.career_map = make_synthetic_catalog(n)
+        analyzer.career_index = get_career_index(analyzer.career_map)
+
+        single = time_per_call(lambda: analyzer.analyze_pivot(profiles[0]))
+        streamed = time_per_call(lambda: analyzer.analyze_pivot(profiles[0], on_token=lambda token: None))
+        many = time_per_call(lambda: analyzer.analyze_many(profiles), min_seconds=0) / n_profiles
+        print(f"{n:>10,} | {format_duration(single):>13} | {format_duration(streamed)} | "
+              f"{format_duration(many):>12}")
+
+
+# name -> (benchmark, default catalog sizes)
+BENCHMARKS = {
+    "lookup": (bench_lookup, [10, 100, 1000, 10000]),
+    "matching": (bench_matching, [10, 1000, 100000, 1000000]),
+    "ranking": (bench_ranking, [1000, 10000, 100000]),
+    "batch": (bench_batch, [100, 1000, 10000]),
+    "pipeline": (bench_pipeline, [10, 1000, 100000]),
+}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Career Pivot Navigator benchmarks")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--sizes", help="comma-separated catalog sizes (default: per benchmark)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()] if args.sizes else None
+    for name in args.benchmarks or list(BENCHMARKS):
+        benchmark, default_sizes = BENCHMARKS[name]
+        benchmark(sizes or default_sizes)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
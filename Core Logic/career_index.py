@@ -0,0 +1,198 @@
+"""
+Career Pivot Navigator - Career Index
+Constant-time career lookups and precomputed per-career skill/pain sets
+"""
+
+import re
+from typing import Dict, List, Any, Optional, FrozenSet, Iterable, Iterator, Tuple
+
+# How many distinct career maps keep a cached index at once
+_INDEX_CACHE_SIZE = 8
+_index_cache: Dict[int, "CareerIndex"] = {}
+
+
+def mask_from_ordinals(ordinals: Iterable[int], size: int) -> int:
+    """Build a bitmask (bit i = career ordinal i) from a list of ordinals."""
+    bits = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, "little")
+
+
+def canonical_skill(skill: str) -> str:
+    """Canonical form used for skill comparisons: "Problem-Solving" -> "problem solving"."""
+    return " ".join(re.split(r"[\s_\-]+", skill.lower())).strip()
+
+
+def keyword_tokens(text: str) -> List[str]:
+    """Split free text into lowercase alphanumeric tokens."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the ordinals of the set bits in mask, lowest first."""
+    # bin() walks the int once in C; reversing puts bit 0 first
+    bits = bin(mask)[:1:-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class CareerIndex:
+    """Id-keyed view over career_map["careers"], built once per loaded map."""
+
+    def __init__(self, career_map: Dict[str, Any]):
+        """Index every career by id and precompute its skill and pain sets."""
+        self.career_map = career_map
+        self.careers: List[Dict[str, Any]] = career_map.get("careers", [])
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.ordinals: Dict[str, int] = {}
+        self.skill_sets: Dict[str, FrozenSet[str]] = {}
+        self.required_skills: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        self.pain_sets: Dict[str, FrozenSet[str]] = {}
+
+        for ordinal, career in enumerate(self.careers):
+            career_id = career["id"]
+            if career_id in self.by_id:
+                # First entry wins, same as the old linear scans
+                continue
+            self.by_id[career_id] = career
+            self.ordinals[career_id] = ordinal
+            required = tuple((s, canonical_skill(s)) for s in career.get("required_skills", ()))
+            self.required_skills[career_id] = required
+            self.skill_sets[career_id] = frozenset(
+                [c for _, c in required] + [canonical_skill(s) for s in career.get("friendly_skills", ())]
+            )
+            self.pain_sets[career_id] = frozenset(
+                p.lower() for p in career.get("good_for_pain", ())
+            )
+
+        self._size = len(self.careers)
+        self._bits_cache: Dict[Tuple[str, str], int] = {}
+        self._keyword_ordinals: Optional[Dict[str, List[int]]] = None
+
+    def get(self, career_id: str) -> Optional[Dict[str, Any]]:
+        """Return the career with this id, or None."""
+        return self.by_id.get(career_id)
+
+    def get_many(self, career_ids) -> List[Dict[str, Any]]:
+        """Resolve ids to careers, silently dropping unknown ids."""
+        by_id = self.by_id
+        return [by_id[cid] for cid in career_ids if cid in by_id]
+
+    def ordinal(self, career_id: str) -> Optional[int]:
+        """Return the career's position in career_map["careers"], or None."""
+        return self.ordinals.get(career_id)
+
+    def skill_set(self, career_id: str) -> FrozenSet[str]:
+        """Canonical required + friendly skills for a career."""
+        return self.skill_sets.get(career_id, frozenset())
+
+    def required_skill_pairs(self, career_id: str) -> Tuple[Tuple[str, str], ...]:
+        """(original, canonical) pairs for a career's required skills, in order."""
+        return self.required_skills.get(career_id, ())
+
+    def pain_set(self, career_id: str) -> FrozenSet[str]:
+        """Lowercased pain-point keys a career is good for."""
+        return self.pain_sets.get(career_id, frozenset())
+
+    def skill_bits(self, skill: str) -> int:
+        """Bitmask of careers listed under skill_mappings[skill]."""
+        return self._key_bits("skill_mappings", skill)
+
+    def pain_bits(self, pain_key: str) -> int:
+        """Bitmask of careers listed under pain_point_solutions[pain_key]."""
+        return self._key_bits("pain_point_solutions", pain_key)
+
+    def trend_relevance(self, ordinal: int) -> float:
+        """trend_relevance of the career at this ordinal (0 when missing)."""
+        return self.careers[ordinal].get("trend_relevance", 0)
+
+    def is_remote(self, ordinal: int) -> bool:
+        """Whether the career at this ordinal is remote-friendly."""
+        return bool(self.careers[ordinal].get("remote", False))
+
+    def keyword_bits(self, token: str) -> int:
+        """Bitmask of careers whose title, id or skills contain this token."""
+        cache_key = ("keywords", token)
+        mask = self._bits_cache.get(cache_key)
+        if mask is None:
+            if self._keyword_ordinals is None:
+                self._keyword_ordinals = self._build_keyword_index()
+            ordinals = self._keyword_ordinals.get(token)
+            if ordinals is None:
+                return 0
+            mask = self._bits_cache[cache_key] = mask_from_ordinals(ordinals, self._size)
+        return mask
+
+    def _build_keyword_index(self) -> Dict[str, List[int]]:
+        keywords: Dict[str, List[int]] = {}
+        seen = set()
+        for ordinal, career in enumerate(self.careers):
+            career_id = career["id"]
+            if career_id in seen:
+                continue
+            seen.add(career_id)
+            text = " ".join([career_id, career.get("title", "")]
+                            + list(career.get("required_skills", ()))
+                            + list(career.get("friendly_skills", ())))
+            for token in set(keyword_tokens(text)):
+                keywords.setdefault(token, []).append(ordinal)
+        return keywords
+
+    def careers_for_bits(self, mask: int) -> List[Dict[str, Any]]:
+        """Resolve a career bitmask to career dicts in ordinal order."""
+        careers = self.careers
+        return [careers[ordinal] for ordinal in iter_bits(mask)]
+
+    def _key_bits(self, mapping_key: str, key: str) -> int:
+        cache_key = (mapping_key, key)
+        mask = self._bits_cache.get(cache_key)
+        if mask is None:
+            if key not in self.career_map.get(mapping_key, {}):
+                return 0
+            mask = mask_from_ordinals(self._key_ordinals(mapping_key, key), self._size)
+            self._bits_cache[cache_key] = mask
+        return mask
+
+    def _key_ordinals(self, mapping_key: str, key: str) -> List[int]:
+        ordinals = self.ordinals
+        career_ids = self.career_map[mapping_key][key]
+        return [ordinals[cid] for cid in career_ids if cid in ordinals]
+
+    def is_current(self, career_map: Dict[str, Any]) -> bool:
+        """Check that this index still describes the given map object."""
+        careers = career_map.get("careers", [])
+        return (self.career_map is career_map
+                and self.careers is careers
+                and self._size == len(careers))
+
+    def __contains__(self, career_id: str) -> bool:
+        return career_id in self.by_id
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+def get_career_index(career_map: Dict[str, Any]) -> CareerIndex:
+    """Return the index for this career map, building it on first use.
+
+    Indexes are cached by map identity, so every helper that receives the same
+    loaded map shares a single index instead of rescanning the careers list.
+    """
+    if isinstance(career_map, CareerIndex):
+        return career_map
+    if hasattr(career_map, "career_index"):
+        # Compiled catalogs ship their own prebuilt index
+        return career_map.career_index
+
+    index = _index_cache.get(id(career_map))
+    if index is not None and index.is_current(career_map):
+        return index
+
+    index = CareerIndex(career_map)
+    if len(_index_cache) >= _INDEX_CACHE_SIZE:
+        _index_cache.pop(next(iter(_index_cache)))
+    _index_cache[id(career_map)] = index
+    return index
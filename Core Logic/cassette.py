@@ -0,0 +1,314 @@
+"""
+Career Pivot Navigator - LLM Cassettes
+Record real LLM traffic to a compact file and replay it offline
+
+A cassette is a gzip-compressed JSON-lines file with one entry per completion:
+the model, temperature, a hash of the prompt, the response, its token usage
+and its timing (time to first token, total duration and, for streamed calls,
+when each chunk arrived). Recorded entries are written in batches of
+FLUSH_EVERY and at exit. Configure it through the environment:
+
+    LLM_CASSETTE=traffic.jsonl.gz   # cassette file
+    LLM_CASSETTE_MODE=record        # record | replay
+    LLM_REPLAY_TIMING=original      # original | instant (replay only)
+
+Record with LLM_CACHE=0, otherwise cache hits never reach the model.
+"""
+
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata, add_usage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from llm_calls import response_text
+
+CASSETTE_MODES = ("record", "replay")
+REPLAY_TIMINGS = ("original", "instant")
+
+# Recorded entries buffered before they are compressed and appended as one gzip member
+FLUSH_EVERY = 64
+
+
+class CassetteMissError(LookupError):
+    """Replay was asked for a request the cassette never recorded."""
+
+
+def prompt_hash(model: str, temperature: Optional[float], prompt: str) -> str:
+    """Key of one request in a cassette."""
+    payload = json.dumps([model, temperature, prompt])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def messages_text(messages: List[BaseMessage]) -> str:
+    """The prompt as sent: the message contents, one per line."""
+    return "\n".join(str(m.content) for m in messages)
+
+
+class Cassette:
+    """Recorded completions, keyed by prompt hash, appended to a gzip JSONL file.
+
+    Identical requests recorded several times are replayed in recording order
+    (cycling once exhausted), so sampled outputs reproduce faithfully.
+    """
+
+    def __init__(self, path: str):
+        """Open a cassette file (it need not exist yet)."""
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._replayed: Dict[str, int] = {}
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+        atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, model: str, temperature: Optional[float], prompt: str, response: str,
+               ttft: float, duration: float, chunks: Optional[List[Tuple[float, str]]] = None,
+               usage: Optional[UsageMetadata] = None):
+        """Record one completion (chunks are (seconds since request, text) pairs).
+
+        The entry is replayable at once; it reaches the file with the next flush.
+        """
+        entry = {
+            "key": prompt_hash(model, temperature, prompt),
+            "model": model,
+            "temperature": temperature,
+            "response": response,
+            "ttft": round(ttft, 4),
+            "duration": round(duration, 4),
+        }
+        if chunks:
+            entry["chunks"] = [[round(offset, 4), text] for offset, text in chunks]
+        if usage:
+            entry["usage"] = dict(usage)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._entries.setdefault(entry["key"], []).append(entry)
+            self._pending.append(line)
+            if len(self._pending) >= FLUSH_EVERY:
+                self._write_pending()
+
+    def flush(self):
+        """Write buffered entries to the file (also runs at interpreter exit)."""
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # One gzip member per batch: members compress far better than one per line
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write("".join(self._pending))
+        self._pending = []
+
+    def play(self, model: str, temperature: Optional[float], prompt: str) -> Dict[str, Any]:
+        """Next recorded entry for this request; raises CassetteMissError if there is none."""
+        key = prompt_hash(model, temperature, prompt)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(
+                    f"No recording for this {model} prompt in {self.path} (re-record the cassette)"
+                )
+            turn = self._replayed.get(key, 0)
+            self._replayed[key] = turn + 1
+            return entries[turn % len(entries)]
+
+
+def replay_chunks(entry: Dict[str, Any]) -> List[Tuple[float, str]]:
+    """(offset, text) chunks of an entry; unstreamed recordings are one chunk at the end."""
+    if entry.get("chunks"):
+        return [(offset, text) for offset, text in entry["chunks"]]
+    return [(entry["duration"], entry["response"])]
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model that records the wrapped model's traffic, or replays a cassette.
+
+    In record mode every invoke/stream/batch call (sync or async) is passed to
+    inner and saved; in replay mode inner is not needed and responses come from
+    the cassette, with the recorded timing or instantly.
+
+    Entries are looked up under recorded_model (default: model_name). Replay
+    models from cassette_model_from_env are named "cassette:<model>", so the
+    response cache and llm_metrics pricing keep them apart from live calls.
+    """
+
+    cassette: Cassette
+    mode: str = "replay"
+    timing: str = "original"
+    inner: Optional[Any] = None
+    model_name: str = "gpt-4o"
+    recorded_model: Optional[str] = None
+    temperature: Optional[float] = 0.7
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.mode}"
+
+    def _prompt_key(self, messages: List[BaseMessage]) -> Tuple[str, Optional[float], str]:
+        return self.recorded_model or self.model_name, self.temperature, messages_text(messages)
+
+    def _replay_entry(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        return self.cassette.play(*self._prompt_key(messages))
+
+    def _delay(self, seconds: float) -> float:
+        return seconds if self.timing == "original" else 0.0
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.mode == "replay":
+            entry = self._replay_entry(messages)
+            time.sleep(self._delay(entry["duration"]))
+            text, usage = entry["response"], entry.get("usage")
+        else:
+            start = time.perf_counter()
+            message = self.inner.invoke(messages, stop=stop, **kwargs)
+            duration = time.perf_counter() - start
+            text, usage = response_text(message), getattr(message, "usage_metadata", None)
+            self.cassette.record(*self._prompt_key(messages), text, duration, duration, usage=usage)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.mode == "replay":
+            entry = self._replay_entry(messages)
+            await asyncio.sleep(self._delay(entry["duration"]))
+            text, usage = entry["response"], entry.get("usage")
+        else:
+            start = time.perf_counter()
+            message = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+            duration = time.perf_counter() - start
+            text, usage = response_text(message), getattr(message, "usage_metadata", None)
+            self.cassette.record(*self._prompt_key(messages), text, duration, duration, usage=usage)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            start = time.perf_counter()
+            entry = self._replay_entry(messages)
+            for offset, text in replay_chunks(entry):
+                wait = self._delay(offset) - (time.perf_counter() - start)
+                if wait > 0:
+                    time.sleep(wait)
+                if run_manager:
+                    run_manager.on_llm_new_token(text)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if entry.get("usage"):
+                yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=entry["usage"]))
+            return
+
+        start = time.perf_counter()
+        chunks: List[Tuple[float, str]] = []
+        usage: Optional[UsageMetadata] = None
+        for chunk in self.inner.stream(messages, stop=stop, **kwargs):
+            text = response_text(chunk)
+            chunk_usage = getattr(chunk, "usage_metadata", None)
+            if chunk_usage:
+                usage = add_usage(usage, chunk_usage)
+            if text:
+                chunks.append((time.perf_counter() - start, text))
+                if run_manager:
+                    run_manager.on_llm_new_token(text)
+            if text or chunk_usage:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=chunk_usage))
+        self._record_stream(messages, start, chunks, usage)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            start = time.perf_counter()
+            entry = self._replay_entry(messages)
+            for offset, text in replay_chunks(entry):
+                wait = self._delay(offset) - (time.perf_counter() - start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if run_manager:
+                    await run_manager.on_llm_new_token(text)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if entry.get("usage"):
+                yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=entry["usage"]))
+            return
+
+        start = time.perf_counter()
+        chunks: List[Tuple[float, str]] = []
+        usage: Optional[UsageMetadata] = None
+        async for chunk in self.inner.astream(messages, stop=stop, **kwargs):
+            text = response_text(chunk)
+            chunk_usage = getattr(chunk, "usage_metadata", None)
+            if chunk_usage:
+                usage = add_usage(usage, chunk_usage)
+            if text:
+                chunks.append((time.perf_counter() - start, text))
+                if run_manager:
+                    await run_manager.on_llm_new_token(text)
+            if text or chunk_usage:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=chunk_usage))
+        self._record_stream(messages, start, chunks, usage)
+
+    def _record_stream(self, messages: List[BaseMessage], start: float, chunks: List[Tuple[float, str]],
+                       usage: Optional[UsageMetadata] = None):
+        duration = time.perf_counter() - start
+        ttft = chunks[0][0] if chunks else duration
+        self.cassette.record(*self._prompt_key(messages), "".join(text for _, text in chunks),
+                             ttft, duration, chunks, usage=usage)
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def cassette_mode() -> Optional[str]:
+    """LLM_CASSETTE_MODE when a cassette is configured (LLM_CASSETTE), else None."""
+    if not os.getenv("LLM_CASSETTE"):
+        return None
+    mode = os.getenv("LLM_CASSETTE_MODE", "replay").strip().lower()
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Unknown LLM_CASSETTE_MODE {mode!r}; use one of {', '.join(CASSETTE_MODES)}")
+    return mode
+
+
+def get_cassette(path: str) -> Cassette:
+    """The process-wide Cassette for a file, so every model appends to the same one."""
+    path = os.path.abspath(os.path.expanduser(path))
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = Cassette(path)
+        return _cassettes[path]
+
+
+def cassette_model_from_env(model: str, temperature: Optional[float],
+                            inner: Optional[Any] = None) -> CassetteChatModel:
+    """CassetteChatModel configured from LLM_CASSETTE* / LLM_REPLAY_TIMING."""
+    timing = os.getenv("LLM_REPLAY_TIMING", "original").strip().lower()
+    if timing not in REPLAY_TIMINGS:
+        raise ValueError(f"Unknown LLM_REPLAY_TIMING {timing!r}; use one of {', '.join(REPLAY_TIMINGS)}")
+    mode = cassette_mode()
+    return CassetteChatModel(
+        cassette=get_cassette(os.environ["LLM_CASSETTE"]),
+        mode=mode,
+        timing=timing,
+        inner=inner if mode == "record" else None,
+        model_name=model if mode == "record" else f"cassette:{model}",
+        recorded_model=model,
+        temperature=temperature,
+    )
@@ -0,0 +1,618 @@
+"""
+Career Pivot Navigator - Compiled Catalog
+Compact binary form of career_map.json, memory-mapped at load time
+
+Layout (little-endian), all sections addressed by offsets in the header:
+    header        magic, version, counts, source stat + sha256, section offsets
+    string table  (n_strings + 1) u64 offsets followed by one UTF-8 blob;
+                  every string in the catalog is stored once (interned)
+    careers       fixed-size records: string ids, salary, flags, trend and
+                  (start, count) slices into the list pool
+    id order      career ordinals sorted by id, for binary-search lookups
+    list pool     u32 string ids referenced by career lists and mappings
+    skill/pain    per key: (key string id, list-pool slice, ordinal-pool slice)
+    ordinal pool  u32 career ordinals (the prebuilt skill/pain indexes)
+
+Careers are decoded lazily on first access, so opening a catalog only touches
+the header and the pages shared between processes through the OS page cache.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Any, Optional, Tuple, FrozenSet
+
+from career_index import CareerIndex, canonical_skill
+from utils import FrozenDict, freeze_json
+
+MAGIC = b"CPNCAT01"
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".bin"
+NO_STRING = 0xFFFFFFFF
+
+# magic, version, n_careers, n_strings, n_skill_keys, n_pain_keys, meta string id,
+# source mtime_ns, source size, source sha256, then eight section offsets
+_HEADER = struct.Struct("<8sIIIIIIqq32s8Q")
+# id, title, salary low/high, flags, trend, five (start, count) list slices, extras
+_CAREER = struct.Struct("<IIqqHd10II")
+# Offset of the source mtime_ns field within the header
+_SOURCE_MTIME_AT = struct.calcsize("<8sIIIIII")
+_KEY_ENTRY = struct.Struct("<IIIII")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+# Career list fields stored as string-id slices, in record order
+_LIST_FIELDS = ("required_skills", "friendly_skills", "entry_path", "good_for_pain", "resources")
+
+# Record flag bits
+_REMOTE = 1 << 0
+_FREELANCE = 1 << 1
+_HAS_REMOTE = 1 << 2
+_HAS_FREELANCE = 1 << 3
+_HAS_SALARY = 1 << 4
+_HAS_TREND = 1 << 5
+_HAS_LIST = 6  # bits 6..10, one per _LIST_FIELDS entry
+
+_MAPPING_KEYS = ("skill_mappings", "pain_point_solutions")
+
+
+def compiled_path_for(json_path: str) -> str:
+    """Return the compiled artifact path that sits next to a JSON catalog."""
+    return os.path.splitext(json_path)[0] + COMPILED_SUFFIX
+
+
+# ---------------------------------------------------------------------------
+# Compiling
+# ---------------------------------------------------------------------------
+
+class _StringTable:
+    """Interns strings and assigns them sequential ids."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+
+def _is_string_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _split_career(career: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Separate the fields the record layout can hold from everything else."""
+    known, extras = {}, {}
+    for key, value in career.items():
+        if key == "id" and isinstance(value, str):
+            known[key] = value
+        elif key == "title" and isinstance(value, str):
+            known[key] = value
+        elif (key == "salary_range" and isinstance(value, list) and len(value) == 2
+              and all(type(v) is int for v in value)):
+            known[key] = value
+        elif key in ("remote", "freelance_viable") and isinstance(value, bool):
+            known[key] = value
+        elif key == "trend_relevance" and type(value) is float:
+            known[key] = value
+        elif key in _LIST_FIELDS and _is_string_list(value):
+            known[key] = value
+        else:
+            extras[key] = value
+    return known, extras
+
+
+def compile_catalog(source: str, output: Optional[str] = None) -> str:
+    """Compile a career_map.json file into the binary catalog format."""
+    if output is None:
+        output = compiled_path_for(source)
+
+    with open(source, "rb") as f:
+        raw = f.read()
+    stat = os.stat(source)
+    data = json.loads(raw)
+
+    careers = data.get("careers", [])
+    if not all(isinstance(c, dict) and isinstance(c.get("id"), str) for c in careers):
+        raise ValueError("Every career needs a string 'id' to be compiled")
+
+    strings = _StringTable()
+    list_pool: List[int] = []
+    ordinal_pool: List[int] = []
+    records = bytearray()
+
+    first_ordinal: Dict[str, int] = {}
+    for ordinal, career in enumerate(careers):
+        first_ordinal.setdefault(career["id"], ordinal)
+
+    for career in careers:
+        known, extras = _split_career(career)
+        flags = 0
+        if "remote" in known:
+            flags |= _HAS_REMOTE | (_REMOTE if known["remote"] else 0)
+        if "freelance_viable" in known:
+            flags |= _HAS_FREELANCE | (_FREELANCE if known["freelance_viable"] else 0)
+        salary = known.get("salary_range")
+        if salary is not None:
+            flags |= _HAS_SALARY
+        trend = known.get("trend_relevance")
+        if trend is not None:
+            flags |= _HAS_TREND
+
+        slices = []
+        for bit, field in enumerate(_LIST_FIELDS):
+            values = known.get(field)
+            if values is None:
+                slices += [0, 0]
+                continue
+            flags |= 1 << (_HAS_LIST + bit)
+            slices += [len(list_pool), len(values)]
+            list_pool.extend(strings.intern(v) for v in values)
+
+        records += _CAREER.pack(
+            strings.intern(known["id"]),
+            strings.intern(known["title"]) if "title" in known else NO_STRING,
+            salary[0] if salary else 0,
+            salary[1] if salary else 0,
+            flags,
+            trend if trend is not None else 0.0,
+            *slices,
+            strings.intern(json.dumps(extras)) if extras else NO_STRING,
+        )
+
+    id_order = sorted(range(len(careers)), key=lambda i: (careers[i]["id"], i))
+
+    key_sections = []
+    for mapping_key in _MAPPING_KEYS:
+        entries = bytearray()
+        mapping = data.get(mapping_key, {})
+        for key, career_ids in mapping.items():
+            ordinals = sorted({first_ordinal[c] for c in career_ids if c in first_ordinal})
+            entries += _KEY_ENTRY.pack(
+                strings.intern(key),
+                len(list_pool), len(career_ids),
+                len(ordinal_pool), len(ordinals),
+            )
+            list_pool.extend(strings.intern(c) for c in career_ids)
+            ordinal_pool.extend(ordinals)
+        key_sections.append((entries, len(mapping)))
+
+    meta = {k: v for k, v in data.items() if k != "careers" and k not in _MAPPING_KEYS}
+    for mapping_key in _MAPPING_KEYS:
+        if mapping_key not in data:
+            # Remember that the key was absent rather than empty
+            meta.setdefault("__absent__", []).append(mapping_key)
+    meta_sid = strings.intern(json.dumps(meta)) if meta else NO_STRING
+
+    encoded = [s.encode("utf-8") for s in strings.strings]
+    string_offsets = bytearray()
+    position = 0
+    for blob in encoded:
+        string_offsets += _U64.pack(position)
+        position += len(blob)
+    string_offsets += _U64.pack(position)
+
+    sections = [
+        bytes(string_offsets),
+        b"".join(encoded),
+        bytes(records),
+        struct.pack(f"<{len(id_order)}I", *id_order),
+        struct.pack(f"<{len(list_pool)}I", *list_pool),
+        bytes(key_sections[0][0]),
+        bytes(key_sections[1][0]),
+        struct.pack(f"<{len(ordinal_pool)}I", *ordinal_pool),
+    ]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(careers), len(strings.strings),
+        key_sections[0][1], key_sections[1][1], meta_sid,
+        stat.st_mtime_ns, stat.st_size, hashlib.sha256(raw).digest(),
+        *offsets,
+    )
+
+    # Write then rename so processes mapping the old artifact are unaffected
+    tmp_path = f"{output}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, output)
+    return output
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def read_header(path: str) -> Optional[Dict[str, Any]]:
+    """Read just the header of a compiled catalog, or None if it isn't one."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(raw) < _HEADER.size:
+        return None
+    fields = _HEADER.unpack(raw)
+    if fields[0] != MAGIC or fields[1] != FORMAT_VERSION:
+        return None
+    return {
+        "n_careers": fields[2],
+        "n_strings": fields[3],
+        "n_skill_keys": fields[4],
+        "n_pain_keys": fields[5],
+        "meta_sid": fields[6],
+        "source_mtime_ns": fields[7],
+        "source_size": fields[8],
+        "source_sha256": fields[9].hex(),
+        "offsets": fields[10:],
+    }
+
+
+# (artifact, source) -> ((source stat, artifact stat), verdict) of the last content-hash check
+_hash_verdicts: Dict[Tuple[str, str], Tuple[tuple, bool]] = {}
+
+
+def _stat_key(stat: os.stat_result) -> tuple:
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _restamp(compiled_path: str, source_mtime_ns: int):
+    """Record a touched-but-unchanged source's new mtime in the header (best effort)."""
+    try:
+        with open(compiled_path, "r+b") as f:
+            f.seek(_SOURCE_MTIME_AT)
+            f.write(struct.pack("<q", source_mtime_ns))
+    except OSError:
+        pass  # e.g. a read-only install; _hash_verdicts still spares later loads the hash
+
+
+def is_fresh(compiled_path: str, source_path: str) -> bool:
+    """Check whether a compiled artifact still matches its JSON source."""
+    header = read_header(compiled_path)
+    if header is None:
+        return False
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        # No source to compare against; trust the artifact
+        return True
+    if (stat.st_mtime_ns, stat.st_size) == (header["source_mtime_ns"], header["source_size"]):
+        return True
+    if stat.st_size != header["source_size"]:
+        return False
+
+    # Same size but touched (e.g. a checkout): fall back to the content hash,
+    # once per (source, artifact) state rather than on every load
+    key = (os.path.abspath(compiled_path), os.path.abspath(source_path))
+    stats = (_stat_key(stat), _stat_key(os.stat(compiled_path)))
+    cached = _hash_verdicts.get(key)
+    if cached is not None and cached[0] == stats:
+        return cached[1]
+    with open(source_path, "rb") as f:
+        fresh = hashlib.sha256(f.read()).hexdigest() == header["source_sha256"]
+    if fresh:
+        # Later loads, in any process, then match on stat alone
+        _restamp(compiled_path, stat.st_mtime_ns)
+        stats = (stats[0], _stat_key(os.stat(compiled_path)))
+    _hash_verdicts[key] = (stats, fresh)
+    return fresh
+
+
+class CompiledCatalog(Mapping):
+    """Read-only, memory-mapped career map with the same keys as the JSON."""
+
+    def __init__(self, path: str):
+        """Map the file and validate its header; nothing else is decoded yet."""
+        header = read_header(path)
+        if header is None:
+            raise ValueError(f"{path} is not a compiled career catalog")
+
+        self.path = path
+        self.header = header
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mmap)
+
+        (self._string_offsets, self._string_blob, self._careers_at, self._id_order_at,
+         self._list_pool_at, self._skill_keys_at, self._pain_keys_at,
+         self._ordinal_pool_at) = header["offsets"]
+        self._string_cache: Dict[int, str] = {}
+
+        meta = self._json(header["meta_sid"]) if header["meta_sid"] != NO_STRING else {}
+        absent = set(meta.pop("__absent__", ()))
+        self._meta = meta
+
+        self.careers = CareerRecords(self)
+        self._values: Dict[str, Any] = {"careers": self.careers}
+        for mapping_key, n_keys, at in (
+            ("skill_mappings", header["n_skill_keys"], self._skill_keys_at),
+            ("pain_point_solutions", header["n_pain_keys"], self._pain_keys_at),
+        ):
+            if mapping_key not in absent:
+                self._values[mapping_key] = KeyIndex(self, at, n_keys)
+        self._values.update(meta)
+        self._career_index = None
+
+    # -- low-level readers -------------------------------------------------
+
+    def string(self, sid: int) -> str:
+        """Decode an interned string by id."""
+        value = self._string_cache.get(sid)
+        if value is None:
+            at = self._string_offsets + sid * 8
+            start, end = struct.unpack_from("<QQ", self._buf, at)
+            base = self._string_blob
+            value = str(self._buf[base + start:base + end], "utf-8")
+            self._string_cache[sid] = value
+        return value
+
+    def _json(self, sid: int) -> Any:
+        return freeze_json(json.loads(self.string(sid)))
+
+    def u32_slice(self, section_at: int, start: int, count: int) -> Tuple[int, ...]:
+        """Read count u32 values from a pool section."""
+        return struct.unpack_from(f"<{count}I", self._buf, section_at + start * 4)
+
+    def career_record(self, ordinal: int) -> tuple:
+        return _CAREER.unpack_from(self._buf, self._careers_at + ordinal * _CAREER.size)
+
+    def career_id(self, ordinal: int) -> str:
+        return self.string(_U32.unpack_from(self._buf, self._careers_at + ordinal * _CAREER.size)[0])
+
+    def find_ordinal(self, career_id: str) -> Optional[int]:
+        """Binary-search the sorted id table for a career id."""
+        id_order = _SortedIds(self)
+        position = bisect_left(id_order, career_id)
+        if position < len(id_order) and id_order[position] == career_id:
+            return id_order.ordinal(position)
+        return None
+
+    # -- Mapping interface -------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def career_index(self) -> "CompiledCareerIndex":
+        """Index backed by the catalog's prebuilt id order and key tables."""
+        if self._career_index is None:
+            self._career_index = CompiledCareerIndex(self)
+        return self._career_index
+
+    def __reduce__(self):
+        return (CompiledCatalog, (self.path,))
+
+
+class _SortedIds(Sequence):
+    """Career ids in sorted order, read straight from the id-order table."""
+
+    def __init__(self, catalog: CompiledCatalog):
+        self.catalog = catalog
+
+    def ordinal(self, position: int) -> int:
+        return _U32.unpack_from(self.catalog._buf, self.catalog._id_order_at + position * 4)[0]
+
+    def __getitem__(self, position: int) -> str:
+        return self.catalog.career_id(self.ordinal(position))
+
+    def __len__(self) -> int:
+        return self.catalog.header["n_careers"]
+
+
+class CareerRecords(Sequence):
+    """Lazy sequence of career dicts decoded from fixed-size records."""
+
+    def __init__(self, catalog: CompiledCatalog):
+        self.catalog = catalog
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self.catalog.header["n_careers"]
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return tuple(self[i] for i in range(*ordinal.indices(len(self))))
+        if ordinal < 0:
+            ordinal += len(self)
+        if not 0 <= ordinal < len(self):
+            raise IndexError("career ordinal out of range")
+        career = self._decoded.get(ordinal)
+        if career is None:
+            career = self._decoded[ordinal] = self._decode(ordinal)
+        return career
+
+    def list_field(self, ordinal: int, field: str) -> Tuple[str, ...]:
+        """Decode a single list field without materializing the whole career."""
+        record = self.catalog.career_record(ordinal)
+        bit = _LIST_FIELDS.index(field)
+        start, count = record[6 + bit * 2], record[7 + bit * 2]
+        catalog = self.catalog
+        return tuple(catalog.string(s) for s in catalog.u32_slice(catalog._list_pool_at, start, count))
+
+    def _decode(self, ordinal: int) -> Dict[str, Any]:
+        catalog = self.catalog
+        record = catalog.career_record(ordinal)
+        id_sid, title_sid, salary_lo, salary_hi, flags, trend = record[:6]
+        slices = record[6:16]
+        extras_sid = record[16]
+
+        lists = {}
+        for bit, field in enumerate(_LIST_FIELDS):
+            if flags & (1 << (_HAS_LIST + bit)):
+                start, count = slices[bit * 2], slices[bit * 2 + 1]
+                lists[field] = tuple(
+                    catalog.string(s) for s in catalog.u32_slice(catalog._list_pool_at, start, count)
+                )
+
+        career: Dict[str, Any] = {"id": catalog.string(id_sid)}
+        if title_sid != NO_STRING:
+            career["title"] = catalog.string(title_sid)
+        for field in ("required_skills", "friendly_skills"):
+            if field in lists:
+                career[field] = lists[field]
+        if flags & _HAS_SALARY:
+            career["salary_range"] = (salary_lo, salary_hi)
+        if flags & _HAS_REMOTE:
+            career["remote"] = bool(flags & _REMOTE)
+        if flags & _HAS_FREELANCE:
+            career["freelance_viable"] = bool(flags & _FREELANCE)
+        for field in ("entry_path", "good_for_pain"):
+            if field in lists:
+                career[field] = lists[field]
+        if flags & _HAS_TREND:
+            career["trend_relevance"] = trend
+        if "resources" in lists:
+            career["resources"] = lists["resources"]
+        if extras_sid != NO_STRING:
+            career.update(catalog._json(extras_sid))
+        return FrozenDict(career)
+
+
+class KeyIndex(Mapping):
+    """skill_mappings / pain_point_solutions backed by a prebuilt key table."""
+
+    def __init__(self, catalog: CompiledCatalog, section_at: int, n_keys: int):
+        self.catalog = catalog
+        self._section_at = section_at
+        self._n_keys = n_keys
+        self._positions: Optional[Dict[str, int]] = None
+
+    def _entry(self, position: int) -> tuple:
+        return _KEY_ENTRY.unpack_from(self.catalog._buf, self._section_at + position * _KEY_ENTRY.size)
+
+    def _lookup(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {
+                self.catalog.string(self._entry(i)[0]): i for i in range(self._n_keys)
+            }
+        return self._positions
+
+    def __getitem__(self, key: str) -> Tuple[str, ...]:
+        _, start, count, _, _ = self._entry(self._lookup()[key])
+        catalog = self.catalog
+        return tuple(catalog.string(s) for s in catalog.u32_slice(catalog._list_pool_at, start, count))
+
+    def ordinals(self, key: str) -> Tuple[int, ...]:
+        """Sorted career ordinals for a key (unknown career ids dropped)."""
+        position = self._lookup().get(key)
+        if position is None:
+            return ()
+        _, _, _, start, count = self._entry(position)
+        return self.catalog.u32_slice(self.catalog._ordinal_pool_at, start, count)
+
+    def __iter__(self):
+        return iter(self._lookup())
+
+    def __len__(self) -> int:
+        return self._n_keys
+
+
+class CompiledCareerIndex(CareerIndex):
+    """CareerIndex that answers from the compiled catalog instead of dicts."""
+
+    def __init__(self, catalog: CompiledCatalog):
+        self.career_map = catalog
+        self.catalog = catalog
+        self.careers = catalog.careers
+        self._size = len(catalog.careers)
+        self._bits_cache: Dict[Tuple[str, str], int] = {}
+        self._keyword_ordinals = None
+        self._skill_sets: Dict[int, FrozenSet[str]] = {}
+        self._required: Dict[int, Tuple[Tuple[str, str], ...]] = {}
+        self._pain_sets: Dict[int, FrozenSet[str]] = {}
+
+    def ordinal(self, career_id: str) -> Optional[int]:
+        return self.catalog.find_ordinal(career_id)
+
+    def get(self, career_id: str) -> Optional[Dict[str, Any]]:
+        ordinal = self.ordinal(career_id)
+        return self.careers[ordinal] if ordinal is not None else None
+
+    def get_many(self, career_ids) -> List[Dict[str, Any]]:
+        careers = []
+        for career_id in career_ids:
+            career = self.get(career_id)
+            if career is not None:
+                careers.append(career)
+        return careers
+
+    def skill_set(self, career_id: str) -> FrozenSet[str]:
+        ordinal = self.ordinal(career_id)
+        if ordinal is None:
+            return frozenset()
+        skills = self._skill_sets.get(ordinal)
+        if skills is None:
+            friendly = self.careers.list_field(ordinal, "friendly_skills")
+            skills = self._skill_sets[ordinal] = frozenset(
+                [c for _, c in self._required_pairs(ordinal)] + [canonical_skill(s) for s in friendly]
+            )
+        return skills
+
+    def required_skill_pairs(self, career_id: str) -> Tuple[Tuple[str, str], ...]:
+        ordinal = self.ordinal(career_id)
+        return self._required_pairs(ordinal) if ordinal is not None else ()
+
+    def _required_pairs(self, ordinal: int) -> Tuple[Tuple[str, str], ...]:
+        pairs = self._required.get(ordinal)
+        if pairs is None:
+            pairs = self._required[ordinal] = tuple(
+                (s, canonical_skill(s)) for s in self.careers.list_field(ordinal, "required_skills")
+            )
+        return pairs
+
+    def pain_set(self, career_id: str) -> FrozenSet[str]:
+        ordinal = self.ordinal(career_id)
+        if ordinal is None:
+            return frozenset()
+        pains = self._pain_sets.get(ordinal)
+        if pains is None:
+            pains = self._pain_sets[ordinal] = frozenset(
+                p.lower() for p in self.careers.list_field(ordinal, "good_for_pain")
+            )
+        return pains
+
+    def trend_relevance(self, ordinal: int) -> float:
+        # Read straight from the record so ranking doesn't decode every candidate
+        record = self.catalog.career_record(ordinal)
+        if record[4] & _HAS_TREND:
+            return record[5]
+        return self.careers[ordinal].get("trend_relevance", 0)
+
+    def is_remote(self, ordinal: int) -> bool:
+        flags = self.catalog.career_record(ordinal)[4]
+        if flags & _HAS_REMOTE:
+            return bool(flags & _REMOTE)
+        return bool(self.careers[ordinal].get("remote", False))
+
+    def _key_ordinals(self, mapping_key: str, key: str) -> Tuple[int, ...]:
+        # Prebuilt at compile time: already deduplicated and sorted
+        return self.catalog[mapping_key].ordinals(key)
+
+    def is_current(self, career_map: Dict[str, Any]) -> bool:
+        return career_map is self.catalog
+
+    def __contains__(self, career_id: str) -> bool:
+        return self.ordinal(career_id) is not None
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,30 @@
+"""
+Career Pivot Navigator - Configuration
+One-time bootstrap of settings from the environment and .env
+
+Every entry point calls load_config() before reading settings; only the
+first call does any work, so modules can call it freely.
+"""
+
+import os
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config():
+    """Load .env into os.environ once (existing environment variables win)."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
+
+
+def env_flag(name: str, default: str = "0") -> bool:
+    """Whether an on/off environment setting is on (1/true/yes/on)."""
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
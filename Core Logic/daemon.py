@@ -0,0 +1,264 @@
+"""
+Career Pivot Navigator - Resident Daemon
+Keeps a warmed analyzer and plan generator in one process and serves CLI
+requests over a local Unix socket
+
+Start it with `python main.py daemon`; while it runs, `python main.py` and
+`python main.py batch` forward their analyzer and plan calls to it instead
+of importing LangChain, loading the catalog and building clients
+themselves. When it isn't running they work in-process as before.
+
+    PIVOT_DAEMON_SOCKET=~/.cache/career-pivot-navigator/daemon.sock
+    PIVOT_DAEMON=0   # never forward, always run in-process
+
+Protocol: one JSON request line per connection,
+{"method": name, "args": [...], "stream": bool}, answered by zero or more
+{"token": text} lines (when streaming) and one {"result": ...} or
+{"error": "Type: message"} line. The daemon uses its own environment (API
+key, LLM_BACKEND, cache settings).
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+DEFAULT_SOCKET_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "career-pivot-navigator", "daemon.sock"
+)
+
+# Seconds a client waits to connect before running in-process instead
+CONNECT_TIMEOUT = 0.5
+
+# method -> (object it runs on, whether it accepts on_token)
+METHODS = {
+    "analyze_pivot": ("analyzer", True),
+    "instant_analysis": ("analyzer", False),
+    "generate_3_step_plan": ("plan_gen", True),
+    "generate_monetization_strategy": ("plan_gen", False),
+    "generate_mindset_coaching": ("plan_gen", False),
+    "generate_pivot_bundle": ("plan_gen", False),
+}
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+class DaemonError(RuntimeError):
+    """A request raised inside the daemon (the message is "Type: message")."""
+
+
+def socket_path() -> str:
+    """The daemon's socket path (PIVOT_DAEMON_SOCKET)."""
+    return os.path.expanduser(os.getenv("PIVOT_DAEMON_SOCKET", DEFAULT_SOCKET_PATH))
+
+
+def daemon_enabled() -> bool:
+    """False when PIVOT_DAEMON turns forwarding off, or the platform has no Unix sockets."""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    return os.getenv("PIVOT_DAEMON", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def socket_in_use(path: Optional[str] = None) -> bool:
+    """Whether something accepts connections on the socket, whatever PIVOT_DAEMON says.
+
+    Only a refused connection marks the socket as stale; a timeout (a busy
+    daemon) or any other error counts as in use.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path or socket_path())
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except OSError:
+        return True
+    finally:
+        sock.close()
+    return True
+
+
+def _send(wfile, message: Dict[str, Any]):
+    wfile.write((json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+    wfile.flush()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def request(message: Dict[str, Any], on_token: Optional[Callable[[str], None]] = None,
+            path: Optional[str] = None) -> Any:
+    """Send one request and return its result.
+
+    Raises DaemonUnavailable if nothing is listening, DaemonError if the
+    request failed inside the daemon. Streamed tokens go to on_token.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(path or socket_path())
+    except OSError as e:
+        sock.close()
+        raise DaemonUnavailable(str(e)) from e
+    sock.settimeout(None)  # LLM calls take as long as they take
+
+    with sock, sock.makefile("rwb") as stream:
+        _send(stream, message)
+        for line in stream:
+            reply = json.loads(line)
+            if "token" in reply:
+                if on_token is not None:
+                    on_token(reply["token"])
+            elif "error" in reply:
+                raise DaemonError(reply["error"])
+            else:
+                return reply.get("result")
+    raise DaemonUnavailable("daemon closed the connection without a result")
+
+
+def call(method: str, *args: Any, on_token: Optional[Callable[[str], None]] = None) -> Any:
+    """Run an analyzer / plan generator method in the daemon."""
+    return request({"method": method, "args": list(args), "stream": on_token is not None}, on_token)
+
+
+def status(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The running daemon's status (pid, uptime, requests, socket), or None if none is running."""
+    if not daemon_enabled():
+        return None
+    try:
+        return request({"method": "status"}, path=path)
+    except (DaemonUnavailable, DaemonError):
+        return None
+
+
+class RemoteAnalyzer:
+    """CareerPivotAnalyzer look-alike whose calls run in the daemon."""
+
+    def analyze_pivot(self, user_data: Dict[str, Any],
+                      on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        return call("analyze_pivot", user_data, on_token=on_token)
+
+    def instant_analysis(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        return call("instant_analysis", user_data)
+
+
+class RemotePlanGenerator:
+    """PivotPlanGenerator look-alike whose calls run in the daemon."""
+
+    def generate_3_step_plan(self, user_data: Dict[str, Any], target_career: Dict[str, Any],
+                             on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        return call("generate_3_step_plan", user_data, target_career, on_token=on_token)
+
+    def generate_monetization_strategy(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> str:
+        return call("generate_monetization_strategy", user_data, target_career)
+
+    def generate_mindset_coaching(self, user_data: Dict[str, Any], fears: Optional[List[str]] = None,
+                                  dreams: Optional[List[str]] = None) -> str:
+        return call("generate_mindset_coaching", user_data, fears, dreams)
+
+    def generate_pivot_bundle(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        return call("generate_pivot_bundle", user_data, target_career)
+
+
+def connect() -> Optional[Tuple[RemoteAnalyzer, RemotePlanGenerator]]:
+    """(analyzer, plan generator) proxies if a daemon is running, else None (run in-process)."""
+    if status() is None:
+        return None
+    return RemoteAnalyzer(), RemotePlanGenerator()
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serve one request line per connection."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        daemon: "PivotDaemon" = self.server.pivot_daemon
+        try:
+            message = json.loads(line)
+            result = daemon.dispatch(message, on_token=lambda token: _send(self.wfile, {"token": token}))
+            _send(self.wfile, {"result": result})
+        except BrokenPipeError:
+            pass  # the client went away
+        except Exception as e:
+            try:
+                _send(self.wfile, {"error": f"{type(e).__name__}: {e}"})
+            except OSError:
+                pass
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    pivot_daemon: Optional["PivotDaemon"] = None
+
+
+class PivotDaemon:
+    """A warmed CareerPivotAnalyzer and PivotPlanGenerator behind a Unix socket."""
+
+    def __init__(self, analyzer: Any = None, plan_gen: Any = None, path: Optional[str] = None):
+        """Build (or take) the analyzer and plan generator that every request shares."""
+        if analyzer is None:
+            from analyze import CareerPivotAnalyzer
+            analyzer = CareerPivotAnalyzer()
+        if plan_gen is None:
+            from plan_generator import PivotPlanGenerator
+            plan_gen = PivotPlanGenerator()
+        self.targets = {"analyzer": analyzer, "plan_gen": plan_gen}
+        self.path = path or socket_path()
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def dispatch(self, message: Dict[str, Any], on_token: Callable[[str], None]) -> Any:
+        """Run one request: an analyzer / plan generator method, "status" or "shutdown"."""
+        method = message.get("method")
+        with self._lock:
+            self.requests += 1
+        if method == "status":
+            return {"pid": os.getpid(), "uptime": time.time() - self.started,
+                    "requests": self.requests, "socket": self.path}
+        if method == "shutdown":
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {"pid": os.getpid()}
+        if method not in METHODS:
+            raise ValueError(f"Unknown daemon method {method!r}")
+
+        target, streams = METHODS[method]
+        kwargs = {"on_token": on_token} if streams and message.get("stream") else {}
+        return getattr(self.targets[target], method)(*message.get("args", []), **kwargs)
+
+    def serve_forever(self):
+        """Listen on the socket until a shutdown request (or Ctrl-C), then remove it."""
+        if os.path.exists(self.path):
+            if not stat.S_ISSOCK(os.stat(self.path).st_mode):
+                raise RuntimeError(f"{self.path} exists and is not a socket")
+            if socket_in_use(self.path):
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            os.unlink(self.path)  # left behind by a daemon that didn't exit cleanly
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        old_umask = os.umask(0o077)  # only this user may connect
+        try:
+            self._server = _Server(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.pivot_daemon = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
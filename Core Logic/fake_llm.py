@@ -0,0 +1,201 @@
+"""
+Career Pivot Navigator - Fake LLM Backend
+Deterministic local chat model for benchmarks, load tests and offline runs
+
+Select it with LLM_BACKEND=fake. Responses depend only on the prompt and
+FAKE_LLM_SEED, so repeated runs produce identical output. Simulated timing:
+
+    FAKE_LLM_LATENCY=lognormal:0.8,0.5   # time to first token (see parse_latency)
+    FAKE_LLM_TOKENS_PER_SECOND=60        # 0 = the whole response at once
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+from typing import Any, Dict, Iterator, AsyncIterator, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+LATENCY_KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+STEP_TITLES = [
+    "Map your transferable skills", "Take a free foundations course", "Build one portfolio project",
+    "Run three informational interviews", "Publish a case study", "Land a first paid gig",
+    "Shadow someone in the role", "Join a practitioner community",
+]
+ACTIONS = [
+    "Block two 90-minute sessions and work through the first modules of a free course.",
+    "Pick one real problem from your current job and document how you solved it.",
+    "Message five people in the target role on LinkedIn with one specific question each.",
+    "Rewrite your last three accomplishments in the language of the new field.",
+    "Offer a small fixed-price project to a local nonprofit or small business.",
+]
+TIMES = ["1-2 weeks at 5 hrs/week", "2-3 weeks at 5 hrs/week", "3-4 weeks at 8 hrs/week", "ongoing, 2 hrs/week"]
+RESOURCES = [
+    "Google Career Certificates (free to audit)", "freeCodeCamp", "Coursera (audit mode)",
+    "YouTube: practitioner channels", "Local library workshops", "LinkedIn Learning (library card)",
+]
+PARAGRAPHS = [
+    "Your existing skills transfer more directly than you think: the day-to-day work is "
+    "communication, judgment and follow-through, all of which you already do under pressure.",
+    "The honest challenge is the credential gap. It is real, and it is smaller than it looks; "
+    "a small body of visible work closes most of it.",
+    "Start with low-cost, reversible steps so you can test the fit before committing money or time.",
+    "Systemic barriers are real. Plan around them explicitly instead of pretending they aren't there.",
+    "Quick win: spend thirty minutes this week writing down three problems you solved at work.",
+]
+
+
+def parse_latency(spec: str) -> Tuple[str, List[float]]:
+    """Parse a latency spec: fixed:S, uniform:LO,HI, normal:MEAN,STD or lognormal:MEDIAN,SIGMA."""
+    kind, _, params = spec.strip().partition(":")
+    kind = kind.lower() or "fixed"
+    values = [float(p) for p in params.split(",") if p.strip()] or [0.0]
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(f"Invalid latency spec {spec!r}; use one of {', '.join(LATENCY_KINDS)}")
+    return kind, values
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    """Draw one latency (seconds, never negative) from a parse_latency spec."""
+    kind, values = parse_latency(spec)
+    if kind == "fixed":
+        return max(0.0, values[0])
+    if kind == "uniform":
+        return rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return max(0.0, rng.gauss(values[0], values[1]))
+    return values[0] * math.exp(rng.gauss(0.0, values[1]))
+
+
+def split_tokens(text: str) -> List[str]:
+    """Split text into word-sized chunks that join back to exactly text."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _field(prompt: str, label: str, default: str) -> str:
+    match = re.search(rf"^{label}:\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def canned_steps(rng: random.Random) -> List[Dict[str, Any]]:
+    """Three plan steps with the fields create_step extracts."""
+    return [{
+        "title": title,
+        "action": rng.choice(ACTIONS),
+        "time_estimate": rng.choice(TIMES),
+        "resources": rng.sample(RESOURCES, 2),
+        "rationale": "It builds evidence for the new role without a big upfront cost.",
+        "success_metric": "You can point to something concrete you finished.",
+    } for title in rng.sample(STEP_TITLES, 3)]
+
+
+def canned_response(prompt: str, rng: random.Random) -> str:
+    """Plausible, structured output for whichever of the app's prompts this is."""
+    target = _field(prompt, "Target role", _field(prompt, "Target career", "the new role"))
+
+    if "single JSON object" in prompt:
+        return json.dumps({
+            "steps": canned_steps(rng),
+            "monetization": f"1. **Freelance** {target} work for small clients, starting this month.\n"
+                            f"2. **Portfolio side project** that doubles as a paid sample.",
+            "coaching": "**Permission slip**: this is possible.\n**Reality check**: it takes months, "
+                        "not days.\n**Mindset reframe**: you are testing, not betting everything.\n"
+                        "**First micro-action**: write down one skill you use every day.",
+        })
+
+    if "STEP TITLE" in prompt or "3-step" in prompt.lower():
+        # Values go on the line after each label, which is where create_step reads them
+        return "\n\n".join(
+            f"STEP TITLE: {step['title']}\n"
+            f"ACTION:\n{step['action']}\n"
+            f"TIME:\n{step['time_estimate']}\n"
+            "RESOURCES:\n" + "\n".join(f"- {r}" for r in step["resources"]) + "\n"
+            f"WHY:\n{step['rationale']}\n"
+            f"SUCCESS:\n{step['success_metric']}"
+            for step in canned_steps(rng)
+        )
+
+    heading = f"## Pivot toward {target}" if target != "the new role" else "## Your pivot options"
+    return heading + "\n\n" + "\n\n".join(rng.sample(PARAGRAPHS, 3))
+
+
+class FakePivotChatModel(BaseChatModel):
+    """Offline stand-in for ChatOpenAI with deterministic, prompt-keyed output."""
+
+    model_name: str = "fake-gpt-4o"
+    temperature: Optional[float] = 0.7
+    latency: str = "fixed:0"
+    tokens_per_second: float = 0.0
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-pivot"
+
+    def _rng(self, messages: List[BaseMessage]) -> random.Random:
+        prompt = "\n".join(str(m.content) for m in messages)
+        digest = hashlib.sha256(f"{self.seed}\n{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _respond(self, messages: List[BaseMessage]) -> Tuple[str, float, float]:
+        """(response text, time to first token, delay between tokens)."""
+        rng = self._rng(messages)
+        text = canned_response("\n".join(str(m.content) for m in messages), rng)
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return text, sample_latency(self.latency, rng), delay
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text, first, delay = self._respond(messages)
+        time.sleep(first + delay * len(split_tokens(text)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text, first, delay = self._respond(messages)
+        await asyncio.sleep(first + delay * len(split_tokens(text)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text, first, delay = self._respond(messages)
+        time.sleep(first)
+        for i, token in enumerate(split_tokens(text)):
+            if i and delay:
+                time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text, first, delay = self._respond(messages)
+        await asyncio.sleep(first)
+        for i, token in enumerate(split_tokens(text)):
+            if i and delay:
+                await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(token)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def fake_chat_model_from_env(model: str = "gpt-4o", temperature: Optional[float] = 0.7) -> FakePivotChatModel:
+    """FakePivotChatModel configured from FAKE_LLM_* environment variables."""
+    latency = os.getenv("FAKE_LLM_LATENCY", "fixed:0")
+    parse_latency(latency)  # fail fast on a bad spec
+    return FakePivotChatModel(
+        model_name=f"fake-{model}",
+        temperature=temperature,
+        latency=latency,
+        tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0")),
+        seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+    )
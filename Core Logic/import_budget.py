@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Career Pivot Navigator - Import-Time Budget
+Start-up import cost of the entry points, measured with python -X importtime
+and checked against the budget in import_budget.json
+
+Usage:
+    python import_budget.py            # report and check every entry in the budget
+    python import_budget.py --top 15   # also list the 15 slowest imports per entry
+    python import_budget.py --update   # rewrite the budget from this machine's timings
+
+Each budget entry is a command (an import or a main.py invocation), the
+milliseconds its imports may take beyond a bare interpreter's start-up
+(site, .pth hooks), and modules it must not import at all,
+e.g. main.py --help must not load LangChain or the OpenAI client. Exits 1
+when an entry is over budget or imports a forbidden module.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Any, Set, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUDGET_PATH = os.path.join(HERE, "import_budget.json")
+
+# Headroom over the measured time when --update writes a new budget
+UPDATE_HEADROOM = 2.0
+
+
+def entry_argv(command: str) -> List[str]:
+    """Interpreter arguments for a budget command: "import x" or "main.py --help"."""
+    if command.startswith("import ") or command == "pass":
+        return ["-c", command]
+    return command.split()
+
+
+def measure(command: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every import the command makes, in import order."""
+    env = dict(os.environ, LLM_BACKEND="fake", LLM_CACHE="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + entry_argv(command),
+        cwd=HERE, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, universal_newlines=True,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |  cumulative | <indent>module", indented by nesting depth
+        prefix, cumulative_us, name = line.split("|", 2)
+        imports.append((name[1:].rstrip(), int(prefix.split(":")[1]), int(cumulative_us)))
+    return imports
+
+
+def startup_modules() -> Set[str]:
+    """Modules a bare interpreter imports (site, .pth hooks), which no command can avoid."""
+    return {name.strip() for name, _, _ in measure("pass")}
+
+
+def total_ms(imports: List[Tuple[str, int, int]], startup: Set[str]) -> float:
+    """Import time of a command: the top-level imports' cumulative times, minus start-up."""
+    return sum(cumulative for name, _, cumulative in imports
+               if not name.startswith(" ") and name not in startup) / 1000
+
+
+def best_of(command: str, runs: int, startup: Set[str]) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """The fastest of several runs (import timings are noisy), with its imports."""
+    results = [measure(command) for _ in range(runs)]
+    fastest = min(results, key=lambda imports: total_ms(imports, startup))
+    return total_ms(fastest, startup), fastest
+
+
+def load_budget() -> Dict[str, Dict[str, Any]]:
+    with open(BUDGET_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check start-up import time against import_budget.json")
+    parser.add_argument("--runs", type=int, default=3, help="runs per entry; the fastest counts (default 3)")
+    parser.add_argument("--top", type=int, default=0, help="list the N slowest imports of each entry")
+    parser.add_argument("--update", action="store_true", help="rewrite the budget ms from this machine")
+    args = parser.parse_args(argv)
+
+    budget = load_budget()
+    startup = startup_modules()
+    failures = 0
+
+    print(f"\n⏱️  Import-time budget ({os.path.basename(sys.executable)} -X importtime, best of {args.runs})")
+    print(f"{'command':<28} | {'ms':>7} | {'budget':>7} | status")
+    print("-" * 58)
+
+    for command, entry in budget.items():
+        ms, imports = best_of(command, args.runs, startup)
+        names = {name.strip() for name, _, _ in imports}
+        forbidden = sorted(m for m in entry.get("forbid", [])
+                           if m in names or any(n.startswith(m + ".") for n in names))
+
+        if args.update:
+            entry["max_ms"] = round(ms * UPDATE_HEADROOM, -1) or 10
+        over = ms > entry["max_ms"]
+        status = "✅ ok"
+        if over:
+            status = "❌ over budget"
+        if forbidden:
+            status = f"❌ imports {', '.join(forbidden)}"
+        failures += int(over or bool(forbidden))
+        print(f"{command:<28} | {ms:>7.1f} | {entry['max_ms']:>7.0f} | {status}")
+
+        if args.top:
+            own = [item for item in imports if item[0].strip() not in startup]
+            for name, _, cumulative in sorted(own, key=lambda item: -item[2])[:args.top]:
+                print(f"    {cumulative / 1000:>8.1f} ms  {name.strip()}")
+
+    if args.update:
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+        print(f"\n📝 Budget written to {BUDGET_PATH}")
+    print()
+    return 1 if failures and not args.update else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Career Pivot Navigator - LLM Response Cache
+Persistent (SQLite) cache of completions keyed on model, temperature and prompt
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from config import env_flag
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "career-pivot-navigator", "llm_cache.sqlite3"
+)
+
+
+def cache_key(model: str, temperature: Optional[float], prompt: str) -> str:
+    """Stable key for one completion request."""
+    payload = json.dumps([model, temperature, hashlib.sha256(prompt.encode("utf-8")).hexdigest()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Size-bounded LRU cache of LLM responses with a TTL, stored on disk.
+
+    Entries survive restarts, so re-running a batch after a crash only pays
+    for the prompts that never completed.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 10000,
+                 max_bytes: int = 50 * 1024 * 1024, ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 cache_nonzero_temperature: bool = True):
+        """Open (or create) the cache database.
+
+        Sampled (temperature > 0) calls are cached too, so a repeated prompt
+        returns the same text until the entry expires. Set
+        cache_nonzero_temperature=False to give every such call a fresh completion.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                temperature REAL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_used)")
+        self._conn.commit()
+        # Running totals, so a store doesn't have to scan the table to check the limits
+        self._rows, self._bytes = self._totals()
+
+    def _totals(self) -> Tuple[int, int]:
+        """(rows, bytes) actually in the table."""
+        return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def enabled_for(self, temperature: Optional[float]) -> bool:
+        """Whether calls at this temperature should use the cache."""
+        return self.cache_nonzero_temperature or not temperature
+
+    def lookup(self, model: str, temperature: Optional[float], prompt: str) -> Optional[str]:
+        """Return the cached response, or None on a miss / bypass."""
+        if not self.enabled_for(temperature):
+            self._count("bypassed")
+            return None
+
+        key = cache_key(model, temperature, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._rows -= 1
+                self._bytes -= len(row[0].encode("utf-8"))
+                row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+            return row[0]
+
+    def store(self, model: str, temperature: Optional[float], prompt: str, response: str):
+        """Save a response and evict least-recently-used entries over the limits."""
+        if not self.enabled_for(temperature):
+            return
+
+        key = cache_key(model, temperature, prompt)
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, temperature, response, size, now, now)
+            )
+            if replaced is None:
+                self._rows += 1
+            self._bytes += size - (replaced[0] if replaced else 0)
+            self.stats["stores"] += 1
+            if self._rows > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Other processes may share the database: recount before deleting anything
+        count, total = self._rows, self._bytes = self._totals()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        self._rows, self._bytes = count, total
+        self.stats["evictions"] += evicted
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def clear(self):
+        """Delete every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._rows = self._bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache configured from the environment (None when disabled).
+
+    LLM_CACHE=0 disables caching, LLM_CACHE_PATH moves the database and
+    LLM_CACHE_NONZERO_TEMPERATURE=0 bypasses it for sampled calls.
+    """
+    global _default_cache
+    if not env_flag("LLM_CACHE", "1"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache(
+                path=os.path.expanduser(os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)),
+                cache_nonzero_temperature=env_flag("LLM_CACHE_NONZERO_TEMPERATURE", "1")
+            )
+        return _default_cache
@@ -0,0 +1,328 @@
+"""
+Career Pivot Navigator - LLM Calls
+The one place prompt | llm chains are run, so cross-cutting concerns
+(response caching, single-flight, streaming, batching, metrics, rate limiting, ...) apply to every analyzer and plan-generator call
+"""
+
+import time
+from typing import Dict, List, Any, Callable, NamedTuple, Optional, Tuple, Union
+
+from llm_cache import LLMResponseCache
+from llm_metrics import count_tokens, get_metrics, usage_tokens
+from rate_limit import get_rate_limiter
+from single_flight import get_single_flight
+
+
+def model_identity(llm: Any) -> Tuple[str, Optional[float]]:
+    """(model name, temperature) for a chat model, as used in cache keys."""
+    # llm.bind(...) wraps the model; key on the underlying one
+    llm = getattr(llm, "bound", llm)
+    model = (getattr(llm, "model_name", None) or getattr(llm, "model", None)
+             or type(llm).__name__)
+    return str(model), getattr(llm, "temperature", None)
+
+
+def render_prompt(chain: Any, variables: Dict[str, Any]) -> str:
+    """Render the chain's prompt template exactly as the model will see it."""
+    return chain.first.format(**variables)
+
+
+def response_text(result: Any) -> str:
+    """Extract the text from a chat model result."""
+    return result.content if hasattr(result, 'content') else str(result)
+
+
+def chain_name(chain: Any) -> str:
+    """Name a chain is reported under in llm_metrics (set in setup_chains)."""
+    return getattr(chain, "name", None) or "unnamed_chain"
+
+
+class _Call(NamedTuple):
+    model: str
+    temperature: Optional[float]
+    prompt: str
+    cached: Optional[str]
+
+    def key(self) -> Tuple[str, Optional[float], str]:
+        """Identity of the request, for coalescing identical in-flight calls."""
+        return self.model, self.temperature, self.prompt
+
+
+class _Response(NamedTuple):
+    text: str
+    usage: Optional[Tuple[int, int]]
+    estimate: Optional[float]
+
+
+def _begin(chain: Any, variables: Dict[str, Any], cache: Optional[LLMResponseCache]) -> _Call:
+    """Resolve the model and rendered prompt, and look the call up in the cache."""
+    model, temperature = model_identity(chain.last)
+    prompt = render_prompt(chain, variables)
+    cached = cache.lookup(model, temperature, prompt) if cache is not None else None
+    return _Call(model, temperature, prompt, cached)
+
+
+def _finish(chain: Any, variables: Dict[str, Any], cache: Optional[LLMResponseCache], call: _Call,
+            text: str, started: float, usage: Optional[Tuple[int, int]] = None,
+            estimate: Optional[float] = None, shared: bool = False) -> str:
+    """Store a fresh response in the cache, record its metrics and settle its rate-limit estimate.
+
+    shared responses came from another caller's identical in-flight call,
+    which already cached and paid for them.
+    """
+    cached = call.cached is not None
+    if cache is not None and not cached and not shared:
+        cache.store(call.model, call.temperature, call.prompt, text)
+    tokens = get_metrics().record(chain_name(chain), call.model, call.prompt, variables, text,
+                                  time.perf_counter() - started, usage=usage, cached=cached,
+                                  coalesced=shared)
+    limiter = get_rate_limiter()
+    if limiter is not None and estimate is not None and not shared:
+        limiter.settle(estimate, tokens)
+    return text
+
+
+def _finish_response(chain: Any, variables: Dict[str, Any], cache: Optional[LLMResponseCache],
+                     call: _Call, response: _Response, shared: bool, started: float) -> str:
+    """_finish for a response fetched through _coalesced."""
+    return _finish(chain, variables, cache, call, response.text, started, response.usage,
+                   response.estimate, shared)
+
+
+def _estimate_tokens(chain: Any, call: _Call) -> float:
+    """Expected prompt + completion tokens, for the tokens/min bucket."""
+    return (count_tokens(call.prompt, call.model)
+            + get_metrics().average_completion_tokens(chain_name(chain)))
+
+
+def _limited(chain: Any, call: _Call, fn: Callable[[], Any],
+             can_retry: Callable[[], bool] = lambda: True) -> Tuple[Any, Optional[float]]:
+    """Run fn under the shared rate limiter; returns (result, token estimate)."""
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return fn(), None
+    estimate = _estimate_tokens(chain, call)
+    return limiter.call(fn, estimate, can_retry), estimate
+
+
+async def _alimited(chain: Any, call: _Call, fn: Callable[[], Any],
+                    can_retry: Callable[[], bool] = lambda: True) -> Tuple[Any, Optional[float]]:
+    """Async _limited: fn returns an awaitable."""
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return await fn(), None
+    estimate = _estimate_tokens(chain, call)
+    return await limiter.acall(fn, estimate, can_retry), estimate
+
+
+def _coalesced(call: _Call, fetch: Callable[[], _Response]) -> Tuple[_Response, bool]:
+    """Run fetch, or share the identical call already in flight; returns (response, shared)."""
+    flights = get_single_flight()
+    if flights is None:
+        return fetch(), False
+    return flights.do(call.key(), fetch)
+
+
+async def _acoalesced(call: _Call, fetch: Callable[[], Any]) -> Tuple[_Response, bool]:
+    """Async _coalesced: fetch returns an awaitable."""
+    flights = get_single_flight()
+    if flights is None:
+        return await fetch(), False
+    return await flights.ado(call.key(), fetch)
+
+
+def _stream_usage(usage: Optional[Tuple[int, int]], chunk: Any) -> Optional[Tuple[int, int]]:
+    """Accumulate the usage some providers attach to (usually the last) stream chunk."""
+    chunk_usage = usage_tokens(chunk)
+    if chunk_usage is None:
+        return usage
+    if usage is None:
+        return chunk_usage
+    return usage[0] + chunk_usage[0], usage[1] + chunk_usage[1]
+
+
+def invoke_chain(chain: Any, variables: Dict[str, Any],
+                 cache: Optional[LLMResponseCache] = None) -> str:
+    """Run a prompt | llm chain and return the response text.
+
+    With a cache, byte-identical prompts to the same model and temperature
+    are answered from disk instead of the network, and concurrent identical
+    calls share one request (single_flight.py). Every call is recorded in
+    llm_metrics and runs under the shared rate limiter (rate_limit.py).
+    """
+    started = time.perf_counter()
+    call = _begin(chain, variables, cache)
+    if call.cached is not None:
+        return _finish(chain, variables, cache, call, call.cached, started)
+
+    def fetch() -> _Response:
+        message, estimate = _limited(chain, call, lambda: chain.invoke(variables))
+        return _Response(response_text(message), usage_tokens(message), estimate)
+
+    response, shared = _coalesced(call, fetch)
+    return _finish_response(chain, variables, cache, call, response, shared, started)
+
+
+async def ainvoke_chain(chain: Any, variables: Dict[str, Any],
+                        cache: Optional[LLMResponseCache] = None) -> str:
+    """Async invoke_chain, built on chain.ainvoke."""
+    started = time.perf_counter()
+    call = _begin(chain, variables, cache)
+    if call.cached is not None:
+        return _finish(chain, variables, cache, call, call.cached, started)
+
+    async def fetch() -> _Response:
+        message, estimate = await _alimited(chain, call, lambda: chain.ainvoke(variables))
+        return _Response(response_text(message), usage_tokens(message), estimate)
+
+    response, shared = await _acoalesced(call, fetch)
+    return _finish_response(chain, variables, cache, call, response, shared, started)
+
+
+def stream_chain(chain: Any, variables: Dict[str, Any], on_token: Callable[[str], None],
+                 cache: Optional[LLMResponseCache] = None) -> str:
+    """Like invoke_chain, but hands each token to on_token as it arrives.
+
+    Returns the assembled text, identical to what invoke_chain returns. A
+    cache hit, or a response shared from an identical in-flight call, is
+    delivered to on_token in one piece. A throttled stream is retried only if
+    it failed before its first token.
+    """
+    started = time.perf_counter()
+    call = _begin(chain, variables, cache)
+    if call.cached is not None:
+        on_token(call.cached)
+        return _finish(chain, variables, cache, call, call.cached, started)
+
+    pieces: List[str] = []
+
+    def consume() -> Optional[Tuple[int, int]]:
+        usage = None
+        for chunk in chain.stream(variables):
+            usage = _stream_usage(usage, chunk)
+            piece = response_text(chunk)
+            if piece:
+                pieces.append(piece)
+                on_token(piece)
+        return usage
+
+    def fetch() -> _Response:
+        usage, estimate = _limited(chain, call, consume, can_retry=lambda: not pieces)
+        return _Response("".join(pieces), usage, estimate)
+
+    response, shared = _coalesced(call, fetch)
+    if shared:
+        on_token(response.text)
+    return _finish_response(chain, variables, cache, call, response, shared, started)
+
+
+async def astream_chain(chain: Any, variables: Dict[str, Any], on_token: Callable[[str], None],
+                        cache: Optional[LLMResponseCache] = None) -> str:
+    """Async stream_chain, built on chain.astream."""
+    started = time.perf_counter()
+    call = _begin(chain, variables, cache)
+    if call.cached is not None:
+        on_token(call.cached)
+        return _finish(chain, variables, cache, call, call.cached, started)
+
+    pieces: List[str] = []
+
+    async def consume() -> Optional[Tuple[int, int]]:
+        usage = None
+        async for chunk in chain.astream(variables):
+            usage = _stream_usage(usage, chunk)
+            piece = response_text(chunk)
+            if piece:
+                pieces.append(piece)
+                on_token(piece)
+        return usage
+
+    async def fetch() -> _Response:
+        usage, estimate = await _alimited(chain, call, consume, can_retry=lambda: not pieces)
+        return _Response("".join(pieces), usage, estimate)
+
+    response, shared = await _acoalesced(call, fetch)
+    if shared:
+        on_token(response.text)
+    return _finish_response(chain, variables, cache, call, response, shared, started)
+
+
+def error_result(exc: BaseException) -> Dict[str, str]:
+    """Per-item {"error": ...} result for a failed item in a batch."""
+    return {"error": f"{type(exc).__name__}: {exc}"}
+
+
+def _batch_begin(chain: Any, variables_list: List[Dict[str, Any]],
+                 cache: Optional[LLMResponseCache]) -> Tuple[List[_Call], List[int]]:
+    """Look every item up in the cache (recording hits now); return the calls and the misses."""
+    calls = []
+    for variables in variables_list:
+        started = time.perf_counter()
+        call = _begin(chain, variables, cache)
+        if call.cached is not None:
+            _finish(chain, variables, cache, call, call.cached, started)
+        calls.append(call)
+    return calls, [i for i, call in enumerate(calls) if call.cached is None]
+
+
+def _batch_merge(chain: Any, variables_list: List[Dict[str, Any]], cache: Optional[LLMResponseCache],
+                 calls: List[_Call], misses: List[int], responses: List[Any],
+                 started: float) -> List[Union[str, Exception]]:
+    """Results in input order: cache hits plus batch responses (cached and recorded).
+
+    Each response's latency is the batch's wall time, i.e. how long it waited.
+    """
+    results: List[Union[str, Exception]] = [call.cached for call in calls]
+    for i, outcome in zip(misses, responses):
+        if isinstance(outcome, Exception):
+            results[i] = outcome
+        else:
+            response, shared = outcome
+            results[i] = _finish_response(chain, variables_list[i], cache, calls[i], response, shared,
+                                          started)
+    return results
+
+
+def batch_chain(chain: Any, variables_list: List[Dict[str, Any]], max_concurrency: int = 8,
+                cache: Optional[LLMResponseCache] = None) -> List[Union[str, Exception]]:
+    """invoke_chain for many inputs via chain.batch, at most max_concurrency in flight.
+
+    Returns one entry per input, in input order: the response text, or the
+    exception that call raised (a failed item doesn't abort the others).
+    """
+    calls, misses = _batch_begin(chain, variables_list, cache)
+    started = time.perf_counter()
+
+    from langchain_core.runnables import RunnableLambda
+
+    # Batch over item indices so each item goes through single-flight and the rate limiter
+    def invoke_one(i: int) -> Tuple[_Response, bool]:
+        def fetch() -> _Response:
+            message, estimate = _limited(chain, calls[i], lambda: chain.invoke(variables_list[i]))
+            return _Response(response_text(message), usage_tokens(message), estimate)
+        return _coalesced(calls[i], fetch)
+
+    responses = RunnableLambda(invoke_one).batch(
+        misses, config={"max_concurrency": max_concurrency}, return_exceptions=True
+    ) if misses else []
+    return _batch_merge(chain, variables_list, cache, calls, misses, responses, started)
+
+
+async def abatch_chain(chain: Any, variables_list: List[Dict[str, Any]], max_concurrency: int = 8,
+                       cache: Optional[LLMResponseCache] = None) -> List[Union[str, Exception]]:
+    """Async batch_chain, built on chain.abatch."""
+    calls, misses = _batch_begin(chain, variables_list, cache)
+    started = time.perf_counter()
+
+    from langchain_core.runnables import RunnableLambda
+
+    async def ainvoke_one(i: int) -> Tuple[_Response, bool]:
+        async def fetch() -> _Response:
+            message, estimate = await _alimited(chain, calls[i], lambda: chain.ainvoke(variables_list[i]))
+            return _Response(response_text(message), usage_tokens(message), estimate)
+        return await _acoalesced(calls[i], fetch)
+
+    responses = await RunnableLambda(ainvoke_one).abatch(
+        misses, config={"max_concurrency": max_concurrency}, return_exceptions=True
+    ) if misses else []
+    return _batch_merge(chain, variables_list, cache, calls, misses, responses, started)
@@ -0,0 +1,112 @@
+"""
+Career Pivot Navigator - LLM Clients
+Process-wide registry of chat models sharing one keep-alive HTTP connection pool
+
+LLM_BACKEND selects the implementation: "openai" (default) or "fake", the
+deterministic offline model in fake_llm.py. With LLM_CASSETTE set, models are
+wrapped to record their traffic or replay it (see cassette.py). httpx and
+langchain_openai are imported when the first client is created.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from rate_limit import rate_limiting_enabled
+
+BACKENDS = ("openai", "fake")
+
+# Connections kept open to the API; raise for many concurrent calls (PLAN_WORKERS, batches)
+DEFAULT_POOL_SIZE = 20
+# Seconds an idle keep-alive connection stays in the pool
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+_clients: Dict[Tuple[str, Optional[str], str, Optional[float], Optional[str]], Any] = {}
+_http_client: Optional[Any] = None  # httpx.Client
+_lock = threading.Lock()
+
+
+def llm_backend() -> str:
+    """The configured backend name (LLM_BACKEND, default "openai")."""
+    backend = os.getenv("LLM_BACKEND", "openai").strip().lower() or "openai"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND {backend!r}; use one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def needs_api_key() -> bool:
+    """Whether LLM calls will reach the OpenAI API (not fake, not a cassette replay)."""
+    from cassette import cassette_mode
+    return llm_backend() == "openai" and cassette_mode() != "replay"
+
+
+def default_base_url() -> Optional[str]:
+    """API base URL from the environment (None means the OpenAI default)."""
+    return os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or None
+
+
+def get_http_client() -> Any:
+    """The shared keep-alive connection pool (an httpx.Client sized by LLM_POOL_SIZE)."""
+    global _http_client
+    import httpx
+
+    with _lock:
+        if _http_client is None:
+            pool_size = int(os.getenv("LLM_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_SECONDS", str(DEFAULT_KEEPALIVE_SECONDS)))
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0)
+            )
+        return _http_client
+
+
+def get_chat_model(model: str = "gpt-4o", temperature: Optional[float] = 0.7,
+                   base_url: Optional[str] = None) -> Any:
+    """Shared chat model for (backend, model, temperature, base_url), created on first use.
+
+    Every OpenAI model from the registry sends its requests through
+    get_http_client(), so TLS handshakes are paid once per pooled connection
+    rather than once per analyzer. Async calls use langchain-openai's own
+    cached async client.
+    """
+    backend = llm_backend()
+    base_url = base_url or default_base_url()
+    key = (backend, os.getenv("LLM_CASSETTE"), model, temperature, base_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    from cassette import cassette_mode, cassette_model_from_env
+    mode = cassette_mode()
+    if mode == "replay":
+        client = cassette_model_from_env(model, temperature)
+    elif backend == "fake":
+        from fake_llm import fake_chat_model_from_env
+        client = fake_chat_model_from_env(model, temperature)
+    else:
+        from langchain_openai import ChatOpenAI
+        client = ChatOpenAI(
+            model_name=model, temperature=temperature, base_url=base_url, http_client=get_http_client(),
+            stream_usage=True,  # token usage on streamed calls too, for llm_metrics
+            # rate_limit.py retries 429s, 5xx and network errors itself; stacked SDK
+            # retries would multiply the load
+            max_retries=0 if rate_limiting_enabled() else 2
+        )
+    if mode == "record":
+        client = cassette_model_from_env(model, temperature, inner=client)
+    with _lock:
+        return _clients.setdefault(key, client)
+
+
+def clear_chat_models():
+    """Drop the registered models and close the shared connection pool."""
+    global _http_client
+    with _lock:
+        _clients.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
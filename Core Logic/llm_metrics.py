@@ -0,0 +1,213 @@
+"""
+Career Pivot Navigator - LLM Metrics
+Per-chain token counts, latency, cost and prompt-section sizes for every LLM call
+
+llm_calls records every chain invocation here. Read the numbers with
+get_metrics().summary() / .section_sizes(), or print get_metrics().report().
+Token counts come from the API's usage data when it is returned, otherwise
+from tiktoken, otherwise from a 4-characters-per-token estimate.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# USD per 1M tokens: (prompt, completion). Models are matched by longest prefix.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+# Latency samples kept per chain for the percentiles
+LATENCY_SAMPLES = 1000
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+
+def _encoding(model: str) -> Optional[Any]:
+    """tiktoken encoding for a model, or None if tiktoken (or its data) is unavailable."""
+    with _encodings_lock:
+        if model not in _encodings:
+            try:
+                import tiktoken
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encodings[model] = tiktoken.get_encoding("o200k_base")
+            except Exception:  # not installed, or encoding files can't be fetched
+                _encodings[model] = None
+        return _encodings[model]
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Token count of text for model (estimated when tiktoken can't be used)."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, round(len(text) / 4))
+
+
+def usage_tokens(message: Any) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens reported by the API on a response, if any."""
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return None
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+def price_for(model: str) -> Tuple[float, float]:
+    """(prompt, completion) USD per 1M tokens; (0, 0) for unknown models."""
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    return 0.0, 0.0
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class LLMMetrics:
+    """Thread-safe, per-chain aggregates of LLM calls."""
+
+    def __init__(self):
+        """Start with no recorded calls."""
+        self._lock = threading.Lock()
+        self._chains: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, chain: str, model: str, prompt: str, variables: Dict[str, Any], response: str,
+               latency: float, usage: Optional[Tuple[int, int]] = None, cached: bool = False,
+               coalesced: bool = False) -> int:
+        """Record one chain invocation and return its total (prompt + completion) tokens.
+
+        variables are the template inputs; each becomes a prompt section, and
+        whatever the template adds around them is counted as "(template)".
+        Cache hits, and calls that shared another caller's identical in-flight
+        request (coalesced), are counted but cost nothing.
+        """
+        sections = {name: count_tokens(str(value), model) for name, value in variables.items()}
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage
+        else:
+            prompt_tokens, completion_tokens = count_tokens(prompt, model), count_tokens(response, model)
+        sections["(template)"] = max(0, prompt_tokens - sum(sections.values()))
+
+        prompt_price, completion_price = price_for(model)
+        cost = 0.0 if cached or coalesced else (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+
+        with self._lock:
+            stats = self._chains.get(chain)
+            if stats is None:
+                stats = self._chains[chain] = {
+                    "model": model, "calls": 0, "cached": 0, "coalesced": 0, "estimated": 0,
+                    "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+                    "latencies": deque(maxlen=LATENCY_SAMPLES), "sections": {},
+                }
+            stats["calls"] += 1
+            stats["cached"] += int(cached)
+            stats["coalesced"] += int(coalesced)
+            stats["estimated"] += int(usage is None)
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cost_usd"] += cost
+            latencies: Deque[float] = stats["latencies"]
+            latencies.append(latency)
+            for name, tokens in sections.items():
+                stats["sections"][name] = stats["sections"].get(name, 0) + tokens
+        return prompt_tokens + completion_tokens
+
+    def average_completion_tokens(self, chain: str, default: float = 500.0) -> float:
+        """Mean completion size seen for a chain so far (default before its first call)."""
+        with self._lock:
+            stats = self._chains.get(chain)
+            if not stats:
+                return default
+            return stats["completion_tokens"] / stats["calls"]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-chain totals, averages and latency percentiles."""
+        with self._lock:
+            result = {}
+            for chain, stats in self._chains.items():
+                calls = stats["calls"]
+                latencies = list(stats["latencies"])
+                result[chain] = {
+                    "model": stats["model"],
+                    "calls": calls,
+                    "cached": stats["cached"],
+                    "coalesced": stats["coalesced"],
+                    "estimated_tokens": stats["estimated"],
+                    "prompt_tokens": stats["prompt_tokens"],
+                    "completion_tokens": stats["completion_tokens"],
+                    "avg_prompt_tokens": stats["prompt_tokens"] / calls,
+                    "avg_completion_tokens": stats["completion_tokens"] / calls,
+                    "cost_usd": stats["cost_usd"],
+                    "latency_avg": sum(latencies) / len(latencies),
+                    "latency_p50": _percentile(latencies, 0.50),
+                    "latency_p95": _percentile(latencies, 0.95),
+                }
+            return result
+
+    def section_sizes(self) -> Dict[str, Dict[str, float]]:
+        """Average tokens per prompt section, per chain, largest first."""
+        with self._lock:
+            return {
+                chain: {
+                    name: total / stats["calls"]
+                    for name, total in sorted(stats["sections"].items(), key=lambda item: -item[1])
+                }
+                for chain, stats in self._chains.items()
+            }
+
+    def report(self) -> str:
+        """Human-readable per-chain table plus the prompt-section breakdown."""
+        summary = self.summary()
+        if not summary:
+            return "No LLM calls recorded."
+
+        lines = [
+            f"{'chain':<22} {'calls':>5} {'cached':>6} {'prompt tok':>10} {'compl tok':>9} "
+            f"{'p50 s':>7} {'p95 s':>7} {'cost $':>9}",
+            "-" * 82,
+        ]
+        for chain, s in sorted(summary.items()):
+            lines.append(
+                f"{chain:<22} {s['calls']:>5} {s['cached']:>6} {s['avg_prompt_tokens']:>10.0f} "
+                f"{s['avg_completion_tokens']:>9.0f} {s['latency_p50']:>7.2f} {s['latency_p95']:>7.2f} "
+                f"{s['cost_usd']:>9.4f}"
+            )
+        lines.append(f"{'total':<22} {sum(s['calls'] for s in summary.values()):>5} "
+                     f"{'':>6} {'':>10} {'':>9} {'':>7} {'':>7} "
+                     f"{sum(s['cost_usd'] for s in summary.values()):>9.4f}")
+
+        coalesced = sum(s["coalesced"] for s in summary.values())
+        if coalesced:
+            lines.append(f"\nSingle-flight: {coalesced} calls shared an identical in-flight request")
+
+        lines.append("\nAverage prompt tokens per section:")
+        for chain, sections in sorted(self.section_sizes().items()):
+            total = sum(sections.values()) or 1
+            lines.append(f"  {chain}")
+            for name, tokens in sections.items():
+                lines.append(f"    {name:<20} {tokens:>8.0f}  {tokens / total:>5.0%}")
+        return "\n".join(lines)
+
+    def reset(self):
+        """Forget every recorded call."""
+        with self._lock:
+            self._chains.clear()
+
+
+_metrics = LLMMetrics()
+
+
+def get_metrics() -> LLMMetrics:
+    """The process-wide metrics recorder used by llm_calls."""
+    return _metrics
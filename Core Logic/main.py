@@ -1,28 +1,63 @@
 """
 Career Pivot Navigator - Main Entry Point
 CLI interface and Streamlit app launcher
+
+LangChain, the OpenAI client and the analyzers are imported on first use,
+so --help and the no-LLM commands start without paying for them (see
+import_budget.py).
 """
 
 import sys
-import json
 import os
-from pathlib import Path
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-from analyze import CareerPivotAnalyzer
-from plan_generator import PivotPlanGenerator
-from utils import normalize_input_dict, load_career_map, export_to_markdown
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple, TYPE_CHECKING
+from config import env_flag, load_config
+
+if TYPE_CHECKING:
+    from plan_generator import PivotPlanGenerator
 
 # Load environment variables
-load_dotenv()
+load_config()
+
+# Upper bound on LLM calls in flight when generating plans for several careers
+PLAN_WORKERS = int(os.getenv("PLAN_WORKERS", "8"))
+
+# Print per-chain token, latency and cost metrics when the CLI finishes
+LLM_METRICS_REPORT = env_flag("LLM_METRICS_REPORT")
 
-# Validate OpenAI API key
-if not os.getenv("OPENAI_API_KEY"):
-    print("\n⚠️  ERROR: OPENAI_API_KEY not found!")
-    print("\nPlease set your API key:")
-    print("1. Edit the .env file and add your key")
-    print("2. Or run: export OPENAI_API_KEY='sk-your-key-here'\n")
-    sys.exit(1)
+# Ask for plan, monetization and coaching in one structured call per career
+PIVOT_BUNDLE = env_flag("PIVOT_BUNDLE")
+
+USAGE = """Usage: python main.py [command]
+
+Commands:
+  (none)                            interactive CLI analysis
+  instant                           matches, difficulty and quick wins only (no LLM, no API key)
+  streamlit                         web interface (or: streamlit run main.py)
+  compile-catalog [SOURCE [OUTPUT]] compile career_map.json into the binary catalog
+  batch --in FILE --out FILE        analyze a JSONL file of profiles (batch --help for options)
+  daemon [start|stop|status]        keep a warm analyzer resident; other commands forward to it
+  -h, --help                        show this message
+
+Settings are read from the environment and .env (see .env.example).
+"""
+
+
+def require_api_key():
+    """Exit with setup instructions if the OpenAI API key is missing.
+
+    The offline fake backend (LLM_BACKEND=fake) and cassette replay need no key.
+    """
+    from llm_clients import needs_api_key
+
+    if not needs_api_key():
+        return
+    if not os.getenv("OPENAI_API_KEY"):
+        print("\n⚠️  ERROR: OPENAI_API_KEY not found!")
+        print("\nPlease set your API key:")
+        print("1. Edit the .env file and add your key")
+        print("2. Or run: export OPENAI_API_KEY='sk-your-key-here'\n")
+        sys.exit(1)
 
 
 def print_header():
@@ -68,8 +103,108 @@ def get_user_input_cli() -> Dict[str, Any]:
     return data
 
 
+def print_token(token: str):
+    """Write one streamed token to stdout as soon as it arrives."""
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
+def print_plan_header(target_career: Dict[str, Any]):
+    """Print the banner that precedes a career's 3-step plan."""
+    print(f"\n\n🪜 GENERATING 3-STEP PLAN FOR: {target_career['title'].upper()}\n")
+    print("-" * 70)
+
+
+def schedule_plan_calls(pool: ThreadPoolExecutor, plan_gen: "PivotPlanGenerator",
+                        user_data: Dict[str, Any], careers: List[Dict[str, Any]],
+                        on_token: Optional[Callable[[str], None]] = None) -> List[Dict[str, Future]]:
+    """Submit plan, monetization and coaching calls for each career to the pool.
+
+    Identical calls are submitted once and share a future (the coaching call
+    doesn't depend on the career). With on_token, the first career's plan is
+    streamed to it. In PIVOT_BUNDLE mode each career is a single "bundle" call
+    and nothing is streamed. Returns one dict of futures per career, in input
+    order.
+    """
+    submitted: Dict[tuple, Future] = {}
+
+    def submit(key: tuple, fn, *args) -> Future:
+        if key not in submitted:
+            submitted[key] = pool.submit(fn, *args)
+        return submitted[key]
+
+    if PIVOT_BUNDLE:
+        return [
+            {"bundle": submit(("bundle", career["id"]), plan_gen.generate_pivot_bundle, user_data, career)}
+            for career in careers
+        ]
+
+    return [
+        {
+            "plan": submit(("plan", career["id"]), plan_gen.generate_3_step_plan, user_data, career,
+                           on_token if i == 0 else None),
+            "monetization": submit(("monetization", career["id"]),
+                                   plan_gen.generate_monetization_strategy, user_data, career),
+            "coaching": submit(("coaching",), plan_gen.generate_mindset_coaching, user_data),
+        }
+        for i, career in enumerate(careers)
+    ]
+
+
+def call_result(calls: Dict[str, Future], name: str) -> Any:
+    """Result of one scheduled call ("plan", "monetization" or "coaching")."""
+    if "bundle" in calls:
+        return calls["bundle"].result()[name]
+    return calls[name].result()
+
+
+def print_instant_result(result: Dict[str, Any]):
+    """Print an instant_analysis result: each match with its difficulty, salary, quick wins and resources."""
+    print("\n💼 TOP CAREER MATCHES\n")
+    if not result["matched_careers"]:
+        print("No close matches in the career database.")
+    for i, career in enumerate(result["matched_careers"], 1):
+        career_id = career["id"]
+        difficulty = result["difficulty_assessments"].get(career_id, {})
+        salary = result["salary_ranges"].get(career_id)
+        print(f"{i}. {career['title']}")
+        if salary:
+            print(f"   Salary: ${salary[0]:,} - ${salary[1]:,}")
+        print(f"   Remote: {'✅ Yes' if career['remote'] else '❌ No'}")
+        print(f"   Difficulty: {difficulty.get('difficulty', 'unknown')} "
+              f"(~{difficulty.get('estimated_months') or '?'} months, "
+              f"{difficulty.get('skill_match_percentage', 0)}% skill match)")
+        if difficulty.get("skills_to_develop"):
+            print(f"   Skills to develop: {', '.join(difficulty['skills_to_develop'])}")
+        if result["quick_wins"].get(career_id):
+            print(f"   Quick wins: {' → '.join(result['quick_wins'][career_id])}")
+        for resource in result["resources"].get(career_id, []):
+            print(f"   📚 {resource}")
+        print()
+
+
+def run_instant_cli():
+    """Gather input via CLI and show the no-LLM results: no API key, answers in milliseconds."""
+    from analyze import CareerPivotAnalyzer
+
+    print_header()
+    user_data = get_user_input_cli()
+    result = CareerPivotAnalyzer(offline=True).instant_analysis(user_data)
+    print("\n" + "=" * 70)
+    print_instant_result(result)
+    print("🧭 Run without 'instant' for the full analysis and a 3-step plan.\n")
+
+
 def run_analysis_cli():
     """Run full career pivot analysis via CLI."""
+    from daemon import connect
+    from utils import export_to_markdown
+
+    # Forward to the warm daemon when one is running, else work in-process
+    remote = connect()
+    if remote is None:
+        require_api_key()
+
     print_header()
 
     # Get user input
@@ -79,15 +214,18 @@ def run_analysis_cli():
     print("=" * 70)
 
     # Initialize analyzers
-    analyzer = CareerPivotAnalyzer()
-    plan_gen = PivotPlanGenerator()
-
-    # Run analysis
-    analysis_result = analyzer.analyze_pivot(user_data)
+    if remote is not None:
+        analyzer, plan_gen = remote
+    else:
+        from analyze import CareerPivotAnalyzer
+        from plan_generator import PivotPlanGenerator
+        analyzer = CareerPivotAnalyzer()
+        plan_gen = PivotPlanGenerator()
 
-    # Display results
+    # Run analysis, printing it as it is generated
     print("\n📊 CAREER PIVOT ANALYSIS\n")
-    print(analysis_result["analysis"])
+    analysis_result = analyzer.analyze_pivot(user_data, on_token=print_token)
+    print()
 
     # Show matched careers
     print("\n\n💼 TOP CAREER MATCHES\n")
@@ -109,25 +247,37 @@ def run_analysis_cli():
         elif choice.isdigit() and 1 <= int(choice) <= len(analysis_result["matched_careers"]):
             careers_to_plan = [analysis_result["matched_careers"][int(choice) - 1]]
 
-        for target_career in careers_to_plan:
-            print(f"\n\n🪜 GENERATING 3-STEP PLAN FOR: {target_career['title'].upper()}\n")
-            print("-" * 70)
-
-            # Generate plan
-            plan_result = plan_gen.generate_3_step_plan(user_data, target_career)
-            print(plan_result["plan_text"])
-
-            # Generate monetization strategy
-            print(f"\n\n💰 HOW TO EARN DURING THE PIVOT\n")
-            print("-" * 70)
-            monetization = plan_gen.generate_monetization_strategy(user_data, target_career)
-            print(monetization)
-
-            # Generate mindset coaching
-            print(f"\n\n🧠 MINDSET COACHING\n")
-            print("-" * 70)
-            coaching = plan_gen.generate_mindset_coaching(user_data)
-            print(coaching)
+        with ThreadPoolExecutor(max_workers=PLAN_WORKERS) as pool:
+            # Fire every LLM call up front; the first plan streams to the terminal,
+            # the rest are printed in the original order as they finish
+            if careers_to_plan:
+                print_plan_header(careers_to_plan[0])
+            # Plans use the normalized profile (skills etc. as lists), as the analysis did
+            planned = schedule_plan_calls(pool, plan_gen, analysis_result["user_data"], careers_to_plan,
+                                          on_token=print_token)
+
+            for i, (target_career, calls) in enumerate(zip(careers_to_plan, planned)):
+                if i > 0:
+                    print_plan_header(target_career)
+
+                # Generate plan
+                plan_result = call_result(calls, "plan")
+                if i > 0 or PIVOT_BUNDLE:
+                    print(plan_result["plan_text"])
+                else:
+                    print()  # already streamed above
+
+                # Generate monetization strategy
+                print(f"\n\n💰 HOW TO EARN DURING THE PIVOT\n")
+                print("-" * 70)
+                monetization = call_result(calls, "monetization")
+                print(monetization)
+
+                # Generate mindset coaching
+                print(f"\n\n🧠 MINDSET COACHING\n")
+                print("-" * 70)
+                coaching = call_result(calls, "coaching")
+                print(coaching)
 
         # Export option
         print("\n\n" + "=" * 70)
@@ -144,11 +294,93 @@ def run_analysis_cli():
     print("\n🎯 Remember: You don't need permission to pivot. You need a plan.\n")
     print("Good luck out there. You got this. 💪\n")
 
+    if LLM_METRICS_REPORT and remote is None:
+        from llm_metrics import get_metrics
+        print("\n📈 LLM USAGE\n")
+        print(get_metrics().report())
+
+
+def streamlit_writer(placeholder) -> Callable[[str], None]:
+    """on_token callback that re-renders the text so far into an st.empty() placeholder."""
+    pieces: List[str] = []
+
+    def write(token: str):
+        pieces.append(token)
+        placeholder.markdown("".join(pieces) + " ▌")
+
+    return write
+
+
+def streamlit_matches(st, result: Dict[str, Any]):
+    """Render the career matches of an instant_analysis result as expanders."""
+    st.markdown("## 💼 Top Career Matches")
+    for i, career in enumerate(result["matched_careers"], 1):
+        difficulty = result["difficulty_assessments"].get(career["id"], {})
+        with st.expander(f"{i}. {career['title']}"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Salary Range", f"${career['salary_range'][0]:,} - ${career['salary_range'][1]:,}")
+                st.metric("Remote", "✅ Yes" if career["remote"] else "❌ No")
+            with col2:
+                st.metric("Freelance Viable", "✅ Yes" if career["freelance_viable"] else "❌ No")
+                st.metric("Trend Relevance", f"{career.get('trend_relevance', 0) * 100:.0f}%")
+            if difficulty.get("estimated_months"):
+                st.write(f"**Difficulty:** {difficulty['difficulty']} (~{difficulty['estimated_months']} months)")
+
+            st.write("**Entry Path:**")
+            for step in career.get("entry_path", []):
+                st.write(f"  → {step}")
+
+
+def running_in_streamlit() -> bool:
+    """Whether this script is being executed by `streamlit run`."""
+    if "streamlit" not in sys.modules:
+        return False
+    from streamlit import runtime
+    return runtime.exists()
+
+
+def streamlit_cached_calls(st) -> Tuple[Callable, Callable, Callable]:
+    """get_analyzer, get_plan_generator and instant_results, cached by Streamlit.
+
+    Analyzers (with their clients and the catalog) are built once per server
+    process (st.cache_resource). instant_results(normalized_key, user_data)
+    caches instant_analysis per normalized input (st.cache_data); pass its
+    result to analyze_pivot(instant=...) so matching isn't redone.
+    """
+
+    @st.cache_resource(show_spinner="Warming up the analyzer...")
+    def get_analyzer():
+        from analyze import CareerPivotAnalyzer
+        return CareerPivotAnalyzer()
+
+    @st.cache_resource(show_spinner=False)
+    def get_plan_generator():
+        from plan_generator import PivotPlanGenerator
+        return PivotPlanGenerator()
+
+    @st.cache_data(show_spinner=False, max_entries=1000)
+    def instant_results(normalized_key: str, _user_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Keyed by the normalized input only; _user_data is the same profile, unhashed
+        return get_analyzer().instant_analysis(_user_data)
+
+    return get_analyzer, get_plan_generator, instant_results
+
 
 def run_streamlit_app():
-    """Run the Streamlit web interface."""
+    """Run the Streamlit web interface.
+
+    Analyzers are built once per server process and matches are cached per
+    normalized input (see streamlit_cached_calls). The finished analysis and
+    plan live in st.session_state, so reruns (export, format switches)
+    redraw them without calling the LLM.
+    """
     try:
+        import json
         import streamlit as st
+        from utils import normalize_input_dict
+
+        get_analyzer, get_plan_generator, instant_results = streamlit_cached_calls(st)
 
         st.set_page_config(
             page_title="Career Pivot Navigator",
@@ -190,49 +422,57 @@ def run_streamlit_app():
                 "time_availability": time,
                 "remote_preference": remote
             }
+            normalized_key = json.dumps(normalize_input_dict(user_data), sort_keys=True)
 
-            with st.spinner("Analyzing your pivot opportunities..."):
-                analyzer = CareerPivotAnalyzer()
-                result = analyzer.analyze_pivot(user_data)
-
+            # Matches appear at once; the analysis streams into the space above them
             st.markdown("## 📊 Career Pivot Analysis")
-            st.markdown(result["analysis"])
-
-            st.markdown("## 💼 Top Career Matches")
-            for i, career in enumerate(result["matched_careers"], 1):
-                with st.expander(f"{i}. {career['title']}"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Salary Range", f"${career['salary_range'][0]:,} - ${career['salary_range'][1]:,}")
-                        st.metric("Remote", "✅ Yes" if career["remote"] else "❌ No")
-                    with col2:
-                        st.metric("Freelance Viable", "✅ Yes" if career["freelance_viable"] else "❌ No")
-                        st.metric("Trend Relevance", f"{career.get('trend_relevance', 0) * 100:.0f}%")
-
-                    st.write("**Entry Path:**")
-                    for step in career.get("entry_path", []):
-                        st.write(f"  → {step}")
+            analysis_area = st.empty()
+            matches = instant_results(normalized_key, user_data)
+            streamlit_matches(st, matches)
+
+            result = get_analyzer().analyze_pivot(user_data, on_token=streamlit_writer(analysis_area),
+                                                  instant=matches)
+            analysis_area.markdown(result["analysis"])
 
             # Generate detailed plan for top match
+            plan = None
             if result["matched_careers"]:
                 st.markdown("## 🪜 Your 3-Step Pivot Plan")
 
-                plan_gen = PivotPlanGenerator()
-                plan = plan_gen.generate_3_step_plan(user_data, result["matched_careers"][0])
-                st.markdown(plan["plan_text"])
+                plan_area = st.empty()
+                plan = get_plan_generator().generate_3_step_plan(
+                    result["user_data"], result["matched_careers"][0], on_token=streamlit_writer(plan_area)
+                )
+                plan_area.markdown(plan["plan_text"])
 
-                # Export options
-                st.markdown("### 📥 Export Your Plan")
-                export_format = st.radio("Format", ["Markdown", "JSON"], horizontal=True)
+            st.session_state["pivot"] = {
+                "user_data": user_data, "analysis": result["analysis"], "matches": matches, "plan": plan
+            }
 
-                if st.button("Download Plan"):
-                    filepath = plan_gen.export_full_plan(
-                        user_data,
-                        result["analysis"],
-                        plan,
-                        format=export_format.lower()
-                    )
-                    st.success(f"Plan saved to: {filepath}")
+        elif "pivot" in st.session_state:
+            # A rerun (export, format switch, ...): redraw the stored results
+            pivot = st.session_state["pivot"]
+            st.markdown("## 📊 Career Pivot Analysis")
+            st.markdown(pivot["analysis"])
+            streamlit_matches(st, pivot["matches"])
+            if pivot["plan"]:
+                st.markdown("## 🪜 Your 3-Step Pivot Plan")
+                st.markdown(pivot["plan"]["plan_text"])
+
+        pivot = st.session_state.get("pivot")
+        if pivot and pivot["plan"]:
+            # Export options
+            st.markdown("### 📥 Export Your Plan")
+            export_format = st.radio("Format", ["Markdown", "JSON"], horizontal=True)
+
+            if st.button("Download Plan"):
+                filepath = get_plan_generator().export_full_plan(
+                    pivot["user_data"],
+                    pivot["analysis"],
+                    pivot["plan"],
+                    format=export_format.lower()
+                )
+                st.success(f"Plan saved to: {filepath}")
 
         st.markdown("---")
         st.markdown(
@@ -244,10 +484,131 @@ def run_streamlit_app():
         print("Then: streamlit run main.py")
 
 
+def run_compile_catalog(args):
+    """Compile career_map.json into the memory-mapped binary catalog."""
+    from compiled_catalog import compile_catalog, compiled_path_for
+    from utils import find_career_map
+
+    source = args[0] if args else find_career_map()
+    if source is None:
+        sys.exit(1)
+    output = args[1] if len(args) > 1 else compiled_path_for(source)
+
+    compile_catalog(source, output)
+    print(f"✅ Compiled {source} -> {output} ({os.path.getsize(output):,} bytes)")
+
+
+def run_batch(args):
+    """Analyze every profile of a JSONL file without prompts, appending results as JSONL."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Analyze profiles from a JSONL file. Re-run with the same --out to resume."
+    )
+    parser.add_argument("--in", dest="in_path", required=True, help="input JSONL, one profile per line")
+    parser.add_argument("--out", dest="out_path", required=True, help="output JSONL (appended to)")
+    parser.add_argument("--workers", type=int, default=4, help="profiles processed concurrently (default 4)")
+    parser.add_argument("--plans", type=int, default=1,
+                        help="top matches that get a 3-step plan, 0 for none (default 1)")
+    parser.add_argument("--instant", action="store_true",
+                        help="matches, difficulty and quick wins only: no LLM calls, no API key")
+    options = parser.parse_args(args)
+
+    from batch_runner import BatchRunner
+    from daemon import connect
+
+    remote = None if options.instant else connect()
+    if options.instant:
+        from analyze import CareerPivotAnalyzer
+        runner = BatchRunner(CareerPivotAnalyzer(offline=True), instant=True)
+    elif remote is not None:
+        runner = BatchRunner(*remote, plans=options.plans, bundle=PIVOT_BUNDLE)
+    else:
+        require_api_key()
+        from analyze import CareerPivotAnalyzer
+        from plan_generator import PivotPlanGenerator
+        runner = BatchRunner(CareerPivotAnalyzer(), PivotPlanGenerator(), plans=options.plans,
+                             bundle=PIVOT_BUNDLE)
+
+    def report(record: Dict[str, Any]):
+        if "error" in record:
+            print(f"   ❌ {record['id']}: {record['error']}")
+        else:
+            print(f"   ✅ {record['id']}")
+
+    print(f"\n🚀 Analyzing {options.in_path} -> {options.out_path} ({options.workers} workers)\n")
+    try:
+        counts = runner.run(options.in_path, options.out_path, workers=options.workers, on_record=report)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted. Run the same command again to resume.")
+        sys.exit(130)
+    print(f"\n✅ {counts['ok']} analyzed, {counts['failed']} failed, "
+          f"{counts['skipped']} skipped (already done or repeated)")
+
+    if LLM_METRICS_REPORT and remote is None:
+        from llm_metrics import get_metrics
+        print("\n📈 LLM USAGE\n")
+        print(get_metrics().report())
+
+
+def run_daemon(args):
+    """Start the resident daemon in the foreground, or stop / query a running one."""
+    import daemon
+
+    action = args[0] if args else "start"
+    if action == "status":
+        info = daemon.status()
+        if info is None:
+            print(f"💤 No daemon on {daemon.socket_path()}")
+            sys.exit(1)
+        print(f"✅ Daemon {info['pid']} on {info['socket']}: up {info['uptime']:.0f}s, "
+              f"{info['requests']} requests")
+    elif action == "stop":
+        try:
+            info = daemon.request({"method": "shutdown"})
+            print(f"🛑 Stopped daemon {info['pid']}")
+        except daemon.DaemonUnavailable:
+            print(f"💤 No daemon on {daemon.socket_path()}")
+    elif action == "start":
+        if daemon.socket_in_use():
+            print(f"⚠️  A daemon is already listening on {daemon.socket_path()}")
+            sys.exit(1)
+        require_api_key()
+        print("🔥 Warming up the analyzer...")
+        server = daemon.PivotDaemon()
+        print(f"✅ Daemon {os.getpid()} listening on {server.path} (Ctrl-C or 'main.py daemon stop' to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            print(f"⚠️  {e}")
+            sys.exit(1)
+        if LLM_METRICS_REPORT:
+            from llm_metrics import get_metrics
+            print("\n📈 LLM USAGE\n")
+            print(get_metrics().report())
+    else:
+        print(f"Unknown daemon action {action!r}; use start, stop or status")
+        sys.exit(2)
+
+
 if __name__ == "__main__":
 
-    if len(sys.argv) > 1 and sys.argv[1] == "streamlit":
+    if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help", "help"):
+        print(USAGE)
+    elif len(sys.argv) > 1 and sys.argv[1] == "compile-catalog":
+        run_compile_catalog(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "instant":
+        run_instant_cli()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        run_batch(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        run_daemon(sys.argv[2:])
+    elif running_in_streamlit() or (len(sys.argv) > 1 and sys.argv[1] == "streamlit"):
+        require_api_key()
         run_streamlit_app()
     else:
-        # Default: CLI mode
+        # Default: CLI mode (checks the API key unless a daemon is running)
         run_analysis_cli()
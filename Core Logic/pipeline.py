@@ -0,0 +1,130 @@
+"""
+Career Pivot Navigator - Analysis Pipeline
+Runs normalize -> match -> difficulty -> context -> LLM once per request
+"""
+
+from typing import Dict, List, Any, Callable, Optional
+
+from llm_calls import invoke_chain, ainvoke_chain, stream_chain, astream_chain
+from utils import (
+    normalize_input_dict, find_matching_careers, estimate_pivot_difficulty_batch,
+    create_context_for_llm
+)
+
+
+class PivotPipeline:
+    """Single-pass analysis pipeline that hands each stage's output forward.
+
+    Every stage reads the artifacts produced so far and adds its own, so
+    nothing (matching in particular) is computed twice for one request.
+    """
+
+    STAGES = ("normalize", "match", "difficulty", "context", "analysis")
+    # The artifact each stage adds
+    STAGE_OUTPUTS = {"normalize": "user_data", "match": "matched_careers", "difficulty": "difficulty",
+                     "context": "context", "analysis": "analysis"}
+
+    def __init__(self, analyzer):
+        """Bind the pipeline to an analyzer's career map and prebuilt chains."""
+        self.analyzer = analyzer
+
+    def run(self, user_data: Dict[str, Any], stop_after: Optional[str] = None,
+            on_token: Optional[Callable[[str], None]] = None,
+            artifacts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run the stages in order (optionally stopping early) and return the artifacts.
+
+        With on_token, the LLM stage streams its tokens to the callback.
+        artifacts are stage outputs computed earlier for the same input (e.g.
+        by a stop_after run); stages whose output is already there are skipped.
+        """
+        self._check_stage(stop_after)
+
+        artifacts = self._start(user_data, on_token, artifacts)
+        for stage in self.STAGES:
+            if self.STAGE_OUTPUTS[stage] not in artifacts:
+                getattr(self, stage)(artifacts)
+            if stage == stop_after:
+                break
+        return artifacts
+
+    async def arun(self, user_data: Dict[str, Any], stop_after: Optional[str] = None,
+                   on_token: Optional[Callable[[str], None]] = None,
+                   artifacts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async run: the deterministic stages run inline, the LLM stage is awaited."""
+        self._check_stage(stop_after)
+
+        artifacts = self._start(user_data, on_token, artifacts)
+        for stage in self.STAGES:
+            if stage == "analysis" and "analysis" not in artifacts:
+                await self.aanalysis(artifacts)
+            elif self.STAGE_OUTPUTS[stage] not in artifacts:
+                getattr(self, stage)(artifacts)
+            if stage == stop_after:
+                break
+        return artifacts
+
+    def _start(self, user_data: Dict[str, Any], on_token: Optional[Callable[[str], None]],
+               artifacts: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {**(artifacts or {}), "raw_input": user_data, "on_token": on_token}
+
+    def _check_stage(self, stage: Optional[str]):
+        if stage is not None and stage not in self.STAGES:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+
+    def normalize(self, artifacts: Dict[str, Any]):
+        """Clean and split the raw form input."""
+        artifacts["user_data"] = normalize_input_dict(artifacts["raw_input"])
+
+    def match(self, artifacts: Dict[str, Any]):
+        """Rank careers from the database against the profile."""
+        user = artifacts["user_data"]
+        artifacts["matched_careers"] = find_matching_careers(
+            user["skills"],
+            user["hates"],
+            self.analyzer.career_map,
+            interests=user["interests"],
+            remote_preference=user["remote_preference"]
+        )
+
+    def difficulty(self, artifacts: Dict[str, Any]):
+        """Assess pivot difficulty for every matched career in one pass."""
+        user = artifacts["user_data"]
+        artifacts["difficulty"] = estimate_pivot_difficulty_batch(
+            user["current_role"],
+            [career["id"] for career in artifacts["matched_careers"]],
+            user["skills"],
+            self.analyzer.career_map
+        )
+
+    def context(self, artifacts: Dict[str, Any]):
+        """Build the LLM context from the matches computed above."""
+        artifacts["context"] = create_context_for_llm(
+            artifacts["user_data"], self.analyzer.career_map, matched=artifacts["matched_careers"]
+        )
+
+    def analysis_inputs(self, artifacts: Dict[str, Any]) -> Dict[str, Any]:
+        """Template variables for the analyzer's pivot_prompt."""
+        user = artifacts["user_data"]
+        return {
+            "current_role": user["current_role"],
+            "skills": ", ".join(user["skills"]),
+            "hates": ", ".join(user["hates"]),
+            "interests": ", ".join(user["interests"]),
+            "context": artifacts["context"]
+        }
+
+    def analysis(self, artifacts: Dict[str, Any]):
+        """Run the pivot analysis chain (streamed when an on_token callback is set)."""
+        chain, inputs, cache = self.analyzer.analysis_chain, self.analysis_inputs(artifacts), self.analyzer.cache
+        if artifacts.get("on_token"):
+            artifacts["analysis"] = stream_chain(chain, inputs, artifacts["on_token"], cache=cache)
+        else:
+            artifacts["analysis"] = invoke_chain(chain, inputs, cache=cache)
+
+    async def aanalysis(self, artifacts: Dict[str, Any]):
+        """Async analysis stage."""
+        chain, inputs, cache = self.analyzer.analysis_chain, self.analysis_inputs(artifacts), self.analyzer.cache
+        if artifacts.get("on_token"):
+            artifacts["analysis"] = await astream_chain(chain, inputs, artifacts["on_token"], cache=cache)
+        else:
+            artifacts["analysis"] = await ainvoke_chain(chain, inputs, cache=cache)
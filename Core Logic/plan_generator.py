@@ -3,20 +3,54 @@ Career Pivot Navigator - Plan Generator
 Generates and exports 3-step pivot plans in multiple formats
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from typing import Dict, List, Any, Optional
+from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from datetime import datetime
 from utils import export_to_markdown, export_to_notion_format
+from llm_cache import LLMResponseCache, get_default_cache
+from llm_clients import get_chat_model
+from llm_calls import (
+    invoke_chain, ainvoke_chain, stream_chain, astream_chain, batch_chain, abatch_chain, error_result
+)
 import json
+from config import load_config
+
+# Load environment variables
+load_config()
+
+
+class BundleStep(BaseModel):
+    """One step of a pivot bundle plan (mirrors the fields of create_step)."""
+    title: str
+    action: str
+    time_estimate: str
+    resources: List[str] = Field(default_factory=list)
+    rationale: str
+    success_metric: str
+
+
+class PivotBundle(BaseModel):
+    """Plan, monetization strategy and mindset coaching from one completion."""
+    steps: List[BundleStep] = Field(min_length=3, max_length=3)
+    monetization: str
+    coaching: str
+
 
 class PivotPlanGenerator:
     """Generate detailed 3-step pivot plans with exports."""
 
-    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7):
-        """Initialize the plan generator."""
-        self.llm = ChatOpenAI(model_name=model, temperature=temperature)
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.7,
+                 cache: Optional[LLMResponseCache] = None, llm: Optional[Any] = None):
+        """Initialize the plan generator.
+
+        llm is an injected chat model client (default: the shared pooled one
+        from llm_clients); cache defaults to the shared disk cache.
+        """
+        self.llm = llm if llm is not None else get_chat_model(model, temperature)
+        self.cache = cache if cache is not None else get_default_cache()
         self.setup_prompts()
+        self.setup_chains()
 
     def setup_prompts(self):
         """Setup plan generation prompts."""
@@ -93,6 +127,56 @@ Provide:
 Be direct, warm, and real. Call out both hope and barriers without dismissing either.
 """)
 
+        # Plan, monetization and mindset in one call: the shared profile is sent once
+        self.bundle_prompt = PromptTemplate.from_template("""You are helping {person_name} make a career transition.
+
+Current role: {current_role}
+Target role: {target_role}
+Their skills: {skills}
+Their situation: {situation}
+Their constraints: {constraints}
+Budget: {budget}
+Time available per week: {time_per_week}
+Remote preference: {remote}
+Their fears:
+{fears}
+What they want:
+{dreams}
+
+Produce three sections:
+
+1. steps: a REALISTIC 3-step pivot plan. Exactly 3 concrete, low-barrier steps, each with
+   a title (what they will achieve), a specific action, a realistic time estimate,
+   FREE/low-cost resources, why the step matters (rationale) and how they know it
+   worked (success_metric). No "follow your passion" nonsense.
+2. monetization: 2-3 specific ways to earn while pivoting (freelance gigs they could start
+   THIS MONTH, portfolio side projects, internal opportunities), each with how to start,
+   realistic first-month earnings and how it supports the pivot. Markdown, no
+   "get rich quick" nonsense.
+3. coaching: an honest, warm pep talk in markdown with a **Permission slip**, a
+   **Reality check**, a **Mindset reframe** and ONE tiny **First micro-action** for today.
+   Call out both hope and barriers without dismissing either.
+
+Respond with a single JSON object (no prose, no code fences) with these keys:
+- steps: a list of exactly 3 objects with the string fields title, action, time_estimate,
+  rationale and success_metric, and resources (a list of strings)
+- monetization: a markdown string
+- coaching: a markdown string
+""")
+
+    def setup_chains(self):
+        """Compose the prompt | llm chains once per generator (named for llm_metrics)."""
+        self.step_plan_chain = self.step_plan_prompt | self.llm
+        self.step_plan_chain.name = "step_plan_prompt"
+        self.monetization_chain = self.monetization_prompt | self.llm
+        self.monetization_chain.name = "monetization_prompt"
+        self.resume_chain = self.resume_prompt | self.llm
+        self.resume_chain.name = "resume_prompt"
+        self.mindset_chain = self.mindset_prompt | self.llm
+        self.mindset_chain.name = "mindset_prompt"
+        self.bundle_chain = self.bundle_prompt | self.llm.bind(response_format={"type": "json_object"})
+        self.bundle_chain.name = "bundle_prompt"
+
     def create_step(self, step_number: int, content: str) -> Dict[str, Any]:
         """Parse step content into structured format."""
 
@@ -112,7 +196,7 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
         for line in lines:
             line = line.strip()
             if "STEP TITLE" in line:
-                step_data["title"] = line.split(":")[-1].strip()
+                step_data["title"] = line.split(":", 1)[-1].strip()
             elif "ACTION" in line:
                 current_section = "action"
             elif "TIME" in line:
@@ -127,7 +211,7 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
                 if current_section == "resources" and (line.startswith("-") or line.startswith("*")):
                     step_data["resources"].append(line.lstrip("-*").strip())
                 elif current_section == "action":
-                    step_data["action"] += " " + line
+                    step_data["action"] = (step_data["action"] + " " + line).strip()
                 elif current_section == "time":
                     step_data["time_estimate"] = line
                 elif current_section == "rationale":
@@ -137,12 +221,9 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
 
         return step_data
 
-    def generate_3_step_plan(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate the full 3-step pivot plan."""
-
-        chain = self.step_plan_prompt | self.llm
-
-        result = chain.invoke({
+    def step_plan_inputs(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        """Template variables for step_plan_prompt."""
+        return {
             "person_name": user_data.get("name", "You"),
             "current_role": user_data.get("current_role", ""),
             "target_role": target_career.get("title", ""),
@@ -150,9 +231,10 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
             "constraints": user_data.get("constraints", ""),
             "budget": user_data.get("budget", "low"),
             "time_per_week": user_data.get("time_availability", "flexible")
-        })
+        }
 
-        plan_text = result.content if hasattr(result, 'content') else str(result)
+    def build_plan(self, target_career: Dict[str, Any], plan_text: str) -> Dict[str, Any]:
+        """Parse a completed plan into steps and wrap it in the result dict."""
 
         # Parse into steps
         step_blocks = plan_text.split("STEP")
@@ -160,6 +242,11 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
         for i, block in enumerate(step_blocks[1:], 1):
             steps.append(self.create_step(i, f"STEP{block}"))
 
+        return self.plan_result(target_career, plan_text, steps)
+
+    def plan_result(self, target_career: Dict[str, Any], plan_text: str,
+                    steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """The generate_3_step_plan result dict."""
         return {
             "target_career": target_career,
             "plan_text": plan_text,
@@ -167,25 +254,32 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
             "generated_at": datetime.now().isoformat()
         }
 
-    def generate_monetization_strategy(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> str:
-        """Generate ways to earn during transition."""
-
-        chain = self.monetization_prompt | self.llm
-
-        result = chain.invoke({
+    def render_step(self, step: Dict[str, Any]) -> str:
+        """Display text for a structured step, in the step plan prompt's layout."""
+        resources = "".join(f"- {resource}\n" for resource in step["resources"])
+        return (
+            f"STEP TITLE: {step['title']}\n"
+            f"ACTION:\n{step['action']}\n"
+            f"TIME:\n{step['time_estimate']}\n"
+            f"RESOURCES:\n{resources}"
+            f"WHY:\n{step['rationale']}\n"
+            f"SUCCESS:\n{step['success_metric']}"
+        )
+
+    def monetization_inputs(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        """Template variables for monetization_prompt."""
+        return {
             "person_name": user_data.get("name", "You"),
             "target_role": target_career.get("title", ""),
             "skills": ", ".join(user_data.get("skills", [])),
             "constraints": user_data.get("constraints", ""),
             "time_per_week": user_data.get("time_availability", "flexible"),
             "remote": user_data.get("remote_preference", "high")
-        })
-
-        return result.content if hasattr(result, 'content') else str(result)
+        }
 
-    def generate_resume_reframe(self, user_data: Dict[str, Any], target_career: Dict[str, Any], 
-                               accomplishments: Optional[List[str]] = None) -> str:
-        """Generate reframed resume bullets."""
+    def resume_inputs(self, user_data: Dict[str, Any], target_career: Dict[str, Any],
+                      accomplishments: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Template variables for resume_prompt."""
 
         if accomplishments is None:
             accomplishments = [
@@ -194,20 +288,16 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
                 "Trained 3 junior team members"
             ]
 
-        chain = self.resume_prompt | self.llm
-
-        result = chain.invoke({
+        return {
             "person_name": user_data.get("name", "You"),
             "current_role": user_data.get("current_role", ""),
             "target_role": target_career.get("title", ""),
             "accomplishments": "\n".join([f"- {acc}" for acc in accomplishments])
-        })
+        }
 
-        return result.content if hasattr(result, 'content') else str(result)
-
-    def generate_mindset_coaching(self, user_data: Dict[str, Any], fears: Optional[List[str]] = None,
-                                 dreams: Optional[List[str]] = None) -> str:
-        """Generate motivational coaching for the pivot."""
+    def mindset_inputs(self, user_data: Dict[str, Any], fears: Optional[List[str]] = None,
+                       dreams: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Template variables for mindset_prompt."""
 
         if fears is None:
             fears = ["I'm too old", "I don't have the right skills", "I can't afford to learn"]
@@ -215,19 +305,172 @@ Be direct, warm, and real. Call out both hope and barriers without dismissing ei
         if dreams is None:
             dreams = ["Work remotely", "Help people", "Make good money doing meaningful work"]
 
-        chain = self.mindset_prompt | self.llm
-
         situation = f"They're in {user_data.get('current_role')} and hate {', '.join(user_data.get('hates', [])[:2])}"
 
-        result = chain.invoke({
+        return {
             "person_name": user_data.get("name", "You"),
             "situation": situation,
             "fears": "\n".join([f"- {f}" for f in fears]),
             "dreams": "\n".join([f"- {d}" for d in dreams]),
             "constraints": user_data.get("constraints", "")
-        })
+        }
+
+    def bundle_inputs(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        """Template variables for bundle_prompt: the union of the three prompts' inputs."""
+        return {
+            **self.step_plan_inputs(user_data, target_career),
+            **self.monetization_inputs(user_data, target_career),
+            **self.mindset_inputs(user_data)
+        }
+
+    def build_bundle(self, target_career: Dict[str, Any], bundle_text: str) -> Dict[str, Any]:
+        """Validate a bundle response and shape it like the three separate methods' results.
+
+        Raises pydantic.ValidationError if the response doesn't match PivotBundle.
+        The steps come straight from the validated bundle; plan_text is only
+        rendered for display and exports.
+        """
+        bundle = PivotBundle.model_validate_json(bundle_text)
+        steps = [{"step_number": i, **step.model_dump()} for i, step in enumerate(bundle.steps, 1)]
+
+        return {
+            "plan": self.plan_result(target_career, "\n\n".join(self.render_step(step) for step in steps), steps),
+            "monetization": bundle.monetization,
+            "coaching": bundle.coaching
+        }
+
+    def generate_3_step_plan(self, user_data: Dict[str, Any], target_career: Dict[str, Any],
+                             on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Generate the full 3-step pivot plan.
 
-        return result.content if hasattr(result, 'content') else str(result)
+        Pass on_token to stream the plan text as it is generated; the returned
+        plan_text and steps are the same either way.
+        """
+        inputs = self.step_plan_inputs(user_data, target_career)
+        if on_token:
+            plan_text = stream_chain(self.step_plan_chain, inputs, on_token, cache=self.cache)
+        else:
+            plan_text = invoke_chain(self.step_plan_chain, inputs, cache=self.cache)
+        return self.build_plan(target_career, plan_text)
+
+    def generate_plans_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                            max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """generate_3_step_plan for many (user_data, target_career) pairs.
+
+        At most max_concurrency LLM calls are in flight. Results come back in
+        input order; a failed item yields {"error": ...} instead of aborting.
+        """
+        inputs = self.plan_inputs_many(items)
+        ready = [i for i, item_inputs in enumerate(inputs) if "error" not in item_inputs]
+        texts = batch_chain(self.step_plan_chain, [inputs[i] for i in ready],
+                            max_concurrency=max_concurrency, cache=self.cache)
+        return self.finish_plans_many(items, inputs, ready, texts)
+
+    def plan_inputs_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """step_plan_inputs per item, capturing failures as {"error": ...}."""
+        inputs = []
+        for user_data, target_career in items:
+            try:
+                inputs.append(self.step_plan_inputs(user_data, target_career))
+            except Exception as e:
+                inputs.append(error_result(e))
+        return inputs
+
+    def finish_plans_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]], inputs: List[Dict[str, Any]],
+                          ready: List[int], texts: List[Any]) -> List[Dict[str, Any]]:
+        """Parse batch responses into plans, in input order."""
+        results = list(inputs)
+        for i, text in zip(ready, texts):
+            results[i] = error_result(text) if isinstance(text, Exception) else self.build_plan(items[i][1], text)
+        return results
+
+    def generate_monetization_strategy(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> str:
+        """Generate ways to earn during transition."""
+        return invoke_chain(self.monetization_chain, self.monetization_inputs(user_data, target_career),
+                            cache=self.cache)
+
+    def generate_resume_reframe(self, user_data: Dict[str, Any], target_career: Dict[str, Any], 
+                               accomplishments: Optional[List[str]] = None) -> str:
+        """Generate reframed resume bullets."""
+        return invoke_chain(self.resume_chain, self.resume_inputs(user_data, target_career, accomplishments),
+                            cache=self.cache)
+
+    def generate_mindset_coaching(self, user_data: Dict[str, Any], fears: Optional[List[str]] = None,
+                                 dreams: Optional[List[str]] = None) -> str:
+        """Generate motivational coaching for the pivot."""
+        return invoke_chain(self.mindset_chain, self.mindset_inputs(user_data, fears, dreams),
+                            cache=self.cache)
+
+    def generate_pivot_bundle(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        """Plan, monetization strategy and mindset coaching in one structured call.
+
+        Returns {"plan": ..., "monetization": ..., "coaching": ...} with the same
+        values generate_3_step_plan, generate_monetization_strategy and
+        generate_mindset_coaching return. If the response fails validation, the
+        three separate calls are made instead.
+        """
+        bundle_text = invoke_chain(self.bundle_chain, self.bundle_inputs(user_data, target_career),
+                                   cache=self.cache)
+        try:
+            return self.build_bundle(target_career, bundle_text)
+        except ValidationError:
+            return {
+                "plan": self.generate_3_step_plan(user_data, target_career),
+                "monetization": self.generate_monetization_strategy(user_data, target_career),
+                "coaching": self.generate_mindset_coaching(user_data)
+            }
+
+    # Async variants: same results, built on ainvoke so one event loop can
+    # serve many pivots concurrently
+
+    async def agenerate_3_step_plan(self, user_data: Dict[str, Any], target_career: Dict[str, Any],
+                                    on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Async generate_3_step_plan."""
+        inputs = self.step_plan_inputs(user_data, target_career)
+        if on_token:
+            plan_text = await astream_chain(self.step_plan_chain, inputs, on_token, cache=self.cache)
+        else:
+            plan_text = await ainvoke_chain(self.step_plan_chain, inputs, cache=self.cache)
+        return self.build_plan(target_career, plan_text)
+
+    async def agenerate_plans_many(self, items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                                   max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Async generate_plans_many, built on abatch."""
+        inputs = self.plan_inputs_many(items)
+        ready = [i for i, item_inputs in enumerate(inputs) if "error" not in item_inputs]
+        texts = await abatch_chain(self.step_plan_chain, [inputs[i] for i in ready],
+                                   max_concurrency=max_concurrency, cache=self.cache)
+        return self.finish_plans_many(items, inputs, ready, texts)
+
+    async def agenerate_monetization_strategy(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> str:
+        """Async generate_monetization_strategy."""
+        return await ainvoke_chain(self.monetization_chain, self.monetization_inputs(user_data, target_career),
+                                   cache=self.cache)
+
+    async def agenerate_resume_reframe(self, user_data: Dict[str, Any], target_career: Dict[str, Any],
+                                       accomplishments: Optional[List[str]] = None) -> str:
+        """Async generate_resume_reframe."""
+        return await ainvoke_chain(self.resume_chain, self.resume_inputs(user_data, target_career, accomplishments),
+                                   cache=self.cache)
+
+    async def agenerate_mindset_coaching(self, user_data: Dict[str, Any], fears: Optional[List[str]] = None,
+                                         dreams: Optional[List[str]] = None) -> str:
+        """Async generate_mindset_coaching."""
+        return await ainvoke_chain(self.mindset_chain, self.mindset_inputs(user_data, fears, dreams),
+                                   cache=self.cache)
+
+    async def agenerate_pivot_bundle(self, user_data: Dict[str, Any], target_career: Dict[str, Any]) -> Dict[str, Any]:
+        """Async generate_pivot_bundle."""
+        bundle_text = await ainvoke_chain(self.bundle_chain, self.bundle_inputs(user_data, target_career),
+                                          cache=self.cache)
+        try:
+            return self.build_bundle(target_career, bundle_text)
+        except ValidationError:
+            return {
+                "plan": await self.agenerate_3_step_plan(user_data, target_career),
+                "monetization": await self.agenerate_monetization_strategy(user_data, target_career),
+                "coaching": await self.agenerate_mindset_coaching(user_data)
+            }
 
     def export_full_plan(self, user_data: Dict[str, Any], analysis: str, 
                          plan: Dict[str, Any], format: str = "markdown") -> str:
@@ -0,0 +1,318 @@
+"""
+Career Pivot Navigator - Rate Limiting
+Shared token buckets (requests/min, tokens/min), AIMD concurrency and
+retries (429s, 5xx and network errors) around every LLM call
+
+Configure through the environment:
+
+    LLM_RPM=500               # requests per minute (0 = no cap)
+    LLM_TPM=30000             # prompt + completion tokens per minute (0 = no cap)
+    LLM_MAX_CONCURRENCY=32    # ceiling for the AIMD concurrency window
+    LLM_MAX_RETRIES=6         # retries for 429 / 5xx responses and network errors
+    LLM_RATE_LIMIT=0          # disable the limiter (the SDK's own retries apply)
+
+Concurrency grows by one call per window's worth of successes and halves on a
+429. Only calls issued after the last decrease can trigger another one, so a
+burst of 429s from the same window halves it once and throughput settles just
+under the provider's ceiling instead of oscillating around it.
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Exception classes (matched anywhere in the MRO) of transient network failures:
+# the OpenAI SDK's connection errors and timeouts, and httpx's
+TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError", "NetworkError", "TimeoutException")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Whether exc is a 429 (or a provider's RateLimitError)."""
+    return _status_code(exc) == 429 or "RateLimit" in type(exc).__name__
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether the call can be retried after a pause: a 429, a 5xx or a network failure."""
+    if is_rate_limited(exc):
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status >= 500
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait (Retry-After / retry-after-ms), if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value) if value else None
+        return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+def _resolve(future: "asyncio.Future[None]"):
+    if not future.done():
+        future.set_result(None)
+
+
+class TokenBucket:
+    """Token bucket refilled at rate_per_minute, holding up to burst_seconds of refill.
+
+    A take larger than the bucket waits for a full bucket and leaves it in
+    debt, so oversized requests still go through at the average rate.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 10.0):
+        """Create a full bucket."""
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, amount: float, now: float) -> float:
+        """Take amount and return 0, or return the seconds to wait before retrying."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            self.level -= amount
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) tokens after the fact."""
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """Process-wide limiter: RPM/TPM buckets, AIMD concurrency window and retries."""
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_concurrency: int = 32,
+                 initial_concurrency: Optional[int] = None, max_retries: int = 6,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        """Create the limiter (rpm/tpm of 0 mean no cap)."""
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = float(initial_concurrency or max(1, self.max_concurrency // 4))
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.stats: Dict[str, int] = {"calls": 0, "retries": 0, "throttled": 0, "failures": 0}
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        # Signalled when a slot is released or a bucket refunded; async callers
+        # on any event loop wait on futures in _async_waiters instead
+        self._changed = threading.Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def _try_acquire(self, tokens: float) -> Optional[float]:
+        """Claim a concurrency slot and bucket capacity (caller holds self._lock).
+
+        Returns 0 once admitted, the seconds to wait for the buckets or a
+        Retry-After pause, or None when the window is full and only a
+        released slot can help.
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.concurrency):
+            return None
+        if self.requests is not None:
+            wait = self.requests.try_take(1, now)
+            if wait:
+                return wait
+        if self.tokens is not None:
+            wait = self.tokens.try_take(tokens, now)
+            if wait:
+                if self.requests is not None:
+                    self.requests.adjust(-1)
+                return wait
+        self.in_flight += 1
+        return 0.0
+
+    def _acquire(self, tokens: float) -> float:
+        """Block until the call is admitted; returns the admission time."""
+        with self._changed:
+            wait = self._try_acquire(tokens)
+            while wait != 0:
+                self._changed.wait(wait)
+                wait = self._try_acquire(tokens)
+        return time.monotonic()
+
+    async def _aacquire(self, tokens: float) -> float:
+        """Async _acquire: waits on a future that _notify resolves, never blocking the loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                wait = self._try_acquire(tokens)
+                if wait == 0:
+                    return time.monotonic()
+                changed = loop.create_future()
+                self._async_waiters.append((loop, changed))
+            try:
+                await asyncio.wait([changed], timeout=wait)
+            finally:
+                with self._lock:
+                    if (loop, changed) in self._async_waiters:
+                        self._async_waiters.remove((loop, changed))
+
+    def _notify(self):
+        """Wake every waiting caller, sync or async, to retry admission (caller holds self._lock)."""
+        self._changed.notify_all()
+        for loop, changed in self._async_waiters:
+            loop.call_soon_threadsafe(_resolve, changed)
+        self._async_waiters.clear()
+
+    def _release(self, tokens: float, admitted: float, error: Optional[BaseException]) -> Optional[float]:
+        """Free the slot, apply AIMD, and return the retry delay if error is retryable.
+
+        A cancelled or interrupted call (an error that isn't an Exception)
+        only frees its slot.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self._notify()
+            if error is not None and not isinstance(error, Exception):
+                return None
+            if error is None:
+                self.stats["calls"] += 1
+                # Additive increase: +1 slot per window's worth of successes
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+                return None
+
+            if not is_retryable(error):
+                self.stats["failures"] += 1
+                return None
+
+            now = time.monotonic()
+            if is_rate_limited(error):
+                self.stats["throttled"] += 1
+                if self.tokens is not None:
+                    self.tokens.adjust(-tokens)  # a rejected call doesn't consume the budget
+                # Multiplicative decrease, once per window: calls admitted before
+                # the last decrease were sent at the old, larger window
+                if admitted >= self._last_decrease:
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    self._last_decrease = now
+            retry_after = retry_after_seconds(error)
+            if retry_after is not None:
+                # Everyone waits out the provider's window, not just this caller
+                self.paused_until = max(self.paused_until, now + retry_after)
+            return retry_after
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff; at least Retry-After when the provider sent one."""
+        backoff = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+        if retry_after is not None:
+            return retry_after + random.uniform(0, min(backoff, 0.25 * retry_after + 0.1))
+        return backoff
+
+    def settle(self, estimated_tokens: float, actual_tokens: float):
+        """Correct the TPM bucket once a call's real token usage is known."""
+        if self.tokens is not None:
+            with self._lock:
+                self.tokens.adjust(actual_tokens - estimated_tokens)
+                self._notify()
+
+    def call(self, fn: Callable[[], Any], tokens: float = 0,
+             can_retry: Callable[[], bool] = lambda: True) -> Any:
+        """Run fn under the limiter, retrying 429s, 5xx responses and network errors.
+
+        tokens is the call's estimated prompt + completion size. can_retry is
+        checked before each retry (e.g. a stream that already emitted tokens
+        must not be restarted).
+        """
+        attempt = 0
+        while True:
+            admitted = self._acquire(tokens)
+            try:
+                result = fn()
+            except BaseException as e:  # cancellation / Ctrl-C must free the slot too
+                retry_after = self._release(tokens, admitted, e)
+                if (not isinstance(e, Exception) or not is_retryable(e)
+                        or attempt >= self.max_retries or not can_retry()):
+                    raise
+                self._count_retry()
+                time.sleep(self._retry_delay(attempt, retry_after))
+                attempt += 1
+                continue
+            self._release(tokens, admitted, None)
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], tokens: float = 0,
+                    can_retry: Callable[[], bool] = lambda: True) -> Any:
+        """Async call: fn returns an awaitable; waiting never blocks the event loop."""
+        attempt = 0
+        while True:
+            admitted = await self._aacquire(tokens)
+            try:
+                result = await fn()
+            except BaseException as e:  # cancellation / Ctrl-C must free the slot too
+                retry_after = self._release(tokens, admitted, e)
+                if (not isinstance(e, Exception) or not is_retryable(e)
+                        or attempt >= self.max_retries or not can_retry()):
+                    raise
+                self._count_retry()
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                attempt += 1
+                continue
+            self._release(tokens, admitted, None)
+            return result
+
+    def _count_retry(self):
+        with self._lock:
+            self.stats["retries"] += 1
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def rate_limiting_enabled() -> bool:
+    """False when LLM_RATE_LIMIT turns the limiter off."""
+    return os.getenv("LLM_RATE_LIMIT", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """The process-wide limiter configured from the environment (None when disabled)."""
+    global _limiter
+    if not rate_limiting_enabled():
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                rpm=float(os.getenv("LLM_RPM", "0")),
+                tpm=float(os.getenv("LLM_TPM", "0")),
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "32")),
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "6")),
+            )
+        return _limiter
@@ -0,0 +1,99 @@
+"""
+Career Pivot Navigator - Career Scoring
+Weighted match scores and bounded-heap top-k selection over the career index
+"""
+
+import heapq
+from typing import Dict, List, Any, Optional, Tuple
+
+from career_index import CareerIndex, iter_bits, keyword_tokens
+
+# Relative importance of each signal; every signal is normalized to 0..1
+DEFAULT_MATCH_WEIGHTS = {
+    "skills": 0.35,       # share of the user's skills that map to the career
+    "pain_points": 0.30,  # share of the user's pain points the career solves
+    "interests": 0.15,    # share of the user's interests found in title/skills
+    "remote": 0.10,       # fit with the user's remote preference
+    "trend": 0.10,        # the career's trend_relevance
+}
+
+# remote_preference -> (fit for a remote career, fit for an on-site career)
+REMOTE_FIT = {
+    "high": (1.0, 0.0),
+    "medium": (1.0, 0.5),
+    "low": (1.0, 1.0),
+}
+
+
+def profile_keys(user_skills: List[str], pain_points: List[str],
+                 interests: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """Canonical lookup keys for a profile, deduplicated in input order."""
+    skills = list(dict.fromkeys(s.lower() for s in user_skills))
+    pains = list(dict.fromkeys(p.lower().replace(" ", "_") for p in pain_points))
+    interest_tokens = []
+    for interest in interests or []:
+        tokens = tuple(keyword_tokens(interest))
+        if tokens and tokens not in interest_tokens:
+            interest_tokens.append(tokens)
+    return {"skills": skills, "pains": pains, "interests": interest_tokens}
+
+
+def interest_bits(index: CareerIndex, tokens: Tuple[str, ...]) -> int:
+    """Careers whose keywords contain every token of one interest."""
+    mask = index.keyword_bits(tokens[0])
+    for token in tokens[1:]:
+        if not mask:
+            break
+        mask &= index.keyword_bits(token)
+    return mask
+
+
+def _count_bits(masks: List[int]) -> Dict[int, int]:
+    """For each ordinal, how many of the masks contain it."""
+    counts: Dict[int, int] = {}
+    for mask in masks:
+        for ordinal in iter_bits(mask):
+            counts[ordinal] = counts.get(ordinal, 0) + 1
+    return counts
+
+
+def rank_careers(index: CareerIndex, user_skills: List[str], pain_points: List[str],
+                 interests: Optional[List[str]] = None, remote_preference: Optional[str] = None,
+                 top_k: int = 3, weights: Optional[Dict[str, float]] = None) -> List[Tuple[float, int]]:
+    """Score every career matching a skill or pain point and keep the best top_k.
+
+    Returns (score, ordinal) pairs, best first. Candidates are scanned in
+    ordinal order and selected with heapq.nlargest, so ties keep catalog order
+    and ranking costs O(n log k) rather than a full sort.
+    """
+    weights = {**DEFAULT_MATCH_WEIGHTS, **(weights or {})}
+    keys = profile_keys(user_skills, pain_points, interests)
+
+    skill_masks = [index.skill_bits(s) for s in keys["skills"]]
+    pain_masks = [index.pain_bits(p) for p in keys["pains"]]
+    candidates = 0
+    for mask in skill_masks + pain_masks:
+        candidates |= mask
+    if not candidates or top_k <= 0:
+        return []
+
+    skill_counts = _count_bits(skill_masks)
+    pain_counts = _count_bits(pain_masks)
+    interest_counts = _count_bits([interest_bits(index, t) for t in keys["interests"]])
+    n_skills, n_pains, n_interests = len(keys["skills"]), len(keys["pains"]), len(keys["interests"])
+    remote_fit = REMOTE_FIT.get(remote_preference or "", (1.0, 1.0))
+
+    w_skills, w_pains, w_interests = weights["skills"], weights["pain_points"], weights["interests"]
+    w_remote, w_trend = weights["remote"], weights["trend"]
+
+    def score(ordinal: int) -> float:
+        skill_share = skill_counts.get(ordinal, 0) / n_skills if n_skills else 0.0
+        pain_share = pain_counts.get(ordinal, 0) / n_pains if n_pains else 0.0
+        interest_share = interest_counts.get(ordinal, 0) / n_interests if n_interests else 0.0
+        remote = remote_fit[0] if index.is_remote(ordinal) else remote_fit[1]
+        return (w_skills * skill_share + w_pains * pain_share + w_interests * interest_share
+                + w_remote * remote + w_trend * index.trend_relevance(ordinal))
+
+    scored = ((score(ordinal), ordinal) for ordinal in iter_bits(candidates))
+    # Key on the score alone so equal scores keep their (ordinal) scan order
+    return heapq.nlargest(top_k, scored, key=lambda pair: pair[0])
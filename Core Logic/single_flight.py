@@ -0,0 +1,113 @@
+"""
+Career Pivot Navigator - Single-Flight LLM Calls
+Concurrent identical requests share one in-flight completion
+
+When several threads or asyncio tasks ask for the same rendered prompt from
+the same model and temperature at the same time, the first one (the leader)
+makes the call and the rest wait for its result instead of sending their own.
+An error is shared too; a cancelled leader hands the call to one of its
+followers. Only requests that overlap in time are coalesced; the response
+cache (llm_cache.py) covers repeats that come later.
+
+    LLM_SINGLE_FLIGHT=0   # disable coalescing
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """In-flight calls keyed by request, shared by every concurrent caller with that key."""
+
+    def __init__(self):
+        """Start with nothing in flight."""
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, concurrent.futures.Future] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "coalesced": 0}
+
+    def _join(self, key: Hashable) -> Tuple[concurrent.futures.Future, bool]:
+        """The key's in-flight future, and whether this caller must make the call."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats["coalesced"] += 1
+                return flight, False
+            flight = self._flights[key] = concurrent.futures.Future()
+            self.stats["calls"] += 1
+            return flight, True
+
+    def _land(self, key: Hashable, flight: concurrent.futures.Future,
+              result: Any = None, error: Optional[BaseException] = None):
+        """Retire the flight and hand its outcome to the followers."""
+        with self._lock:
+            del self._flights[key]
+        if flight.done():
+            return
+        if error is None:
+            flight.set_result(result)
+        elif isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            flight.cancel()  # cancelled / interrupted: a follower takes over
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn, or wait for the identical call already in flight.
+
+        Returns (result, shared); shared is True when another caller's call
+        produced the result.
+        """
+        while True:
+            flight, leader = self._join(key)
+            if not leader:
+                try:
+                    return flight.result(), True
+                except concurrent.futures.CancelledError:
+                    continue
+            try:
+                result = fn()
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+            self._land(key, flight, result)
+            return result, False
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async do: fn returns an awaitable; followers wait without blocking the event loop."""
+        while True:
+            flight, leader = self._join(key)
+            if not leader:
+                try:
+                    # Shielded: cancelling this follower must not cancel the shared flight
+                    return await asyncio.shield(asyncio.wrap_future(flight)), True
+                except asyncio.CancelledError:
+                    if flight.cancelled():
+                        continue  # the leader was cancelled, not us
+                    raise
+            try:
+                result = await fn()
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+            self._land(key, flight, result)
+            return result, False
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight."""
+        with self._lock:
+            return len(self._flights)
+
+
+_single_flight = SingleFlight()
+
+
+def single_flight_enabled() -> bool:
+    """False when LLM_SINGLE_FLIGHT turns coalescing off."""
+    return os.getenv("LLM_SINGLE_FLIGHT", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """The process-wide SingleFlight used by llm_calls (None when disabled)."""
+    return _single_flight if single_flight_enabled() else None
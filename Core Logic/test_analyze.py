@@ -0,0 +1,117 @@
+"""
+Career Pivot Navigator - Analyzer Tests
+Cohort runs on the fake backend and the offline instant analysis
+"""
+
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+from langchain_core.messages import BaseMessage
+
+from analyze import CareerPivotAnalyzer
+from fake_llm import FakePivotChatModel
+from plan_generator import PivotPlanGenerator
+
+PROFILES = [
+    {"name": "Ana", "current_role": "Customer Service Rep", "skills": "communication, empathy, research",
+     "hates": "low pay, angry customers", "interests": "tech, writing"},
+    {"name": "Ben", "current_role": "Teacher", "skills": "writing, design, planning",
+     "hates": "no creativity", "interests": "art"},
+    {"name": "Cy", "current_role": "Broken Role", "skills": "sql, excel",
+     "hates": "boredom", "interests": "data"},
+    {"name": "Di", "current_role": "Accountant", "skills": "excel, analysis",
+     "hates": "long hours", "interests": "finance"},
+]
+
+
+class FailingChatModel(FakePivotChatModel):
+    """The fake backend, except that prompts mentioning "Broken Role" fail."""
+
+    def _respond(self, messages: List[BaseMessage]) -> Tuple[str, float, float]:
+        if any("Broken Role" in str(m.content) for m in messages):
+            raise RuntimeError("provider rejected the request")
+        return super()._respond(messages)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    return FailingChatModel()
+
+
+def check_cohort(results: List[Any], expected_names: List[str]):
+    assert len(results) == len(expected_names) + 2
+    assert results[1]["error"].startswith("AttributeError")        # not a dict
+    assert results[3] == {"error": "RuntimeError: provider rejected the request"}
+    names = [r["user_data"]["name"] for i, r in enumerate(results) if i not in (1, 3)]
+    assert names == expected_names
+    assert all(r["analysis"] for i, r in enumerate(results) if i not in (1, 3))
+
+
+def without_timestamp(plan):
+    return {k: v for k, v in plan.items() if k != "generated_at"}
+
+
+def cohort() -> List[Any]:
+    # A malformed profile and one the LLM fails on, in the middle of the cohort
+    return [PROFILES[0], None, PROFILES[1], PROFILES[2], PROFILES[3]]
+
+
+def test_analyze_many_keeps_order_and_captures_errors(llm):
+    analyzer = CareerPivotAnalyzer(llm=llm)
+    results = analyzer.analyze_many(cohort(), max_concurrency=2)
+    check_cohort(results, ["Ana", "Ben", "Di"])
+
+    # Each surviving result matches what a single analyze_pivot call returns
+    assert results[4] == analyzer.analyze_pivot(PROFILES[3])
+
+
+def test_aanalyze_many_keeps_order_and_captures_errors(llm):
+    analyzer = CareerPivotAnalyzer(llm=llm)
+    results = asyncio.run(analyzer.aanalyze_many(cohort(), max_concurrency=2))
+    check_cohort(results, ["Ana", "Ben", "Di"])
+    assert results == analyzer.analyze_many(cohort(), max_concurrency=2)
+
+
+def test_generate_plans_many_keeps_order_and_captures_errors(llm):
+    generator = PivotPlanGenerator(llm=llm)
+    target = {"id": "ux_researcher", "title": "UX Researcher"}
+    items = [(PROFILES[0], target), (PROFILES[1], None), (PROFILES[2], target), (PROFILES[3], target)]
+
+    results = generator.generate_plans_many(items, max_concurrency=2)
+    assert len(results) == 4
+    assert results[1]["error"].startswith("AttributeError")
+    assert results[2] == {"error": "RuntimeError: provider rejected the request"}
+    for i in (0, 3):
+        assert results[i]["target_career"] == target and results[i]["steps"]
+        assert without_timestamp(results[i]) == without_timestamp(generator.generate_3_step_plan(*items[i]))
+
+    again = asyncio.run(generator.agenerate_plans_many(items, max_concurrency=2))
+    assert [without_timestamp(r) for r in again] == [without_timestamp(r) for r in results]
+
+
+def test_offline_instant_analysis_needs_no_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("LLM_BACKEND", raising=False)
+    analyzer = CareerPivotAnalyzer(offline=True)
+    assert analyzer.llm is None and analyzer.cache is None
+
+    result = analyzer.instant_analysis(PROFILES[0])
+    assert result["analysis"] is None
+    ids = [career["id"] for career in result["matched_careers"]]
+    assert ids and set(result["difficulty_assessments"]) == set(ids)
+    for key in ("quick_wins", "salary_ranges", "resources"):
+        assert set(result[key]) == set(ids)
+    assert result["quick_wins"][ids[0]] == analyzer.get_quick_wins(ids[0])
+    assert result["salary_ranges"][ids[0]] == analyzer.get_salary_range(ids[0])
+
+
+def test_offline_analyzer_refuses_llm_calls():
+    analyzer = CareerPivotAnalyzer(offline=True)
+    with pytest.raises(RuntimeError, match="offline=True"):
+        analyzer.analyze_pivot(PROFILES[0])
+    with pytest.raises(RuntimeError):
+        analyzer.extract_skills(PROFILES[0])
+    with pytest.raises(AttributeError):
+        analyzer.no_such_attribute
@@ -0,0 +1,110 @@
+"""
+Career Pivot Navigator - Batch Matching Tests
+rank_profiles_batch must rank exactly like scoring.rank_careers
+"""
+
+import random
+
+import pytest
+
+import batch_matching
+from benchmark import make_synthetic_catalog
+from career_index import get_career_index
+from scoring import rank_careers
+from utils import find_career_map, load_career_map
+
+
+def random_profiles(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    skills = [f"skill_{i}" for i in range(30)] + ["Skill_3", "no such skill"]
+    pains = [f"pain_{i}" for i in range(12)] + ["Pain 4", "unknown_pain", "not a pain"]
+    interests = ["synthetic", "career 7", "synthetic career", "astronomy", ""]
+    remote = ["high", "medium", "low", None, "sometimes"]
+    return [{
+        "skills": rng.sample(skills, rng.randint(0, 5)),
+        "hates": rng.sample(pains, rng.randint(0, 3)),
+        "interests": rng.sample(interests, rng.randint(0, 2)),
+        "remote_preference": rng.choice(remote),
+    } for _ in range(n)]
+
+
+def edge_profiles():
+    return [
+        {"skills": [], "hates": [], "interests": []},                      # nothing to match
+        {"skills": [], "hates": ["pain_1"]},                               # pains only
+        {"skills": ["skill_2", "skill_2", "SKILL_2"], "hates": []},        # duplicates
+        {"skills": ["no such skill"], "hates": ["unknown_pain"]},          # no candidates
+        {"skills": ["skill_1"], "hates": ["unknown_pain", "pain_2"], "interests": ["astronomy"]},
+    ]
+
+
+def one_by_one(index, profiles, top_k, weights=None):
+    return [
+        rank_careers(index, p.get("skills", []), p.get("hates", []), interests=p.get("interests"),
+                     remote_preference=p.get("remote_preference"), top_k=top_k, weights=weights)
+        for p in profiles
+    ]
+
+
+@pytest.fixture(params=["sparse", "dense"])
+def matrix_backend(request, monkeypatch):
+    if batch_matching.np is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "dense":
+        monkeypatch.setattr(batch_matching, "sparse", None)
+    elif batch_matching.sparse is None:
+        pytest.skip("SciPy is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 10])
+def test_matches_rank_careers(matrix_backend, top_k):
+    index = get_career_index(make_synthetic_catalog(300, n_skills=30, n_pains=12))
+    profiles = random_profiles(200) + edge_profiles()
+    assert batch_matching.rank_profiles_batch(index, profiles, top_k=top_k) == one_by_one(index, profiles, top_k)
+
+
+def test_ties_keep_catalog_order(matrix_backend):
+    catalog = make_synthetic_catalog(120, n_skills=6, n_pains=3)
+    for career in catalog["careers"]:
+        career["trend_relevance"] = 0.5
+        career["remote"] = True
+    index = get_career_index(catalog)
+    profiles = random_profiles(100, seed=5) + edge_profiles()
+
+    batch = batch_matching.rank_profiles_batch(index, profiles, top_k=5)
+    assert batch == one_by_one(index, profiles, 5)
+    tied = [ranked for ranked in batch if len({score for score, _ in ranked}) < len(ranked)]
+    assert tied, "the catalog should produce tied scores"
+
+
+def test_chunking_and_custom_weights(matrix_backend, monkeypatch):
+    monkeypatch.setattr(batch_matching, "MAX_CELLS_PER_CHUNK", 1000)  # a few profiles per chunk
+    index = get_career_index(make_synthetic_catalog(400, n_skills=30, n_pains=12))
+    profiles = random_profiles(50, seed=3)
+    weights = {"skills": 0.6, "trend": 0.0}
+    assert (batch_matching.rank_profiles_batch(index, profiles, top_k=3, weights=weights)
+            == one_by_one(index, profiles, 3, weights))
+
+
+def test_real_catalog():
+    index = get_career_index(load_career_map(find_career_map()))
+    profiles = [
+        {"skills": ["communication", "Empathy", "writing"], "hates": ["low pay", "angry_customers"],
+         "interests": ["tech", "mental health"], "remote_preference": "high"},
+        {"skills": ["research"], "hates": [], "interests": [], "remote_preference": "low"},
+    ] + edge_profiles()
+    assert batch_matching.rank_profiles_batch(index, profiles, top_k=3) == one_by_one(index, profiles, 3)
+
+
+def test_without_numpy_falls_back(monkeypatch):
+    monkeypatch.setattr(batch_matching, "np", None)
+    index = get_career_index(make_synthetic_catalog(50, n_skills=30, n_pains=12))
+    profiles = random_profiles(20)
+    assert batch_matching.rank_profiles_batch(index, profiles) == one_by_one(index, profiles, 3)
+
+
+def test_empty_inputs():
+    index = get_career_index(make_synthetic_catalog(10))
+    assert batch_matching.rank_profiles_batch(index, []) == []
+    assert batch_matching.rank_profiles_batch(index, edge_profiles(), top_k=0) == [[] for _ in edge_profiles()]
@@ -0,0 +1,176 @@
+"""
+Career Pivot Navigator - Batch Runner Tests
+Resume, truncated-output repair, bounded concurrency and interrupts in batch_runner
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+import batch_runner
+from analyze import CareerPivotAnalyzer
+from batch_runner import BatchRunner, completed_ids
+from fake_llm import FakePivotChatModel
+from plan_generator import PivotPlanGenerator
+
+PROFILE = {
+    "current_role": "Customer Service Rep",
+    "skills": "communication, empathy, research",
+    "hates": "low pay, angry customers",
+    "interests": "tech, writing",
+    "budget": "low",
+    "time_availability": "5 hours/week",
+    "remote_preference": "high",
+}
+
+
+class CountingAnalyzer:
+    """Wraps an analyzer and counts analyze_pivot calls per profile name."""
+
+    def __init__(self, inner, delay: float = 0.0):
+        self.inner = inner
+        self.delay = delay
+        self.calls = Counter()
+        self.finished = []
+        self._lock = threading.Lock()
+
+    def analyze_pivot(self, user_data):
+        with self._lock:
+            self.calls[user_data["name"]] += 1
+        time.sleep(self.delay)
+        result = self.inner.analyze_pivot(user_data)
+        with self._lock:
+            self.finished.append(user_data["name"])
+        return result
+
+
+def write_profiles(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"id": f"p{i}", "name": f"p{i}", **PROFILE}) + "\n")
+
+
+def read_records(path):
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass  # the line an interrupted run cut short
+    return records
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    return FakePivotChatModel()
+
+
+def test_truncated_output_resumes_without_repeats(tmp_path, fake_llm):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_profiles(in_path, 12)
+    analyzer = CountingAnalyzer(CareerPivotAnalyzer(llm=fake_llm))
+    runner = BatchRunner(analyzer, PivotPlanGenerator(llm=fake_llm), plans=1)
+
+    assert runner.run(str(in_path), str(out_path), workers=3) == {"ok": 12, "failed": 0, "skipped": 0}
+    record = read_records(out_path)[0]
+    assert record["analysis"] and record["matched_careers"] and record["plans"][0]["plan"]["steps"]
+
+    # Simulate a crash mid-write: drop the last two records and cut the one before in half
+    lines = out_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    cut = json.loads(lines[-3])["id"]
+    lost = {cut} | {json.loads(line)["id"] for line in lines[-2:]}
+    out_path.write_text("".join(lines[:-3]) + lines[-3][:40], encoding="utf-8")
+    assert completed_ids(str(out_path)) == {f"p{i}" for i in range(12)} - lost
+
+    analyzer.calls.clear()
+    assert runner.run(str(in_path), str(out_path), workers=3) == {"ok": 3, "failed": 0, "skipped": 9}
+    assert set(analyzer.calls) == lost
+    assert max(analyzer.calls.values()) == 1
+
+    ids = Counter(r["id"] for r in read_records(out_path))
+    assert ids == Counter({f"p{i}": 1 for i in range(12)})
+
+    # A third run has nothing left to do
+    analyzer.calls.clear()
+    assert runner.run(str(in_path), str(out_path), workers=3)["skipped"] == 12
+    assert not analyzer.calls
+
+
+def test_failures_and_bad_lines_are_retried(tmp_path, fake_llm):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_profiles(in_path, 3)
+    with open(in_path, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+        f.write(json.dumps({"id": "p1", "name": "p1", **PROFILE}) + "\n")  # repeated id
+
+    class Flaky(CountingAnalyzer):
+        fail = True
+
+        def analyze_pivot(self, user_data):
+            if self.fail and user_data["name"] == "p2":
+                raise RuntimeError("provider down")
+            return super().analyze_pivot(user_data)
+
+    analyzer = Flaky(CareerPivotAnalyzer(llm=fake_llm))
+    runner = BatchRunner(analyzer, plans=0)
+    assert runner.run(str(in_path), str(out_path), workers=2) == {"ok": 2, "failed": 2, "skipped": 1}
+    errors = {r["id"]: r["error"] for r in read_records(out_path) if "error" in r}
+    assert errors["p2"] == "RuntimeError: provider down"
+    assert errors["line-4"].startswith("JSONDecodeError")
+
+    analyzer.fail = False
+    counts = runner.run(str(in_path), str(out_path), workers=2)
+    assert counts == {"ok": 1, "failed": 1, "skipped": 3}  # p2 now succeeds, line 4 still can't parse
+    assert completed_ids(str(out_path)) == {"p0", "p1", "p2"}
+
+
+def test_in_flight_profiles_are_bounded(tmp_path, fake_llm, monkeypatch):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_profiles(in_path, 40)
+    read = [0]
+    real_read_profiles = batch_runner.read_profiles
+
+    def counting_read_profiles(path):
+        for item in real_read_profiles(path):
+            read[0] += 1
+            yield item
+
+    monkeypatch.setattr(batch_runner, "read_profiles", counting_read_profiles)
+    written = [0]
+    outstanding = []
+
+    def on_record(record):
+        written[0] += 1
+        outstanding.append(read[0] - written[0] + 1)
+
+    workers = 3
+    analyzer = CountingAnalyzer(CareerPivotAnalyzer(llm=fake_llm), delay=0.005)
+    BatchRunner(analyzer, plans=0).run(str(in_path), str(out_path), workers=workers, on_record=on_record)
+    assert written[0] == 40
+    assert max(outstanding) <= 2 * workers
+
+
+def test_interrupt_keeps_results_that_finish_during_shutdown(tmp_path, fake_llm, monkeypatch):
+    in_path, out_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_profiles(in_path, 20)
+    real_read_profiles = batch_runner.read_profiles
+
+    def interrupted_read_profiles(path):
+        for i, item in enumerate(real_read_profiles(path)):
+            if i == 4:
+                time.sleep(0.02)  # the first profiles are now running
+                raise KeyboardInterrupt
+            yield item
+
+    monkeypatch.setattr(batch_runner, "read_profiles", interrupted_read_profiles)
+    analyzer = CountingAnalyzer(CareerPivotAnalyzer(llm=fake_llm), delay=0.1)
+    with pytest.raises(KeyboardInterrupt):
+        BatchRunner(analyzer, plans=0).run(str(in_path), str(out_path), workers=4)
+
+    assert len(analyzer.finished) == 4
+    assert sorted(r["id"] for r in read_records(out_path)) == sorted(analyzer.finished)
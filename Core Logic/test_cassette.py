@@ -0,0 +1,136 @@
+"""
+Career Pivot Navigator - Cassette Tests
+Recording and replaying LLM traffic with cassette.CassetteChatModel
+"""
+
+import asyncio
+import gzip
+import json
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.prompts import PromptTemplate
+
+from cassette import FLUSH_EVERY, Cassette, CassetteChatModel, cassette_model_from_env
+from llm_cache import LLMResponseCache
+from llm_calls import invoke_chain, model_identity
+from llm_metrics import price_for, usage_tokens
+
+USAGE = {"input_tokens": 12, "output_tokens": 5, "total_tokens": 17}
+
+
+class UsageReportingModel(BaseChatModel):
+    """Answers "reply to: <prompt>" and reports token usage like ChatOpenAI."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "usage-reporting"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = f"reply to: {messages[-1].content}"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=USAGE))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for token in ["reply ", "to: ", str(messages[-1].content)]:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+        # stream_usage=True: usage arrives on a final chunk with no text
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=USAGE))
+
+
+def recorder(path) -> CassetteChatModel:
+    return CassetteChatModel(cassette=Cassette(str(path)), mode="record", inner=UsageReportingModel())
+
+
+def player(path) -> CassetteChatModel:
+    return CassetteChatModel(cassette=Cassette(str(path)), mode="replay", timing="instant")
+
+
+def streamed(model: CassetteChatModel, prompt: str) -> AIMessageChunk:
+    total = None
+    for chunk in model.stream([HumanMessage(content=prompt)]):
+        total = chunk if total is None else total + chunk
+    return total
+
+
+def test_invoke_usage_is_recorded_and_replayed(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    model = recorder(path)
+    recorded = model.invoke([HumanMessage(content="hello")])
+    assert usage_tokens(recorded) == (12, 5)
+    model.cassette.flush()
+
+    replayed = player(path).invoke([HumanMessage(content="hello")])
+    assert replayed.content == "reply to: hello"
+    assert usage_tokens(replayed) == (12, 5)
+
+
+def test_stream_usage_is_recorded_and_replayed(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    model = recorder(path)
+    recorded = streamed(model, "stream me")
+    assert recorded.content == "reply to: stream me"
+    assert usage_tokens(recorded) == (12, 5)
+    model.cassette.flush()
+
+    replayed = streamed(player(path), "stream me")
+    assert replayed.content == "reply to: stream me"
+    assert usage_tokens(replayed) == (12, 5)
+
+    async def astreamed():
+        total = None
+        async for chunk in player(path).astream([HumanMessage(content="stream me")]):
+            total = chunk if total is None else total + chunk
+        return total
+
+    assert usage_tokens(asyncio.run(astreamed())) == (12, 5)
+
+
+def test_writes_are_batched(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    model = recorder(path)
+    for i in range(FLUSH_EVERY - 1):
+        model.invoke([HumanMessage(content=f"prompt {i}")])
+    assert not path.exists()  # still buffered...
+    assert model.invoke([HumanMessage(content="prompt 0")]).content == "reply to: prompt 0"
+    assert path.exists()      # ...until FLUSH_EVERY entries are pending
+
+    for i in range(10):
+        model.invoke([HumanMessage(content=f"late {i}")])
+    model.cassette.flush()
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == FLUSH_EVERY + 10
+    assert len(Cassette(str(path))) == FLUSH_EVERY + 10
+
+    # Two gzip members, far smaller than one member per line
+    per_line = sum(len(gzip.compress(json.dumps(line).encode("utf-8"))) for line in lines)
+    assert path.stat().st_size * 3 < per_line
+
+
+def test_replay_model_has_its_own_identity(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CASSETTE", str(tmp_path / "traffic.jsonl.gz"))
+    monkeypatch.setenv("LLM_REPLAY_TIMING", "instant")
+    prompt = PromptTemplate.from_template("Suggest a pivot for {role}.")
+    cache = LLMResponseCache(":memory:")
+
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "record")
+    live = cassette_model_from_env("gpt-4o", 0.0, inner=UsageReportingModel())
+    assert model_identity(live) == ("gpt-4o", 0.0)
+    text = invoke_chain(prompt | live, {"role": "Teacher"})
+    live.cassette.flush()
+
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "replay")
+    replay = cassette_model_from_env("gpt-4o", 0.0)
+    assert model_identity(replay) == ("cassette:gpt-4o", 0.0)
+    assert price_for(model_identity(replay)[0]) == (0.0, 0.0)
+    assert invoke_chain(prompt | replay, {"role": "Teacher"}, cache) == text
+
+    # The replayed response was cached under the replay model, not the live one
+    rendered = prompt.format(role="Teacher")
+    assert cache.lookup("cassette:gpt-4o", 0.0, rendered) == text
+    assert cache.lookup("gpt-4o", 0.0, rendered) is None
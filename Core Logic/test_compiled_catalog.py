@@ -0,0 +1,58 @@
+"""
+Career Pivot Navigator - Compiled Catalog Tests
+Freshness checks of the memory-mapped artifact against its JSON source
+"""
+
+import hashlib
+import os
+import shutil
+import time
+
+import compiled_catalog
+from compiled_catalog import compile_catalog, is_fresh, read_header
+from utils import clear_career_map_cache, find_career_map, load_career_map
+
+
+def _touch(path: str):
+    later = time.time_ns() + 10 ** 9
+    os.utime(path, ns=(later, later))
+
+
+def test_touched_source_is_hashed_once(tmp_path, monkeypatch):
+    source = str(tmp_path / "career_map.json")
+    shutil.copy(find_career_map(), source)
+    compiled = compile_catalog(source)
+    clear_career_map_cache()
+    first = load_career_map(source)
+
+    _touch(source)
+    hashes = []
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(*args):
+        hashes.append(1)
+        return real_sha256(*args)
+
+    monkeypatch.setattr(compiled_catalog.hashlib, "sha256", counting_sha256)
+    loads = [load_career_map(source) for _ in range(5)]
+
+    assert len(hashes) == 1
+    assert all(catalog is first for catalog in loads)
+    assert read_header(compiled)["source_mtime_ns"] == os.stat(source).st_mtime_ns
+    clear_career_map_cache()
+
+
+def test_same_size_edit_is_stale(tmp_path):
+    source = str(tmp_path / "career_map.json")
+    shutil.copy(find_career_map(), source)
+    compiled = compile_catalog(source)
+
+    raw = bytearray(open(source, "rb").read())
+    at = raw.index(b'"title": "') + len(b'"title": "')
+    raw[at] ^= 1  # flip one letter of a title: same size, new content
+    with open(source, "wb") as f:
+        f.write(raw)
+    _touch(source)
+
+    assert not is_fresh(compiled, source)
+    assert not is_fresh(compiled, source)
@@ -0,0 +1,104 @@
+"""
+Career Pivot Navigator - Resident Daemon Tests
+Socket ownership and request forwarding in daemon.PivotDaemon
+"""
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+import daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+class EchoAnalyzer:
+    def instant_analysis(self, user_data):
+        return {"echo": user_data}
+
+    def analyze_pivot(self, user_data, on_token=None):
+        if on_token is not None:
+            for token in ("a", "b"):
+                on_token(token)
+        return {"analysis": "ab"}
+
+
+@pytest.fixture
+def sock_path():
+    # AF_UNIX paths are short (~100 bytes), so keep it out of pytest's deep tmp_path
+    directory = tempfile.mkdtemp(prefix="cpn-")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running(sock_path):
+    server = daemon.PivotDaemon(analyzer=EchoAnalyzer(), plan_gen=object(), path=sock_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.socket_in_use(sock_path):
+            break
+        time.sleep(0.01)
+    yield server
+    daemon.request({"method": "shutdown"}, path=sock_path)
+    thread.join(5)
+
+
+def test_requests_are_forwarded_and_streamed(running, sock_path):
+    assert daemon.request({"method": "instant_analysis", "args": [{"name": "Sam"}]}, path=sock_path) == {
+        "echo": {"name": "Sam"}
+    }
+    tokens = []
+    result = daemon.request({"method": "analyze_pivot", "args": [{}], "stream": True},
+                            on_token=tokens.append, path=sock_path)
+    assert result == {"analysis": "ab"}
+    assert tokens == ["a", "b"]
+    with pytest.raises(daemon.DaemonError):
+        daemon.request({"method": "nope"}, path=sock_path)
+    assert os.stat(sock_path).st_mode & 0o077 == 0
+
+
+def test_second_daemon_keeps_a_live_socket_even_with_forwarding_off(running, sock_path, monkeypatch):
+    monkeypatch.setenv("PIVOT_DAEMON", "0")
+    assert daemon.status(sock_path) is None  # forwarding is off...
+    second = daemon.PivotDaemon(analyzer=EchoAnalyzer(), plan_gen=object(), path=sock_path)
+    with pytest.raises(RuntimeError, match="already listening"):
+        second.serve_forever()
+    # ...but the running daemon's socket is untouched
+    assert daemon.socket_in_use(sock_path)
+    assert daemon.request({"method": "status"}, path=sock_path)["pid"] == os.getpid()
+
+
+def test_stale_socket_is_replaced(sock_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(sock_path)
+    stale.close()  # the file stays behind, nobody listens
+    assert os.path.exists(sock_path)
+    assert not daemon.socket_in_use(sock_path)
+
+    server = daemon.PivotDaemon(analyzer=EchoAnalyzer(), plan_gen=object(), path=sock_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.socket_in_use(sock_path):
+            break
+        time.sleep(0.01)
+    assert daemon.request({"method": "status"}, path=sock_path)["socket"] == sock_path
+    daemon.request({"method": "shutdown"}, path=sock_path)
+    thread.join(5)
+    assert not os.path.exists(sock_path)
+
+
+def test_refuses_to_replace_a_regular_file(sock_path):
+    with open(sock_path, "w") as f:
+        f.write("not a socket")
+    server = daemon.PivotDaemon(analyzer=EchoAnalyzer(), plan_gen=object(), path=sock_path)
+    with pytest.raises(RuntimeError, match="not a socket"):
+        server.serve_forever()
+    assert os.path.exists(sock_path)
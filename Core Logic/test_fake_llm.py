@@ -0,0 +1,82 @@
+"""
+Career Pivot Navigator - Fake LLM Tests
+Deterministic output and simulated timing of fake_llm.FakePivotChatModel
+"""
+
+import asyncio
+import random
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from fake_llm import FakePivotChatModel, fake_chat_model_from_env, parse_latency, sample_latency, split_tokens
+
+PLAN_PROMPT = "Create a 3-step plan.\nTarget role: UX Researcher"
+
+
+def reply(model: FakePivotChatModel, prompt: str) -> str:
+    return model.invoke([HumanMessage(content=prompt)]).content
+
+
+def test_output_depends_only_on_prompt_and_seed():
+    first = reply(FakePivotChatModel(), PLAN_PROMPT)
+    assert reply(FakePivotChatModel(), PLAN_PROMPT) == first
+    assert reply(FakePivotChatModel(temperature=0.0, model_name="fake-other"), PLAN_PROMPT) == first
+    assert reply(FakePivotChatModel(), PLAN_PROMPT + "\nName: Ana") != first
+    assert reply(FakePivotChatModel(seed=1), PLAN_PROMPT) != first
+
+
+def test_stream_and_async_match_invoke():
+    model = FakePivotChatModel()
+    text = reply(model, PLAN_PROMPT)
+    chunks = [chunk.content for chunk in model.stream([HumanMessage(content=PLAN_PROMPT)])]
+    assert len(chunks) > 1 and "".join(chunks) == text
+    assert asyncio.run(model.ainvoke([HumanMessage(content=PLAN_PROMPT)])).content == text
+
+
+def test_plan_responses_have_three_steps():
+    text = reply(FakePivotChatModel(), PLAN_PROMPT)
+    assert text.count("STEP TITLE:") == 3
+    assert "UX Researcher" in reply(FakePivotChatModel(), "Analyze this pivot.\nTarget role: UX Researcher")
+
+
+def test_split_tokens_round_trips():
+    text = "  Two words\n\nand  more "
+    assert "".join(split_tokens(text)) == text
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("fixed:0.5", ("fixed", [0.5])),
+    ("uniform:0.1,0.3", ("uniform", [0.1, 0.3])),
+    ("lognormal:0.8,0.5", ("lognormal", [0.8, 0.5])),
+    ("", ("fixed", [0.0])),
+])
+def test_parse_latency(spec, expected):
+    assert parse_latency(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["gamma:1,2", "uniform:1", "fixed:1,2"])
+def test_parse_latency_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_latency(spec)
+
+
+def test_sampled_latency_is_seeded_and_never_negative():
+    draws = [sample_latency("normal:0,1", random.Random(7)) for _ in range(2)]
+    assert draws[0] == draws[1]
+    rng = random.Random(0)
+    assert all(sample_latency("normal:0,1", rng) >= 0 for _ in range(200))
+    assert all(0.1 <= sample_latency("uniform:0.1,0.3", rng) <= 0.3 for _ in range(200))
+
+
+def test_model_from_env(monkeypatch):
+    monkeypatch.setenv("FAKE_LLM_LATENCY", "uniform:0,0.01")
+    monkeypatch.setenv("FAKE_LLM_TOKENS_PER_SECOND", "500")
+    monkeypatch.setenv("FAKE_LLM_SEED", "3")
+    model = fake_chat_model_from_env("gpt-4o-mini", 0.2)
+    assert (model.model_name, model.temperature, model.seed) == ("fake-gpt-4o-mini", 0.2, 3)
+    assert model.tokens_per_second == 500.0
+
+    monkeypatch.setenv("FAKE_LLM_LATENCY", "sometimes")
+    with pytest.raises(ValueError):
+        fake_chat_model_from_env()
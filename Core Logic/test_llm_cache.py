@@ -0,0 +1,80 @@
+"""
+Career Pivot Navigator - LLM Response Cache Tests
+Temperature policy, limits and configuration of llm_cache
+"""
+
+import os
+
+from langchain_core.prompts import PromptTemplate
+
+import llm_cache
+from fake_llm import FakePivotChatModel
+from llm_cache import LLMResponseCache
+from llm_calls import invoke_chain
+
+
+def test_sampled_calls_are_cached_by_default():
+    cache = LLMResponseCache(":memory:")
+    cache.store("gpt-4o", 0.7, "prompt", "sampled")
+    assert cache.lookup("gpt-4o", 0.7, "prompt") == "sampled"
+
+
+def test_sampled_calls_can_opt_out():
+    cache = LLMResponseCache(":memory:", cache_nonzero_temperature=False)
+    cache.store("gpt-4o", 0.7, "prompt", "sampled")
+    assert cache.lookup("gpt-4o", 0.7, "prompt") is None
+    assert len(cache) == 0
+
+    cache.store("gpt-4o", 0, "prompt", "deterministic")
+    assert cache.lookup("gpt-4o", 0, "prompt") == "deterministic"
+
+
+def test_sampled_chain_hits_on_the_second_run():
+    llm = FakePivotChatModel(temperature=0.7)
+    chain = PromptTemplate.from_template("Target role: {role}\nSuggest a pivot.") | llm
+    cache = LLMResponseCache(":memory:")
+
+    first = invoke_chain(chain, {"role": "UX Researcher"}, cache)
+    second = invoke_chain(chain, {"role": "UX Researcher"}, cache)
+    assert second == first
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_entry_limit_evicts_least_recently_used():
+    cache = LLMResponseCache(":memory:", max_entries=3)
+    for i in range(3):
+        cache.store("m", 0, f"p{i}", "x")
+    cache.lookup("m", 0, "p0")  # p1 is now the least recently used
+    cache.store("m", 0, "p3", "x")
+
+    assert len(cache) == 3
+    assert cache.lookup("m", 0, "p1") is None
+    assert cache.lookup("m", 0, "p0") == "x"
+    assert cache.stats["evictions"] == 1
+
+
+def test_byte_limit_counts_replaced_entries_once():
+    cache = LLMResponseCache(":memory:", max_bytes=100)
+    for _ in range(10):
+        cache.store("m", 0, "same prompt", "y" * 40)  # replacing an entry doesn't grow the total
+    cache.store("m", 0, "other", "z" * 40)
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 0
+
+    cache.store("m", 0, "third", "w" * 40)
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+    assert cache._totals() == (cache._rows, cache._bytes) == (2, 80)
+
+
+def test_cache_path_expands_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("LLM_CACHE", "1")
+    monkeypatch.setenv("LLM_CACHE_PATH", "~/cache/llm.sqlite3")
+    monkeypatch.setattr(llm_cache, "_default_cache", None)
+
+    cache = llm_cache.get_default_cache()
+    assert cache.path == os.path.join(str(tmp_path), "cache", "llm.sqlite3")
+    assert os.path.isdir(tmp_path / "cache")
+    assert cache.cache_nonzero_temperature
@@ -0,0 +1,112 @@
+"""
+Career Pivot Navigator - LLM Call Tests
+Sync, async, streamed and batched paths through llm_calls agree
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.prompts import PromptTemplate
+
+from analyze import CareerPivotAnalyzer
+from fake_llm import FakePivotChatModel
+from llm_cache import LLMResponseCache
+from llm_calls import abatch_chain, ainvoke_chain, astream_chain, batch_chain, invoke_chain, stream_chain
+from plan_generator import PivotPlanGenerator
+
+PROFILE = {
+    "name": "Ana",
+    "current_role": "Customer Service Rep",
+    "skills": "communication, empathy, research",
+    "hates": "low pay, angry customers",
+    "interests": "tech, writing",
+}
+TARGET = {"id": "ux_researcher", "title": "UX Researcher"}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    return FakePivotChatModel()
+
+
+@pytest.fixture
+def chain(llm):
+    chain = PromptTemplate.from_template("Target role: {role}\nSuggest a pivot for {name}.") | llm
+    chain.name = "test_chain"
+    return chain
+
+
+def test_async_invoke_matches_sync(chain):
+    variables = {"role": "UX Researcher", "name": "Ana"}
+    assert asyncio.run(ainvoke_chain(chain, variables)) == invoke_chain(chain, variables)
+
+
+def test_async_batch_matches_sync(chain):
+    variables_list = [{"role": role, "name": "Ana"} for role in ("Writer", "Analyst", "Writer", "Coach")]
+    expected = [invoke_chain(chain, variables) for variables in variables_list]
+    assert batch_chain(chain, variables_list, max_concurrency=2) == expected
+    assert asyncio.run(abatch_chain(chain, variables_list, max_concurrency=2)) == expected
+
+
+def test_async_analyzer_matches_sync(llm):
+    analyzer = CareerPivotAnalyzer(llm=llm)
+    assert asyncio.run(analyzer.aanalyze_pivot(PROFILE)) == analyzer.analyze_pivot(PROFILE)
+    assert asyncio.run(analyzer.aextract_skills(PROFILE)) == analyzer.extract_skills(PROFILE)
+
+    career_id = analyzer.career_map["careers"][0]["id"]
+    assert (asyncio.run(analyzer.agenerate_3_step_plan(PROFILE, career_id))
+            == analyzer.generate_3_step_plan(PROFILE, career_id))
+
+
+def test_async_plan_generator_matches_sync(llm):
+    generator = PivotPlanGenerator(llm=llm)
+
+    async def run_all():
+        return await asyncio.gather(
+            generator.agenerate_monetization_strategy(PROFILE, TARGET),
+            generator.agenerate_resume_reframe(PROFILE, TARGET),
+            generator.agenerate_mindset_coaching(PROFILE),
+        )
+
+    assert asyncio.run(run_all()) == [
+        generator.generate_monetization_strategy(PROFILE, TARGET),
+        generator.generate_resume_reframe(PROFILE, TARGET),
+        generator.generate_mindset_coaching(PROFILE),
+    ]
+
+
+def test_stream_matches_invoke(chain):
+    variables = {"role": "UX Researcher", "name": "Ana"}
+    tokens = []
+    text = stream_chain(chain, variables, tokens.append)
+    assert text == invoke_chain(chain, variables)
+    assert len(tokens) > 1 and "".join(tokens) == text
+
+    atokens = []
+    assert asyncio.run(astream_chain(chain, variables, atokens.append)) == text
+    assert atokens == tokens
+
+
+def test_stream_cache_hit_arrives_in_one_piece(chain):
+    variables = {"role": "UX Researcher", "name": "Ana"}
+    cache = LLMResponseCache(":memory:")
+    text = invoke_chain(chain, variables, cache)
+    tokens = []
+    assert stream_chain(chain, variables, tokens.append, cache) == text
+    assert tokens == [text]
+
+
+def test_streamed_analysis_and_plan_match_invoke(llm):
+    analyzer = CareerPivotAnalyzer(llm=llm)
+    tokens = []
+    streamed = analyzer.analyze_pivot(PROFILE, on_token=tokens.append)
+    assert streamed == analyzer.analyze_pivot(PROFILE)
+    assert "".join(tokens) == streamed["analysis"]
+
+    generator = PivotPlanGenerator(llm=llm)
+    plan_tokens = []
+    plan = generator.generate_3_step_plan(PROFILE, TARGET, on_token=plan_tokens.append)
+    expected = generator.generate_3_step_plan(PROFILE, TARGET)
+    assert "".join(plan_tokens) == plan["plan_text"] == expected["plan_text"]
+    assert plan["steps"] == expected["steps"]
@@ -0,0 +1,66 @@
+"""
+Career Pivot Navigator - LLM Client Registry Tests
+Reuse and keying of the shared chat models in llm_clients
+"""
+
+import pytest
+
+import llm_clients
+from llm_clients import clear_chat_models, get_chat_model
+
+
+@pytest.fixture(autouse=True)
+def fake_backend(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    for name in ("LLM_CASSETTE", "LLM_CASSETTE_MODE", "OPENAI_BASE_URL", "OPENAI_API_BASE"):
+        monkeypatch.delenv(name, raising=False)
+    clear_chat_models()
+    yield
+    clear_chat_models()
+
+
+def test_same_key_returns_the_same_client():
+    first = get_chat_model("gpt-4o", 0.7)
+    assert get_chat_model("gpt-4o", 0.7) is first
+    assert get_chat_model() is first
+    assert len(llm_clients._clients) == 1
+
+
+@pytest.mark.parametrize("model, temperature, base_url", [
+    ("gpt-4o-mini", 0.7, None),
+    ("gpt-4o", 0.0, None),
+    ("gpt-4o", None, None),
+    ("gpt-4o", 0.7, "http://localhost:8000/v1"),
+])
+def test_each_key_part_gets_its_own_client(model, temperature, base_url):
+    default = get_chat_model("gpt-4o", 0.7)
+    other = get_chat_model(model, temperature, base_url)
+    assert other is not default
+    assert get_chat_model(model, temperature, base_url) is other
+    assert other.temperature == temperature
+
+
+def test_base_url_from_the_environment_is_part_of_the_key(monkeypatch):
+    default = get_chat_model()
+    monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:8000/v1")
+    assert get_chat_model() is not default
+    assert get_chat_model(base_url="http://localhost:8000/v1") is get_chat_model()
+
+
+def test_backend_and_cassette_are_part_of_the_key(monkeypatch, tmp_path):
+    fake = get_chat_model()
+    monkeypatch.setenv("LLM_CASSETTE", str(tmp_path / "traffic.jsonl.gz"))
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "record")
+    recording = get_chat_model()
+    assert recording is not fake
+    assert get_chat_model() is recording
+    assert set(key[:2] for key in llm_clients._clients) == {
+        ("fake", None), ("fake", str(tmp_path / "traffic.jsonl.gz"))
+    }
+
+
+def test_clear_drops_the_registry():
+    first = get_chat_model()
+    clear_chat_models()
+    assert not llm_clients._clients
+    assert get_chat_model() is not first
@@ -0,0 +1,90 @@
+"""
+Career Pivot Navigator - LLM Metrics Tests
+Token counting, cost, latency percentiles and prompt-section shares in llm_metrics
+"""
+
+import sys
+
+import pytest
+
+import llm_metrics
+from llm_metrics import LLMMetrics, count_tokens, price_for
+
+
+@pytest.fixture
+def no_tiktoken(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tiktoken", None)  # import tiktoken now raises ImportError
+    monkeypatch.setattr(llm_metrics, "_encodings", {})
+
+
+def test_token_count_falls_back_to_four_characters_per_token(no_tiktoken):
+    assert count_tokens("") == 0
+    assert count_tokens("hi") == 1
+    assert count_tokens("x" * 400) == 100
+    assert llm_metrics._encodings == {"gpt-4o": None}
+
+
+def test_token_count_with_tiktoken(monkeypatch):
+    pytest.importorskip("tiktoken")
+    monkeypatch.setattr(llm_metrics, "_encodings", {})
+    if llm_metrics._encoding("gpt-4o") is None:
+        pytest.skip("tiktoken encoding data is not available offline")
+    assert count_tokens("hello world") == 2
+    # Unknown models fall back to o200k_base rather than failing
+    assert count_tokens("hello world", "cassette:gpt-4o") == 2
+
+
+def test_prices_match_by_longest_prefix():
+    assert price_for("gpt-4o-mini-2024-07-18") == (0.15, 0.60)
+    assert price_for("gpt-4o-2024-08-06") == (2.50, 10.00)
+    assert price_for("fake-gpt-4o") == (0.0, 0.0)
+
+
+def test_per_chain_aggregates():
+    metrics = LLMMetrics()
+    for i, latency in enumerate([0.1 * n for n in range(1, 21)]):
+        metrics.record("plan_prompt", "gpt-4o", "prompt", {}, "response", latency,
+                       usage=(1000, 200), cached=(i == 0), coalesced=(i == 1))
+    metrics.record("skill_prompt", "gpt-4o-mini", "prompt", {}, "response", 0.5, usage=(100, 50))
+
+    summary = metrics.summary()
+    plan = summary["plan_prompt"]
+    assert (plan["calls"], plan["cached"], plan["coalesced"], plan["estimated_tokens"]) == (20, 1, 1, 0)
+    assert (plan["prompt_tokens"], plan["completion_tokens"]) == (20000, 4000)
+    assert plan["avg_prompt_tokens"] == 1000 and plan["avg_completion_tokens"] == 200
+    # Cached and coalesced calls are free: 18 paid calls at $2.50 / $10 per 1M tokens
+    assert plan["cost_usd"] == pytest.approx(18 * (1000 * 2.50 + 200 * 10.00) / 1e6)
+    assert plan["latency_avg"] == pytest.approx(1.05)
+    assert plan["latency_p50"] == pytest.approx(1.1)
+    assert plan["latency_p95"] == pytest.approx(2.0)
+    assert summary["skill_prompt"]["cost_usd"] == pytest.approx((100 * 0.15 + 50 * 0.60) / 1e6)
+    assert metrics.average_completion_tokens("plan_prompt") == 200
+    assert metrics.average_completion_tokens("unseen", default=42.0) == 42.0
+
+
+def test_section_shares(no_tiktoken):
+    metrics = LLMMetrics()
+    variables = {"context": "c" * 400, "skills": "s" * 40}
+    prompt = "Intro text. " * 10 + variables["context"] + variables["skills"]  # 120 + 440 characters
+    for _ in range(2):
+        metrics.record("pivot_prompt", "gpt-4o", prompt, variables, "r" * 80, 1.0)
+
+    plan = metrics.summary()["pivot_prompt"]
+    assert plan["estimated_tokens"] == 2
+    assert (plan["avg_prompt_tokens"], plan["avg_completion_tokens"]) == (140, 20)
+    assert metrics.section_sizes() == {"pivot_prompt": {"context": 100, "(template)": 30, "skills": 10}}
+
+    report = metrics.report()
+    assert "pivot_prompt" in report
+    assert "context                   100    71%" in report
+    assert "(template)                 30    21%" in report
+    assert "skills                     10     7%" in report
+
+
+def test_report_and_reset():
+    metrics = LLMMetrics()
+    assert metrics.report() == "No LLM calls recorded."
+    metrics.record("plan_prompt", "gpt-4o", "p", {}, "r", 0.2, usage=(10, 5), coalesced=True)
+    assert "Single-flight: 1 calls shared an identical in-flight request" in metrics.report()
+    metrics.reset()
+    assert metrics.summary() == {}
@@ -0,0 +1,132 @@
+"""
+Career Pivot Navigator - Main Entry Point Tests
+Plan call scheduling and the Streamlit helpers in main
+"""
+
+import json
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+import pipeline
+from llm_clients import clear_chat_models
+from main import call_result, running_in_streamlit, schedule_plan_calls, streamlit_cached_calls
+from utils import normalize_input_dict
+
+USER = {"name": "Ana", "current_role": "Teacher", "skills": ["writing"]}
+CAREERS = [{"id": "writer", "title": "Writer"}, {"id": "coach", "title": "Coach"},
+           {"id": "writer", "title": "Writer"}, {"id": "analyst", "title": "Analyst"}]
+
+
+class RecordingPlanGenerator:
+    """Stands in for PivotPlanGenerator and counts the calls it gets."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.streamed = []
+        self._lock = threading.Lock()
+
+    def _record(self, *key):
+        with self._lock:
+            self.calls[key] += 1
+
+    def generate_3_step_plan(self, user_data, career, on_token=None):
+        self._record("plan", career["id"])
+        if on_token:
+            self.streamed.append(career["id"])
+            on_token(f"plan for {career['id']}")
+        return f"plan for {career['id']}"
+
+    def generate_monetization_strategy(self, user_data, career):
+        self._record("monetization", career["id"])
+        return f"money for {career['id']}"
+
+    def generate_mindset_coaching(self, user_data):
+        self._record("coaching")
+        return f"coaching for {user_data['name']}"
+
+    def generate_pivot_bundle(self, user_data, career):
+        self._record("bundle", career["id"])
+        return {"plan": f"plan for {career['id']}", "monetization": f"money for {career['id']}",
+                "coaching": f"coaching for {user_data['name']}"}
+
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_identical_calls_share_one_future(pool, monkeypatch):
+    monkeypatch.setattr(main, "PIVOT_BUNDLE", False)
+    plan_gen, tokens = RecordingPlanGenerator(), []
+    scheduled = schedule_plan_calls(pool, plan_gen, USER, CAREERS, on_token=tokens.append)
+
+    assert len(scheduled) == len(CAREERS)
+    assert scheduled[0]["plan"] is scheduled[2]["plan"]
+    assert scheduled[0]["monetization"] is scheduled[2]["monetization"]
+    assert len({id(calls["coaching"]) for calls in scheduled}) == 1
+
+    for calls, career in zip(scheduled, CAREERS):
+        assert call_result(calls, "plan") == f"plan for {career['id']}"
+        assert call_result(calls, "monetization") == f"money for {career['id']}"
+        assert call_result(calls, "coaching") == "coaching for Ana"
+
+    assert set(plan_gen.calls.values()) == {1}
+    assert plan_gen.calls[("coaching",)] == 1
+    assert len(plan_gen.calls) == 3 + 3 + 1  # three distinct careers, plan and money each, one coaching
+    assert plan_gen.streamed == ["writer"] and tokens == ["plan for writer"]
+
+
+def test_bundle_mode_schedules_one_call_per_career(pool, monkeypatch):
+    monkeypatch.setattr(main, "PIVOT_BUNDLE", True)
+    plan_gen = RecordingPlanGenerator()
+    scheduled = schedule_plan_calls(pool, plan_gen, USER, CAREERS, on_token=lambda token: None)
+
+    assert [list(calls) for calls in scheduled] == [["bundle"]] * len(CAREERS)
+    assert scheduled[0]["bundle"] is scheduled[2]["bundle"]
+    assert [call_result(calls, "plan") for calls in scheduled] == [f"plan for {c['id']}" for c in CAREERS]
+    assert plan_gen.calls == Counter({("bundle", "writer"): 1, ("bundle", "coach"): 1, ("bundle", "analyst"): 1})
+    assert not plan_gen.streamed
+
+
+def test_instant_results_feed_analyze_pivot_outside_streamlit(monkeypatch):
+    st = pytest.importorskip("streamlit")
+    from analyze import CareerPivotAnalyzer
+
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("LLM_CACHE", "0")
+    clear_chat_models()
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    assert not running_in_streamlit()
+
+    profile = {"name": "Ana", "current_role": "Customer Service Rep", "skills": "communication, research",
+               "hates": "low pay", "interests": "tech, writing", "remote_preference": "high"}
+    key = json.dumps(normalize_input_dict(profile), sort_keys=True)
+    get_analyzer, get_plan_generator, instant_results = streamlit_cached_calls(st)
+    assert get_analyzer() is get_analyzer()
+    expected = get_analyzer().analyze_pivot(profile)
+
+    instant_calls = []
+    real_instant_analysis = CareerPivotAnalyzer.instant_analysis
+
+    def counting_instant_analysis(self, user_data):
+        instant_calls.append(user_data)
+        return real_instant_analysis(self, user_data)
+
+    monkeypatch.setattr(CareerPivotAnalyzer, "instant_analysis", counting_instant_analysis)
+    matches = instant_results(key, profile)
+    assert instant_results(key, profile) == matches
+    assert len(instant_calls) == 1
+
+    def recomputed(*args, **kwargs):
+        raise AssertionError("matches were recomputed")
+
+    monkeypatch.setattr(pipeline, "find_matching_careers", recomputed)
+    monkeypatch.setattr(pipeline, "estimate_pivot_difficulty_batch", recomputed)
+    assert get_analyzer().analyze_pivot(profile, instant=matches) == expected
+    clear_chat_models()
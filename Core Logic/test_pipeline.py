@@ -0,0 +1,94 @@
+"""
+Career Pivot Navigator - Analysis Pipeline Tests
+Stage outputs, stop_after and precomputed artifacts in pipeline.PivotPipeline
+"""
+
+import asyncio
+
+import pytest
+
+import pipeline
+from analyze import CareerPivotAnalyzer
+from fake_llm import FakePivotChatModel
+from pipeline import PivotPipeline
+
+PROFILE = {
+    "name": "Ana",
+    "current_role": "Customer Service Rep",
+    "skills": "communication, empathy, research",
+    "hates": "low pay, angry customers",
+    "interests": "tech, writing",
+    "remote_preference": "high",
+}
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    return CareerPivotAnalyzer(llm=FakePivotChatModel())
+
+
+@pytest.fixture
+def match_calls(monkeypatch):
+    calls = []
+    real_find_matching_careers = pipeline.find_matching_careers
+
+    def counting_find_matching_careers(*args, **kwargs):
+        calls.append(args)
+        return real_find_matching_careers(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "find_matching_careers", counting_find_matching_careers)
+    return calls
+
+
+def test_every_stage_runs_once(analyzer, match_calls):
+    artifacts = analyzer.pipeline.run(PROFILE)
+    assert len(match_calls) == 1
+    assert artifacts["user_data"]["skills"] == ["communication", "empathy", "research"]
+    ids = [career["id"] for career in artifacts["matched_careers"]]
+    assert ids and set(artifacts["difficulty"]) == set(ids)
+    assert all(career["title"] in artifacts["context"] for career in artifacts["matched_careers"])
+    assert artifacts["analysis"]
+
+
+@pytest.mark.parametrize("stop_after", PivotPipeline.STAGES)
+def test_stop_after(analyzer, stop_after):
+    artifacts = analyzer.pipeline.run(PROFILE, stop_after=stop_after)
+    done = PivotPipeline.STAGES[:PivotPipeline.STAGES.index(stop_after) + 1]
+    for stage in PivotPipeline.STAGES:
+        assert (PivotPipeline.STAGE_OUTPUTS[stage] in artifacts) == (stage in done)
+
+
+def test_stop_after_skips_the_llm():
+    analyzer = CareerPivotAnalyzer(offline=True)
+    artifacts = analyzer.pipeline.run(PROFILE, stop_after="context")
+    assert "context" in artifacts and "analysis" not in artifacts
+    with pytest.raises(RuntimeError):
+        analyzer.pipeline.run(PROFILE)
+
+
+def test_unknown_stage(analyzer):
+    with pytest.raises(ValueError, match="Unknown pipeline stage"):
+        analyzer.pipeline.run(PROFILE, stop_after="matching")
+    with pytest.raises(ValueError):
+        asyncio.run(analyzer.pipeline.arun(PROFILE, stop_after="llm"))
+
+
+def test_precomputed_artifacts_are_not_recomputed(analyzer, match_calls):
+    early = analyzer.pipeline.run(PROFILE, stop_after="difficulty")
+    assert len(match_calls) == 1
+
+    finished = analyzer.pipeline.run(PROFILE, artifacts=early)
+    assert len(match_calls) == 1
+    assert finished["matched_careers"] is early["matched_careers"]
+    assert finished["analysis"] == analyzer.pipeline.run(PROFILE)["analysis"]
+    assert "analysis" not in early
+
+
+def test_async_run_matches_sync(analyzer):
+    sync = analyzer.pipeline.run(PROFILE)
+    tokens = []
+    streamed = asyncio.run(analyzer.pipeline.arun(PROFILE, on_token=tokens.append))
+    for key in PivotPipeline.STAGE_OUTPUTS.values():
+        assert streamed[key] == sync[key]
+    assert "".join(tokens) == sync["analysis"]
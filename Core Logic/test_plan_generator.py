@@ -0,0 +1,85 @@
+"""
+Career Pivot Navigator - Plan Generator Tests
+Step parsing and pivot bundle shaping in plan_generator.PivotPlanGenerator
+"""
+
+import json
+import random
+
+import pytest
+
+from fake_llm import FakePivotChatModel, canned_steps
+from plan_generator import PivotPlanGenerator
+
+CAREER = {"id": "ux_researcher", "title": "UX Researcher"}
+
+
+@pytest.fixture
+def plan_gen(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "0")
+    return PivotPlanGenerator(llm=FakePivotChatModel())
+
+
+def bundle_json(steps):
+    return json.dumps({"steps": steps, "monetization": "Freelance audits.", "coaching": "You can do this."})
+
+
+def test_bundle_steps_come_from_the_validated_bundle(plan_gen):
+    steps = canned_steps(random.Random(7))
+    bundle = plan_gen.build_bundle(CAREER, bundle_json(steps))
+    plan = bundle["plan"]
+
+    assert plan["steps"] == [{"step_number": i, **step} for i, step in enumerate(steps, 1)]
+    assert list(plan["steps"][0]) == list(plan_gen.create_step(1, "")), "same keys as parsed steps"
+    assert bundle["monetization"] == "Freelance audits."
+    assert bundle["coaching"] == "You can do this."
+    # The rendered text is for display, in the layout the step plan prompt asks for
+    assert plan["plan_text"].count("STEP TITLE:") == 3
+    assert all(step["title"] in plan["plan_text"] for step in steps)
+
+
+def test_bundle_values_with_markers_line_breaks_and_colons(plan_gen):
+    steps = canned_steps(random.Random(3))
+    steps[0]["title"] = "Phase 1: Research"
+    steps[0]["action"] = "Interview three people\nwho already do the job."
+    steps[1]["action"] = "Learn the STEP-BY-STEP WHY behind each ACTION and TIME estimate."
+    steps[1]["success_metric"] = "SUCCESS: two RESOURCES shipped"
+    bundle = plan_gen.build_bundle(CAREER, bundle_json(steps))
+
+    assert bundle["plan"]["steps"] == [{"step_number": i, **step} for i, step in enumerate(steps, 1)]
+
+
+def test_bundle_prompt_lists_fields_without_a_schema(plan_gen):
+    profile = {"name": "Ana", "current_role": "Teacher", "skills": ["writing"], "hates": ["grading"]}
+    prompt = plan_gen.bundle_prompt.format(**plan_gen.bundle_inputs(profile, CAREER))
+    assert "$defs" not in prompt and '"properties"' not in prompt
+    for field in ("steps", "time_estimate", "success_metric", "monetization", "coaching"):
+        assert field in prompt
+
+
+def test_fake_bundle_round_trip(plan_gen):
+    profile = {"name": "Ana", "current_role": "Teacher", "skills": ["writing"], "hates": ["grading"]}
+    bundle = plan_gen.generate_pivot_bundle(profile, CAREER)
+    assert len(bundle["plan"]["steps"]) == 3
+    assert bundle["coaching"].startswith("**Permission slip**")  # the bundle, not the fallback calls
+
+
+def test_step_plan_layout_from_the_prompt_is_parsed(plan_gen):
+    text = (
+        "STEP TITLE: Build a portfolio\n"
+        "ACTION:\nRedesign two onboarding flows\nand write them up.\n"
+        "TIME:\n3 weeks at 5 hrs/week\n"
+        "RESOURCES:\n- Figma free tier\n- Google UX course\n"
+        "WHY:\nHiring managers want evidence.\n"
+        "SUCCESS:\nTwo public case studies."
+    )
+    step = plan_gen.build_plan(CAREER, text)["steps"][0]
+    assert step == {
+        "step_number": 1,
+        "title": "Build a portfolio",
+        "action": "Redesign two onboarding flows and write them up.",
+        "time_estimate": "3 weeks at 5 hrs/week",
+        "resources": ["Figma free tier", "Google UX course"],
+        "rationale": "Hiring managers want evidence.",
+        "success_metric": "Two public case studies.",
+    }
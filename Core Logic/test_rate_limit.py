@@ -0,0 +1,267 @@
+"""
+Career Pivot Navigator - Rate Limiter Tests
+Slot accounting, AIMD window and retries in rate_limit.RateLimiter
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rate_limit import RateLimiter, is_retryable, retry_after_seconds
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    """Stands in for a provider SDK error carrying an HTTP response."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = _Response(status_code, headers)
+
+
+def limiter(**kwargs) -> RateLimiter:
+    kwargs.setdefault("base_backoff", 0.001)
+    return RateLimiter(**kwargs)
+
+
+def test_timed_out_async_calls_free_their_slots():
+    rl = limiter(max_concurrency=2, initial_concurrency=2)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def fast():
+        return "ok"
+
+    async def go():
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(rl.acall(slow), 0.01)
+        return await asyncio.wait_for(rl.acall(fast), 1)
+
+    assert asyncio.run(go()) == "ok"
+    assert rl.in_flight == 0
+    assert rl.concurrency > 2 - 1e-9  # cancellations don't shrink the window
+    assert rl.stats["failures"] == 0
+
+
+def test_interrupted_sync_call_frees_its_slot():
+    rl = limiter(max_concurrency=1, initial_concurrency=1)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        rl.call(interrupted)
+    assert rl.in_flight == 0
+    assert rl.stats["retries"] == 0
+    assert rl.call(lambda: "ok") == "ok"
+
+
+def test_window_halves_once_per_burst_and_recovers():
+    rl = limiter(max_concurrency=16, initial_concurrency=8)
+    admitted = [rl._acquire(0) for _ in range(8)]
+    for when in admitted:
+        rl._release(0, when, FakeAPIError(429))
+    assert rl.concurrency == 4  # one burst of 429s from the same window: one halving
+    assert rl.stats["throttled"] == 8
+
+    # A 429 for a call admitted after the decrease halves it again
+    rl._release(0, rl._acquire(0), FakeAPIError(429))
+    assert rl.concurrency == 2
+
+    for _ in range(20):
+        rl._release(0, rl._acquire(0), None)
+    assert 6 <= rl.concurrency <= 7  # additive increase: about +1 per window of successes
+    assert rl.in_flight == 0
+
+
+def test_window_never_exceeds_its_ceiling():
+    rl = limiter(max_concurrency=3, initial_concurrency=3)
+    for _ in range(50):
+        rl.call(lambda: None)
+    assert rl.concurrency == 3
+
+
+def test_concurrent_calls_respect_the_window():
+    rl = limiter(max_concurrency=2, initial_concurrency=2)
+    peak = []
+    lock = threading.Lock()
+    running = [0]
+
+    def fn():
+        with lock:
+            running[0] += 1
+            peak.append(running[0])
+        threading.Event().wait(0.01)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=rl.call, args=(fn,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert max(peak) <= 2
+    assert rl.in_flight == 0
+
+
+def test_rate_limited_call_is_retried_after_retry_after():
+    rl = limiter()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeAPIError(429, {"retry-after-ms": "5"})
+        return "ok"
+
+    assert rl.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert rl.stats["retries"] == 2
+    assert rl.in_flight == 0
+
+
+def test_client_errors_are_not_retried():
+    rl = limiter()
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        rl.call(bad_request)
+    assert len(attempts) == 1
+    assert rl.stats["failures"] == 1
+    assert rl.in_flight == 0
+
+
+def test_stream_is_not_retried_once_it_has_started():
+    rl = limiter()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise FakeAPIError(429)
+
+    with pytest.raises(FakeAPIError):
+        rl.call(fn, can_retry=lambda: False)
+    assert len(attempts) == 1
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds(FakeAPIError(429, {"retry-after": "2"})) == 2
+    assert retry_after_seconds(FakeAPIError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(FakeAPIError(429)) is None
+    assert is_retryable(FakeAPIError(529))
+    assert not is_retryable(FakeAPIError(404))
+
+
+class APIConnectionError(Exception):
+    """Named like the OpenAI SDK's error, which the limiter matches by class name."""
+
+
+class APITimeoutError(APIConnectionError):
+    pass
+
+
+def test_network_failures_and_server_errors_are_retried():
+    assert is_retryable(FakeAPIError(500))
+    assert is_retryable(FakeAPIError(502))
+    assert is_retryable(APIConnectionError("connection reset"))
+    assert is_retryable(APITimeoutError("timed out"))
+    assert not is_retryable(ValueError("bad prompt"))
+
+    rl = limiter()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise APITimeoutError("timed out")
+        if len(attempts) == 2:
+            raise FakeAPIError(502)
+        return "ok"
+
+    assert rl.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert rl.concurrency > rl.max_concurrency // 4  # only 429s shrink the window
+
+
+class CountingLimiter(RateLimiter):
+    """Counts admission attempts, to tell waiting from polling."""
+
+    attempts = 0
+
+    def _try_acquire(self, tokens):
+        self.attempts += 1
+        return super()._try_acquire(tokens)
+
+
+def test_full_window_waits_for_a_release_instead_of_polling():
+    rl = CountingLimiter(max_concurrency=1, initial_concurrency=1)
+    release, admitted = threading.Event(), []
+    holder = threading.Thread(target=rl.call, args=(release.wait,))
+    holder.start()
+    while rl.in_flight == 0:
+        time.sleep(0.001)
+
+    waiter = threading.Thread(target=lambda: admitted.append(rl.call(lambda: "second")))
+    waiter.start()
+    waiter.join(0.3)
+    assert not admitted
+    assert rl.attempts <= 3  # the holder's admission, then one failed try by the waiter
+
+    release.set()
+    waiter.join(1)
+    holder.join(1)
+    assert admitted == ["second"]
+    assert rl.in_flight == 0
+
+
+def test_async_callers_are_woken_by_a_release_from_another_thread():
+    rl = CountingLimiter(max_concurrency=1, initial_concurrency=1)
+    release = threading.Event()
+    holder = threading.Thread(target=rl.call, args=(release.wait,))
+    holder.start()
+    while rl.in_flight == 0:
+        time.sleep(0.001)
+
+    async def second():
+        return await rl.acall(lambda: asyncio.sleep(0, result="second"))
+
+    async def main():
+        task = asyncio.ensure_future(second())
+        await asyncio.sleep(0.3)
+        assert not task.done()
+        assert rl.attempts <= 3
+        release.set()
+        return await asyncio.wait_for(task, 1)
+
+    assert asyncio.run(main()) == "second"
+    holder.join(1)
+    assert rl.in_flight == 0 and not rl._async_waiters
+
+
+def test_cancelled_async_waiter_is_forgotten():
+    rl = limiter(max_concurrency=1, initial_concurrency=1)
+
+    async def main():
+        holder = asyncio.ensure_future(rl.acall(lambda: asyncio.sleep(0.2)))
+        await asyncio.sleep(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(rl.acall(lambda: asyncio.sleep(0)), 0.05)
+        assert not rl._async_waiters
+        await holder
+
+    asyncio.run(main())
+    assert rl.in_flight == 0
@@ -0,0 +1,114 @@
+"""
+Career Pivot Navigator - Scoring Tests
+Weights, remote fit and top-k selection in scoring.rank_careers
+"""
+
+import random
+
+import pytest
+
+from benchmark import make_synthetic_catalog
+from career_index import get_career_index
+from scoring import DEFAULT_MATCH_WEIGHTS, REMOTE_FIT, rank_careers
+
+
+def career(career_id, skills=(), pains=(), remote=False, trend=0.5, title=None):
+    return {
+        "id": career_id,
+        "title": title or career_id.replace("_", " ").title(),
+        "required_skills": list(skills),
+        "friendly_skills": [],
+        "good_for_pain": list(pains),
+        "remote": remote,
+        "trend_relevance": trend,
+    }
+
+
+def catalog(*careers):
+    skill_mappings, pain_solutions = {}, {}
+    for c in careers:
+        for skill in c["required_skills"]:
+            skill_mappings.setdefault(skill, []).append(c["id"])
+        for pain in c["good_for_pain"]:
+            pain_solutions.setdefault(pain, []).append(c["id"])
+    return {"careers": list(careers), "skill_mappings": skill_mappings, "pain_point_solutions": pain_solutions}
+
+
+def ranked_ids(career_map, *args, **kwargs):
+    index = get_career_index(career_map)
+    return [index.careers[ordinal]["id"] for _, ordinal in rank_careers(index, *args, **kwargs)]
+
+
+def test_default_weights_sum_to_one():
+    assert sum(DEFAULT_MATCH_WEIGHTS.values()) == pytest.approx(1.0)
+    assert set(REMOTE_FIT) == {"high", "medium", "low"}
+
+
+def test_custom_weights_change_the_order():
+    career_map = catalog(
+        career("analyst", skills=["sql", "excel"]),
+        career("coach", skills=["sql"], pains=["low_pay"]),
+    )
+    args = (["sql", "excel"], ["low pay"])
+    # Defaults: analyst 0.35 * 1 = 0.35, coach 0.35 * 0.5 + 0.30 * 1 = 0.475
+    assert ranked_ids(career_map, *args) == ["coach", "analyst"]
+    assert ranked_ids(career_map, *args, weights={"skills": 0.1, "pain_points": 0.9}) == ["coach", "analyst"]
+    assert ranked_ids(career_map, *args, weights={"skills": 0.9, "pain_points": 0.0}) == ["analyst", "coach"]
+
+
+def test_scores_follow_the_weighted_formula():
+    career_map = catalog(career("writer", skills=["writing", "editing"], pains=["no_creativity"],
+                                remote=True, trend=0.8))
+    index = get_career_index(career_map)
+    [(score, _)] = rank_careers(index, ["writing", "sql"], ["no creativity", "low pay"],
+                                interests=["writer"], remote_preference="high")
+    w = DEFAULT_MATCH_WEIGHTS
+    expected = w["skills"] * 0.5 + w["pain_points"] * 0.5 + w["interests"] * 1 + w["remote"] * 1 + w["trend"] * 0.8
+    assert score == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("preference, expected", [
+    ("high", ["remote_job", "office_job"]),
+    ("medium", ["remote_job", "office_job"]),
+    ("low", ["office_job", "remote_job"]),   # no preference: tie, catalog order
+    (None, ["office_job", "remote_job"]),
+    ("unknown", ["office_job", "remote_job"]),
+])
+def test_remote_preference(preference, expected):
+    career_map = catalog(
+        career("office_job", skills=["sql"], remote=False),
+        career("remote_job", skills=["sql"], remote=True),
+    )
+    assert ranked_ids(career_map, ["sql"], [], remote_preference=preference) == expected
+
+
+def test_remote_fit_values_reach_the_score():
+    career_map = catalog(career("office_job", skills=["sql"], remote=False, trend=0.0))
+    index = get_career_index(career_map)
+    w = DEFAULT_MATCH_WEIGHTS
+    for preference, (_, onsite_fit) in REMOTE_FIT.items():
+        [(score, _)] = rank_careers(index, ["sql"], [], remote_preference=preference)
+        assert score == pytest.approx(w["skills"] + w["remote"] * onsite_fit)
+
+
+def test_top_k_truncates():
+    career_map = catalog(*[career(f"job_{i}", skills=["sql"], trend=i / 10) for i in range(6)])
+    assert ranked_ids(career_map, ["sql"], [], top_k=3) == ["job_5", "job_4", "job_3"]
+    assert len(ranked_ids(career_map, ["sql"], [], top_k=10)) == 6
+    assert ranked_ids(career_map, ["sql"], [], top_k=0) == []
+    assert ranked_ids(career_map, ["nothing"], ["matches"]) == []
+
+
+def test_nlargest_agrees_with_a_full_sort():
+    index = get_career_index(make_synthetic_catalog(500, n_skills=25, n_pains=10))
+    rng = random.Random(1)
+    for _ in range(50):
+        skills = rng.sample([f"skill_{i}" for i in range(25)], rng.randint(0, 4))
+        pains = rng.sample([f"pain_{i}" for i in range(10)], rng.randint(0, 2))
+        remote = rng.choice(["high", "medium", "low", None])
+        everything = rank_careers(index, skills, pains, remote_preference=remote, top_k=len(index.careers))
+        # A stable full sort of every candidate (in ordinal order) by descending score
+        full = sorted(sorted(everything, key=lambda pair: pair[1]), key=lambda pair: -pair[0])
+        assert everything == full
+        for k in (1, 3, 10):
+            assert rank_careers(index, skills, pains, remote_preference=remote, top_k=k) == full[:k]
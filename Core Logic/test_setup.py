@@ -52,8 +52,8 @@ def test_setup():
     
     # Check 3: OpenAI API Key
     print("\n3. Checking OpenAI API Key...")
-    from dotenv import load_dotenv
-    load_dotenv()
+    from config import load_config
+    load_config()
     
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key and api_key.startswith("sk-"):
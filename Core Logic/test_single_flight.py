@@ -0,0 +1,166 @@
+"""
+Career Pivot Navigator - Single-Flight Tests
+Coalescing, shared errors and cancellation in single_flight.SingleFlight
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "answer"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", fn)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", fn))) for _ in range(5)]
+    for t in followers:
+        t.start()
+    while flight.stats["coalesced"] < 5:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("answer", False)] + [("answer", True)] * 5
+    assert flight.in_flight() == 0
+
+
+def test_leader_exception_reaches_every_follower():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise ValueError("provider down")
+
+    errors = []
+
+    def run():
+        try:
+            flight.do("key", fn)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=run)]
+    threads[0].start()
+    started.wait(5)
+    threads += [threading.Thread(target=run) for _ in range(3)]
+    for t in threads[1:]:
+        t.start()
+    while flight.stats["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert errors == ["provider down"] * 4
+    assert flight.stats["calls"] == 1
+
+
+def test_async_leader_exception_reaches_every_follower():
+    flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        raise ValueError("provider down")
+
+    async def go():
+        return await asyncio.gather(*[flight.ado("key", fn) for _ in range(4)], return_exceptions=True)
+
+    results = asyncio.run(go())
+    assert [str(r) for r in results] == ["provider down"] * 4
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats == {"calls": 1, "coalesced": 3}
+
+
+def test_cancelled_follower_leaves_the_flight_running():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "answer"
+
+    async def go():
+        leader = asyncio.ensure_future(flight.ado("key", fn))
+        await asyncio.sleep(0)
+        impatient = asyncio.ensure_future(asyncio.wait_for(flight.ado("key", fn), 0.01))
+        patient = asyncio.ensure_future(flight.ado("key", fn))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        return await leader, await patient
+
+    leader_result, follower_result = asyncio.run(go())
+    assert leader_result == ("answer", False)
+    assert follower_result == ("answer", True)
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+def test_cancelled_async_follower_does_not_strand_sync_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+    results = []
+
+    def sync_leader():
+        results.append(flight.do("key", lambda: release.wait(5) and "answer"))
+
+    async def go():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.ado("key", None), 0.01)
+
+    leader = threading.Thread(target=sync_leader)
+    leader.start()
+    while not flight.in_flight():
+        time.sleep(0.001)
+    follower = threading.Thread(target=lambda: results.append(flight.do("key", lambda: "again")))
+    follower.start()
+    asyncio.run(go())
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert sorted(results) == [("answer", False), ("answer", True)]
+    assert flight.stats["calls"] == 1
+
+
+def test_cancelled_leader_hands_the_call_to_a_follower():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def go():
+        leader = asyncio.ensure_future(flight.ado("key", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("key", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(go()) == ("answer", False)
+    assert len(calls) == 2
+    assert flight.in_flight() == 0
@@ -0,0 +1,110 @@
+"""
+Career Pivot Navigator - Utility Tests
+Pivot difficulty estimates and the shared career map loader in utils
+"""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from utils import (
+    FrozenDict, clear_career_map_cache, estimate_pivot_difficulty, find_career_map, load_career_map
+)
+
+CATALOG = {
+    "careers": [{
+        "id": "illustrator",
+        "title": "Illustrator",
+        "required_skills": ["art", "design", "Problem-Solving"],
+        "friendly_skills": ["painting", "drawing", "storytelling"],
+        "good_for_pain": [],
+    }],
+    "skill_mappings": {},
+    "pain_point_solutions": {},
+}
+
+
+def test_skills_match_whole_not_as_substrings():
+    # "art" is inside "start" and "smart", "design" inside "designated"
+    result = estimate_pivot_difficulty("Manager", "illustrator", ["start", "smart", "designated"], CATALOG)
+    assert result["skill_match_percentage"] == 0
+    assert result["difficulty"] == "high"
+    assert result["skills_to_develop"] == ["art", "design", "Problem-Solving"]
+
+
+def test_skills_match_across_case_and_separators():
+    result = estimate_pivot_difficulty("Manager", "illustrator", ["ART", "problem_solving"], CATALOG)
+    assert result["skill_match_percentage"] == 66
+    assert result["skills_to_develop"] == ["design"]
+
+
+def test_friendly_skills_count_but_percentage_is_capped():
+    skills = ["painting", "drawing", "storytelling", "art"]  # 4 matches against 3 required skills
+    result = estimate_pivot_difficulty("Manager", "illustrator", skills, CATALOG)
+    assert result["skill_match_percentage"] == 100
+    assert result["difficulty"] == "low"
+    assert result["skills_to_develop"] == ["design", "Problem-Solving"]
+
+
+def test_unknown_career():
+    assert estimate_pivot_difficulty("Manager", "astronaut", ["art"], CATALOG) == {
+        "difficulty": "unknown", "estimated_months": None
+    }
+
+
+@pytest.fixture
+def career_map_path(tmp_path):
+    path = str(tmp_path / "career_map.json")
+    shutil.copy(find_career_map(), path)
+    clear_career_map_cache()
+    yield path
+    clear_career_map_cache()
+
+
+def _bump_mtime(path: str):
+    later = time.time_ns() + 10 ** 9
+    os.utime(path, ns=(later, later))
+
+
+def test_career_map_is_shared_until_the_file_changes(career_map_path):
+    first = load_career_map(career_map_path)
+    assert load_career_map(career_map_path) is first
+
+    # Touched but unchanged: the content hash matches, so the same object comes back
+    _bump_mtime(career_map_path)
+    assert load_career_map(career_map_path) is first
+
+    with open(career_map_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["careers"][0]["title"] = "Edited Title"
+    with open(career_map_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    _bump_mtime(career_map_path)
+
+    edited = load_career_map(career_map_path)
+    assert edited is not first
+    assert edited["careers"][0]["title"] == "Edited Title"
+    assert first["careers"][0]["title"] != "Edited Title"
+    assert load_career_map(career_map_path) is edited
+
+
+def test_career_map_is_read_only(career_map_path):
+    career_map = load_career_map(career_map_path)
+    career = career_map["careers"][0]
+    assert isinstance(career_map, FrozenDict) and isinstance(career, FrozenDict)
+    assert isinstance(career_map["careers"], tuple)
+
+    with pytest.raises(TypeError):
+        career_map["careers"] = []
+    with pytest.raises(TypeError):
+        career["title"] = "Changed"
+    with pytest.raises(TypeError):
+        del career["id"]
+    with pytest.raises(TypeError):
+        career.update(title="Changed")
+    with pytest.raises(TypeError):
+        career.setdefault("new", 1)
+    assert load_career_map(career_map_path)["careers"][0]["title"] == career["title"]
@@ -3,38 +3,131 @@ Career Pivot Navigator - Utility Functions
 Helpers for formatting, validation, file I/O, and data processing
 """
 
+import hashlib
 import json
 import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import re
+from career_index import canonical_skill, get_career_index
+from scoring import rank_careers
+
+class FrozenDict(dict):
+    """Read-only dict handed out by the shared career map loader."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("career map data is shared and read-only; copy it before modifying")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze_json(value: Any) -> Any:
+    """Recursively convert parsed JSON into FrozenDicts and tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze_json(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze_json(v) for v in value)
+    return value
+
+
+# Parsed catalogs shared by every caller in this process, keyed by absolute path:
+# path -> (stat signature, sha256 of the file contents, frozen career map)
+_career_map_cache: Dict[str, Tuple[Tuple[int, int], str, Dict[str, Any]]] = {}
+_career_map_lock = threading.Lock()
+
+
+def find_career_map() -> Optional[str]:
+    """Return the first existing career_map.json (or compiled) location, or None."""
+    from compiled_catalog import compiled_path_for
+
+    # Try multiple possible locations
+    possible_paths = [
+        "career_map.json",
+        "../Data and Infrastructure/career_map.json",
+        os.path.join(os.path.dirname(__file__), "../Data and Infrastructure/career_map.json")
+    ]
+
+    for path in possible_paths:
+        if os.path.exists(path) or os.path.exists(compiled_path_for(path)):
+            return path
+
+    print(f"Error: career_map.json not found in any of these locations:")
+    for p in possible_paths:
+        print(f"  - {p}")
+    return None
+
 
 def load_career_map(filepath: str = None) -> Dict[str, Any]:
-    """Load the career mapping database."""
+    """Load the career mapping database.
+
+    The catalog is parsed once per process and every caller receives the same
+    read-only object. The file is only re-parsed when its mtime/size changes
+    and its content hash differs from the cached copy.
+
+    When a fresh compiled artifact (see compiled_catalog.py) sits next to the
+    JSON file, it is memory-mapped instead of parsing the JSON.
+    """
+    from compiled_catalog import CompiledCatalog, compiled_path_for, is_fresh, read_header
+
     if filepath is None:
-        # Try multiple possible locations
-        possible_paths = [
-            "career_map.json",
-            "../Data and Infrastructure/career_map.json",
-            os.path.join(os.path.dirname(__file__), "../Data and Infrastructure/career_map.json")
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                filepath = path
-                break
-        else:
-            print(f"Error: career_map.json not found in any of these locations:")
-            for p in possible_paths:
-                print(f"  - {p}")
+        filepath = find_career_map()
+        if filepath is None:
             return {}
-    
+
+    compiled = filepath if read_header(filepath) else compiled_path_for(filepath)
+    if compiled != filepath and not (os.path.exists(compiled) and is_fresh(compiled, filepath)):
+        compiled = None
+
+    key = os.path.abspath(compiled or filepath)
     try:
-        with open(filepath, "r") as f:
-            return json.load(f)
+        stat = os.stat(key)
     except FileNotFoundError:
         print(f"Error: {filepath} not found. Make sure career_map.json is accessible.")
         return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _career_map_lock:
+        cached = _career_map_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
+
+        if compiled:
+            digest = read_header(key)["source_sha256"]
+            if cached is not None and cached[1] == digest:
+                # Re-stamped or recompiled from the same source: same content
+                career_map = cached[2]
+            else:
+                career_map = CompiledCatalog(key)
+        else:
+            with open(key, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+
+            if cached is not None and cached[1] == digest:
+                # Touched but unchanged: keep handing out the same object
+                career_map = cached[2]
+            else:
+                career_map = freeze_json(json.loads(raw))
+
+        _career_map_cache[key] = (signature, digest, career_map)
+        return career_map
+
+
+def clear_career_map_cache():
+    """Forget every cached catalog so the next load re-reads from disk."""
+    with _career_map_lock:
+        _career_map_cache.clear()
 
 def parse_skill_input(skill_string: str) -> List[str]:
     """Parse comma or newline-separated skill input into a clean list."""
@@ -128,57 +221,31 @@ def export_to_notion_format(user_data: Dict[str, Any], analysis: str, plan: Dict
     return output
 
 def find_matching_careers(user_skills: List[str], pain_points: List[str], 
-                         career_map: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Find career matches based on user skills and pain points."""
-    matched_careers = []
-    skill_mappings = career_map.get("skill_mappings", {})
-    pain_solutions = career_map.get("pain_point_solutions", {})
-
-    # Find careers that match skills
-    skill_matches = set()
-    for skill in user_skills:
-        if skill.lower() in skill_mappings:
-            skill_matches.update(skill_mappings[skill.lower()])
-
-    # Find careers that solve pain points
-    pain_matches = set()
-    for pain in pain_points:
-        pain_key = pain.lower().replace(" ", "_")
-        if pain_key in pain_solutions:
-            pain_matches.update(pain_solutions[pain_key])
-
-    # Combine matches (prioritize careers that appear in both)
-    all_matches = skill_matches.union(pain_matches)
-
-    for career_id in all_matches:
-        for career in career_map.get("careers", []):
-            if career["id"] == career_id:
-                matched_careers.append(career)
-                break
-
-    # Sort by trend relevance
-    matched_careers.sort(key=lambda x: x.get("trend_relevance", 0), reverse=True)
-
-    return matched_careers[:3]  # Return top 3 matches
-
-def estimate_pivot_difficulty(current_role: str, target_career: str, 
-                             user_skills: List[str], career_map: Dict[str, Any]) -> Dict[str, Any]:
-    """Estimate difficulty and time-to-transition for the pivot."""
-    target = None
-    for career in career_map.get("careers", []):
-        if career["id"] == target_career:
-            target = career
-            break
-
-    if not target:
+                         career_map: Dict[str, Any], interests: Optional[List[str]] = None,
+                         remote_preference: Optional[str] = None, top_k: int = 3,
+                         weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Find career matches based on user skills and pain points.
+
+    Careers matching any skill or pain point are scored by skill overlap,
+    pain-point coverage, interests, remote fit and trend (see scoring.py),
+    and the top_k best are returned.
+    """
+    index = get_career_index(career_map)
+    ranked = rank_careers(index, user_skills, pain_points, interests=interests,
+                          remote_preference=remote_preference, top_k=top_k, weights=weights)
+    return [index.careers[ordinal] for _, ordinal in ranked]
+
+def _difficulty_for(index, career_id: str, user_skill_set: frozenset) -> Dict[str, Any]:
+    """Difficulty assessment for one career given the user's canonical skills."""
+    if career_id not in index:
         return {"difficulty": "unknown", "estimated_months": None}
 
-    # Simple heuristic: count matching skills
-    matches = sum(1 for skill in user_skills 
-                  if skill.lower() in str(target.get("friendly_skills", [])).lower())
+    # Count the user's skills the career asks for (required or friendly)
+    matches = len(user_skill_set & index.skill_set(career_id))
 
-    total_skills_needed = len(target.get("required_skills", []))
-    match_percentage = (matches / total_skills_needed * 100) if total_skills_needed > 0 else 0
+    required = index.required_skill_pairs(career_id)
+    total_skills_needed = len(required)
+    match_percentage = min(matches / total_skills_needed * 100, 100) if total_skills_needed > 0 else 0
 
     if match_percentage >= 70:
         difficulty = "low"
@@ -194,10 +261,26 @@ def estimate_pivot_difficulty(current_role: str, target_career: str,
         "difficulty": difficulty,
         "estimated_months": months,
         "skill_match_percentage": int(match_percentage),
-        "skills_to_develop": [s for s in target.get("required_skills", []) 
-                             if s.lower() not in str(user_skills).lower()]
+        "skills_to_develop": [s for s, canonical in required if canonical not in user_skill_set]
     }
 
+def estimate_pivot_difficulty(current_role: str, target_career: str, 
+                             user_skills: List[str], career_map: Dict[str, Any]) -> Dict[str, Any]:
+    """Estimate difficulty and time-to-transition for the pivot.
+
+    Skills are compared as whole canonical skills (see canonical_skill), so
+    "art" no longer matches inside "start".
+    """
+    user_skill_set = frozenset(canonical_skill(s) for s in user_skills)
+    return _difficulty_for(get_career_index(career_map), target_career, user_skill_set)
+
+def estimate_pivot_difficulty_batch(current_role: str, target_careers: List[str],
+                                    user_skills: List[str], career_map: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Estimate difficulty for every candidate career in one pass, keyed by career id."""
+    index = get_career_index(career_map)
+    user_skill_set = frozenset(canonical_skill(s) for s in user_skills)
+    return {career_id: _difficulty_for(index, career_id, user_skill_set) for career_id in target_careers}
+
 def normalize_input_dict(data: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize user input dictionary for consistent processing."""
     normalized = {}
@@ -214,18 +297,24 @@ def normalize_input_dict(data: Dict[str, Any]) -> Dict[str, Any]:
 
     return normalized
 
-def create_context_for_llm(user_data: Dict[str, Any], career_map: Dict[str, Any]) -> str:
-    """Create enriched context for LLM by including matched careers."""
-    context = f"Current Role: {user_data['current_role']}\n"
-    context += f"Skills: {', '.join(user_data['skills'])}\n"
-    context += f"Pain Points: {', '.join(user_data['hates'])}\n"
-    context += f"Interests: {', '.join(user_data['interests'])}\n\n"
+def create_context_for_llm(user_data: Dict[str, Any], career_map: Dict[str, Any],
+                           matched: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Create enriched context for LLM by including matched careers.
 
+    Role, skills, pain points and interests are already separate prompt
+    variables, so the context only adds what the prompt doesn't have. Pass
+    matched when the caller already ran find_matching_careers.
+    """
     # Add relevant career data
-    matched = find_matching_careers(user_data['skills'], user_data['hates'], career_map)
-    if matched:
-        context += "Potential Career Matches (from database):\n"
-        for career in matched:
-            context += f"  - {career['title']}: {career['id']}\n"
+    if matched is None:
+        matched = find_matching_careers(user_data['skills'], user_data['hates'], career_map,
+                                        interests=user_data.get('interests'),
+                                        remote_preference=user_data.get('remote_preference'))
+    if not matched:
+        return "No close matches in the career database.\n"
+
+    context = "Potential Career Matches (from database):\n"
+    for career in matched:
+        context += f"  - {career['title']}: {career['id']}\n"
 
     return context